@@ -1,15 +1,32 @@
 #python -m pip install deep-translator SpeechRecognition
 #python Translater.py
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import json
-import os
-from datetime import datetime
-import threading
-import speech_recognition as sr
-from deep_translator import GoogleTranslator
-import requests  # For HTTP requests
-import subprocess  # For macOS text-to-speech command
+from datetime import datetime, timedelta
+from language_translator.cache import TranslationCache
+from language_translator.compact_history import CompactHistory
+from language_translator.engine import TranslationEngine
+from language_translator.failover import FailoverProvider
+from language_translator.history import HistoryStore
+from language_translator.incremental import IncrementalTranslator
+from language_translator.languages import get_registry
+from language_translator.live import Debouncer, LatestRequest
+from language_translator.model_manager import DEFAULT_MODEL_BUDGET
+from language_translator.packing import PackingProvider
+from language_translator.providers import GoogleProvider, make_provider
+from language_translator.resilience import ResilientProvider
+from language_translator.scheduler import BULK, INTERACTIVE, JobScheduler, TkDispatcher
+from language_translator.tts import available_backends, load_voices
+from language_translator.virtual_list import VirtualList
+
+HISTORY_PAGE_SIZE = 200
+ALL_PAIRS = "All languages"
+HISTORY_PERIODS = {"Any time": None, "Past day": 1, "Past week": 7, "Past month": 30, "Past year": 365}
+TRANSLATION_BACKENDS = {"Google (online)": "google", "OpenAI-compatible LLM (online)": "llm",
+                        "MarianMT (offline)": "marian", "NLLB-200 (offline)": "nllb"}
+NO_BACKUP = "None"
+MODEL_QUALITIES = {"Accurate (full precision)": "accurate", "Fast (int8, smaller and quicker)": "fast"}
 
 class EnhancedLanguageTranslatorApp:
     def __init__(self, root):
@@ -19,13 +36,31 @@ class EnhancedLanguageTranslatorApp:
         self.root.resizable(True, True)
 
         # Initialize components
-        self.translator = GoogleTranslator()
-        self.speech_recognizer = sr.Recognizer()
-        self.tts_engine = None  # We'll use system say command
-        self.translation_history = []
+        self.speech_recognizer = None  # Created on first voice input
+        # Text-to-speech: say on macOS, espeak on Linux, pyttsx3 elsewhere
+        self.tts_backends = {backend.name: backend for backend in available_backends()}
+        self.tts = next(iter(self.tts_backends.values()), None)
+        self.voices = []
+        self.voice_combo = None
         self.load_history()
+        # Retries transient Google errors and stops calling it for a while when it keeps failing;
+        # many sentences at once (documents, files) go out packed into a few requests
+        self.engine = TranslationEngine(PackingProvider(ResilientProvider(GoogleProvider())), cache=TranslationCache())
+        self.providers = {"google": self.engine.provider}  # Created on first selection, then reused
+        self.engine.cache.seed(self.history.page(limit=HISTORY_PAGE_SIZE), self.engine.cache_namespace)
+        self.languages = get_registry()  # Bundled table, refreshed in the background
+        self.incremental = IncrementalTranslator(self.engine)  # Only resend edited sentences
+        self.requests = LatestRequest()  # Results of superseded requests are dropped
+        self.live_text = None
+        self.live_token = None
+        # Background work runs on a fixed pool; results come back on the Tk thread
+        self.ui = TkDispatcher(self.root)
+        self.scheduler = JobScheduler(workers=4, dispatch=self.ui)
         
         self.setup_ui()
+        self.discover_voices()
+        self.languages.refresh_async(self.engine.fetch_languages, self.scheduler,
+                                     on_update=self.update_language_lists)
 
     def setup_ui(self):
         # Main frame with tabs
@@ -37,29 +72,42 @@ class EnhancedLanguageTranslatorApp:
         notebook.add(self.translation_frame, text="Translation")
         self.setup_translation_tab()
 
-        # History tab
+        # History and Settings tabs are built the first time they are selected
+        self.history_list = None
+        self.history_has_more = False
+        self.tts_rate_var = tk.IntVar(value=200)
+        self.voice_var = tk.StringVar(value="")  # Start with system default
+
         self.history_frame = ttk.Frame(notebook)
         notebook.add(self.history_frame, text="History")
-        self.setup_history_tab()
 
-        # Settings tab
         self.settings_frame = ttk.Frame(notebook)
         notebook.add(self.settings_frame, text="Settings")
-        self.setup_settings_tab()
+
+        self.tab_builders = {str(self.history_frame): self.setup_history_tab,
+                             str(self.settings_frame): self.setup_settings_tab}
+        notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+    def on_tab_changed(self, event):
+        """Build a deferred tab on first selection"""
+        builder = self.tab_builders.pop(event.widget.select(), None)
+        if builder:
+            builder()
 
     def setup_translation_tab(self):
         # Language selection with dropdown
         lang_frame = ttk.Frame(self.translation_frame)
         lang_frame.pack(pady=10, fill="x")
 
-        # Get the list of supported languages
-        languages = GoogleTranslator().get_supported_languages()
+        # Supported languages come from the local registry, no network needed
+        languages = self.languages.names()
         
         ttk.Label(lang_frame, text="From:").grid(row=0, column=0, padx=5)
         self.src_lang_var = tk.StringVar(value="auto")
         self.src_lang_combo = ttk.Combobox(lang_frame, textvariable=self.src_lang_var, width=15)
         self.src_lang_combo['values'] = ["auto"] + languages
         self.src_lang_combo.grid(row=0, column=1, padx=5)
+        self.src_lang_combo.bind("<<ComboboxSelected>>", self.warm_translation_model)
 
         # Swap button
         ttk.Button(lang_frame, text="⇄", command=self.swap_languages, width=3).grid(row=0, column=2, padx=5)
@@ -69,6 +117,7 @@ class EnhancedLanguageTranslatorApp:
         self.dest_lang_combo = ttk.Combobox(lang_frame, textvariable=self.dest_lang_var, width=15)
         self.dest_lang_combo['values'] = languages
         self.dest_lang_combo.grid(row=0, column=4, padx=5)
+        self.dest_lang_combo.bind("<<ComboboxSelected>>", self.warm_translation_model)
 
         # Input section with speech recognition
         input_frame = ttk.LabelFrame(self.translation_frame, text="Input Text")
@@ -91,14 +140,22 @@ class EnhancedLanguageTranslatorApp:
 
         self.char_count_label = ttk.Label(input_frame, text="Characters: 0")
         self.char_count_label.pack(anchor="e", padx=5)
-        self.text_input.bind("<KeyRelease>", self.update_char_count)
+        self.text_input.bind("<KeyRelease>", self.on_input_changed)
 
         # Translate button with loading indicator
         self.translate_btn = ttk.Button(self.translation_frame, text="🔄 Translate", command=self.translate_text_threaded)
         self.translate_btn.pack(pady=10)
 
+        # Live mode translates shortly after typing pauses
+        self.live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.translation_frame, text="Translate as I type", variable=self.live_var).pack()
+        self.live_debouncer = Debouncer(self.root, 500, self.live_translate)
+
         self.progress_bar = ttk.Progressbar(self.translation_frame, mode='indeterminate')
         self.progress_bar.pack(pady=5, fill="x")
+        self.progress_label = ttk.Label(self.translation_frame, text="")
+        self.progress_label.pack()
+        self.streamed_request = None  # Request whose translation is being written into the output
 
         # Output section
         output_frame = ttk.LabelFrame(self.translation_frame, text="Translation Result")
@@ -134,19 +191,28 @@ class EnhancedLanguageTranslatorApp:
         search_entry.pack(side="left", padx=5)
         search_entry.bind("<KeyRelease>", self.filter_history)
 
-        ttk.Button(search_frame, text="Clear History", command=self.clear_history).pack(side="right", padx=5)
+        # Language pair and date range filters
+        self.history_pairs = self.history.pairs()
+        self.pair_filter_var = tk.StringVar(value=ALL_PAIRS)
+        self.pair_filter_combo = ttk.Combobox(search_frame, textvariable=self.pair_filter_var, state="readonly", width=22)
+        self.pair_filter_combo['values'] = [ALL_PAIRS] + [f"{src} → {dest}" for src, dest in self.history_pairs]
+        self.pair_filter_combo.pack(side="left", padx=5)
+        self.pair_filter_combo.bind("<<ComboboxSelected>>", self.filter_history)
 
-        # History listbox
-        history_list_frame = ttk.Frame(self.history_frame)
-        history_list_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.period_filter_var = tk.StringVar(value="Any time")
+        period_combo = ttk.Combobox(search_frame, textvariable=self.period_filter_var, state="readonly", width=12)
+        period_combo['values'] = list(HISTORY_PERIODS)
+        period_combo.pack(side="left", padx=5)
+        period_combo.bind("<<ComboboxSelected>>", self.filter_history)
 
-        self.history_listbox = tk.Listbox(history_list_frame, height=15)
-        history_scrollbar = ttk.Scrollbar(history_list_frame, orient="vertical", command=self.history_listbox.yview)
-        self.history_listbox.configure(yscrollcommand=history_scrollbar.set)
-        self.history_listbox.pack(side="left", fill="both", expand=True)
-        history_scrollbar.pack(side="right", fill="y")
+        ttk.Button(search_frame, text="Clear History", command=self.clear_history).pack(side="right", padx=5)
 
-        self.history_listbox.bind("<Double-1>", self.load_from_history)
+        # History list: only the rows in view are rendered
+        # Pages stay loaded while scrolling back through history, so keep them as compact columns
+        self.history_list = VirtualList(self.history_frame, self.format_history_entry,
+                                        on_end=self.load_more_history, height=15, store=CompactHistory)
+        self.history_list.pack(fill="both", expand=True, padx=10, pady=10)
+        self.history_list.bind_row("<Double-1>", self.load_from_history)
         self.update_history_display()
 
     def setup_settings_tab(self):
@@ -157,132 +223,331 @@ class EnhancedLanguageTranslatorApp:
         ttk.Label(api_frame, text="OpenAI API Key:").pack(anchor="w", padx=5, pady=2)
         self.openai_key_entry = ttk.Entry(api_frame, show="*", width=50)
         self.openai_key_entry.pack(padx=5, pady=2, fill="x")
+        self.openai_key_entry.bind("<FocusOut>", self.on_openai_key_changed)
+
+        # Translation backend: Google, an LLM API, or a local model that works offline
+        backend_frame = ttk.LabelFrame(self.settings_frame, text="Translation Engine")
+        backend_frame.pack(pady=10, fill="x", padx=10)
+
+        ttk.Label(backend_frame, text="Backend:").pack(anchor="w", padx=5, pady=2)
+        self.translation_backend_var = tk.StringVar(value=next(
+            label for label, name in TRANSLATION_BACKENDS.items() if self.providers.get(name) is self.engine.provider))
+        translation_backend_combo = ttk.Combobox(backend_frame, textvariable=self.translation_backend_var, state="readonly")
+        translation_backend_combo['values'] = list(TRANSLATION_BACKENDS)
+        translation_backend_combo.pack(fill="x", padx=5, pady=2)
+        translation_backend_combo.bind("<<ComboboxSelected>>", self.on_translation_backend_changed)
+
+        # Backup backend: takes over when the main one fails, or races it when it is slow
+        ttk.Label(backend_frame, text="Backup backend:").pack(anchor="w", padx=5, pady=2)
+        self.backup_backend_var = tk.StringVar(value=NO_BACKUP)
+        backup_combo = ttk.Combobox(backend_frame, textvariable=self.backup_backend_var, state="readonly")
+        backup_combo['values'] = [NO_BACKUP] + list(TRANSLATION_BACKENDS)
+        backup_combo.pack(fill="x", padx=5, pady=2)
+        backup_combo.bind("<<ComboboxSelected>>", self.on_translation_backend_changed)
+        self.hedge_requests_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(backend_frame, text="Also ask the backup when the main backend is slow",
+                        variable=self.hedge_requests_var,
+                        command=self.on_translation_backend_changed).pack(anchor="w", padx=5, pady=2)
+
+        ttk.Label(backend_frame, text="Local model memory (MB):").pack(anchor="w", padx=5, pady=2)
+        self.model_budget_var = tk.IntVar(value=DEFAULT_MODEL_BUDGET // 2**20)
+        budget_spinbox = ttk.Spinbox(backend_frame, from_=256, to=65536, increment=256,
+                                     textvariable=self.model_budget_var, command=self.on_model_budget_changed)
+        budget_spinbox.pack(fill="x", padx=5, pady=2)
+        budget_spinbox.bind("<FocusOut>", self.on_model_budget_changed)
+
+        ttk.Label(backend_frame, text="Local model quality:").pack(anchor="w", padx=5, pady=2)
+        self.model_quality_var = tk.StringVar(value=next(iter(MODEL_QUALITIES)))
+        quality_combo = ttk.Combobox(backend_frame, textvariable=self.model_quality_var, state="readonly")
+        quality_combo['values'] = list(MODEL_QUALITIES)
+        quality_combo.pack(fill="x", padx=5, pady=2)
+        quality_combo.bind("<<ComboboxSelected>>", self.on_model_quality_changed)
+
+        # Worker processes keep inference off the GUI process and share the loaded weights
+        ttk.Label(backend_frame, text="Local model worker processes (0 = run in the app):").pack(anchor="w", padx=5, pady=2)
+        self.model_workers_var = tk.IntVar(value=0)
+        workers_spinbox = ttk.Spinbox(backend_frame, from_=0, to=os.cpu_count() or 1, increment=1,
+                                      textvariable=self.model_workers_var, command=self.on_model_workers_changed)
+        workers_spinbox.pack(fill="x", padx=5, pady=2)
 
         # TTS Settings
         tts_frame = ttk.LabelFrame(self.settings_frame, text="Text-to-Speech Settings")
         tts_frame.pack(pady=10, fill="x", padx=10)
 
+        ttk.Label(tts_frame, text="Engine:").pack(anchor="w", padx=5, pady=2)
+        self.tts_backend_var = tk.StringVar(value=self.tts.name if self.tts else "")
+        backend_combo = ttk.Combobox(tts_frame, textvariable=self.tts_backend_var, state="readonly")
+        backend_combo['values'] = list(self.tts_backends)
+        backend_combo.pack(fill="x", padx=5, pady=2)
+        backend_combo.bind("<<ComboboxSelected>>", self.on_tts_backend_changed)
+
         ttk.Label(tts_frame, text="Speech Rate:").pack(anchor="w", padx=5, pady=2)
-        self.tts_rate_var = tk.IntVar(value=200)
         ttk.Scale(tts_frame, from_=100, to=300, variable=self.tts_rate_var, orient="horizontal").pack(fill="x", padx=5, pady=2)
 
         ttk.Label(tts_frame, text="Voice:").pack(anchor="w", padx=5, pady=2)
-        import subprocess
-        result = subprocess.run(['say', '-v', '?'], capture_output=True, text=True)
-        # Parse voice info more carefully
-        voices = []
-        for line in result.stdout.splitlines():
-            if line.strip():
-                # Each line format: "name age language region"
-                parts = line.strip().split()
-                if parts:
-                    voices.append(parts[0])  # Take just the voice name
-        
-        self.voice_var = tk.StringVar(value="")  # Start with system default
-        voice_combo = ttk.Combobox(tts_frame, textvariable=self.voice_var)
-        voice_combo['values'] = ["System Default"] + voices
-        voice_combo.current(0)  # Select "System Default"
-        voice_combo.pack(fill="x", padx=5, pady=2)
+        # Voices are discovered in the background and filled in when ready
+        self.voice_combo = ttk.Combobox(tts_frame, textvariable=self.voice_var)
+        self.voice_combo['values'] = ["System Default"] + self.voices
+        self.voice_combo.current(0)  # Select "System Default"
+        self.voice_combo.pack(fill="x", padx=5, pady=2)
+
+    def translation_provider(self, name):
+        """Return the provider for a backend name, creating it on first use"""
+        if name not in self.providers:
+            options = {}
+            if name == "llm":
+                options = {"api_key": self.openai_key_entry.get().strip() or None}
+            elif name != "google":
+                options = {"quality": MODEL_QUALITIES[self.model_quality_var.get()],
+                           "workers": self.model_workers_var.get()}
+            self.providers[name] = make_provider(name, **options)
+            self.on_model_budget_changed()
+        return self.providers[name]
+
+    def on_openai_key_changed(self, event=None):
+        """Use the entered key for the LLM backend (OPENAI_API_KEY when left empty)"""
+        if "llm" in self.providers:
+            self.providers["llm"].api_key = self.openai_key_entry.get().strip() or os.environ.get("OPENAI_API_KEY")
+
+    def main_provider(self):
+        return self.translation_provider(TRANSLATION_BACKENDS[self.translation_backend_var.get()])
+
+    def on_translation_backend_changed(self, event=None):
+        """Route translations through the chosen backend (and backup); local models load on first use"""
+        provider = self.main_provider()
+        backup = TRANSLATION_BACKENDS.get(self.backup_backend_var.get())
+        previous = self.engine.provider
+        if backup and self.translation_provider(backup) is not provider:
+            hedge_after = "auto" if self.hedge_requests_var.get() else None
+            self.engine.provider = FailoverProvider([provider, self.translation_provider(backup)],
+                                                    hedge_after=hedge_after, owns_providers=False)
+        else:
+            self.engine.provider = provider
+        if isinstance(previous, FailoverProvider):
+            previous.close()
+        self.incremental.reset()  # Previous sentences came from another backend
+        self.live_text = None
+        if hasattr(provider, "prewarm"):
+            # Load the pairs used most recently so switching between them is instant
+            self.scheduler.submit(provider.prewarm, self.history.frequent_pairs(), priority=BULK)
+
+    def on_model_budget_changed(self, event=None):
+        """Apply the memory budget to every local model backend"""
+        try:
+            budget = self.model_budget_var.get() * 2**20
+        except tk.TclError:
+            return  # Not a number (yet)
+        for provider in self.providers.values():
+            if hasattr(provider, "configure"):
+                provider.configure(memory_budget=budget)
+
+    def on_model_quality_changed(self, event=None):
+        """Switch local models between full precision and int8; the other mode's models load on first use"""
+        quality = MODEL_QUALITIES[self.model_quality_var.get()]
+        for provider in self.providers.values():
+            if hasattr(provider, "configure"):
+                provider.configure(quality=quality)
+        if hasattr(self.main_provider(), "configure"):
+            self.incremental.reset()  # Previous sentences came from the other mode
+            self.live_text = None
+            self.warm_translation_model()
+
+    def on_model_workers_changed(self, event=None):
+        """Recreate the local backends in or out of worker processes; models reload on next use"""
+        for name in [name for name, provider in self.providers.items() if hasattr(provider, "configure")]:
+            # Closing waits for translations in flight, so do it off the UI thread
+            self.scheduler.submit(self.providers.pop(name).close, priority=BULK)
+        self.on_translation_backend_changed()
+
+    def warm_translation_model(self, event=None):
+        """Start loading the local model for the selected pair before Translate is pressed"""
+        provider = self.engine.provider  # Not main_provider(): Settings may not be built yet
+        if isinstance(provider, FailoverProvider):
+            provider = provider.providers[0]
+        if hasattr(provider, "warm"):
+            self.scheduler.submit(provider.warm, self.src_lang_var.get(), self.dest_lang_var.get(), priority=BULK)
+
+    def discover_voices(self):
+        """List the current TTS backend's voices off the UI thread"""
+        backend = self.tts
+        if backend is None:
+            return
+        self.scheduler.submit(load_voices, backend, priority=BULK,
+                              on_done=lambda voices: self.update_voice_list(backend, voices),
+                              on_error=lambda e: print(f"Voice discovery failed: {e}"))
+
+    def update_voice_list(self, backend, voices):
+        """Fill the Voice combo box once discovery finishes"""
+        if backend is not self.tts:
+            return  # The user switched engines meanwhile
+        self.voices = voices
+        if self.voice_combo is not None:
+            self.voice_combo['values'] = ["System Default"] + voices
+
+    def on_tts_backend_changed(self, event=None):
+        """Switch TTS engine and rediscover its voices"""
+        self.tts = self.tts_backends[self.tts_backend_var.get()]
+        self.update_voice_list(self.tts, [])
+        self.voice_combo.current(0)
+        self.discover_voices()
 
     def translate_text_threaded(self):
-        """Run translation in a separate thread to prevent UI freezing"""
-        threading.Thread(target=self.translate_text, daemon=True).start()
+        """Queue a translation on the scheduler to prevent UI freezing"""
+        src = self.src_lang_var.get()
+        dest = self.dest_lang_var.get()
+        text = self.text_input.get("1.0", tk.END).strip()
 
-    def translate_text(self):
-        """Enhanced translation with AI capabilities"""
+        if not text:
+            messagebox.showerror("Error", "Please enter text to translate.")
+            return
+
+        self.live_debouncer.cancel()
+        request_id = self.requests.next()
+        backend = self.engine.cache_namespace
         self.progress_bar.start()
         self.translate_btn.config(state="disabled")
+        # Short texts jump ahead of long documents still waiting for a worker
+        priority = INTERACTIVE if len(text) <= self.engine.chunk_size else BULK
+        self.scheduler.submit(
+            self.translate_text, text, src, dest, request_id, priority=priority,
+            on_done=lambda result: self.on_translation_done(request_id, text, src, dest, result, backend),
+            on_error=self.on_translation_error)
+
+    def translate_text(self, text, src, dest, request_id=None):
+        """Enhanced translation with AI capabilities; finished sentences are shown while the rest translate"""
+        translation, detected_lang = self.incremental.translate(
+            text, src, dest, progress=lambda done, total: self.ui(self.update_progress, done, total),
+            on_text=lambda piece: self.ui(self.append_translation, request_id, piece))
+        stats = self.incremental.last_stats
+        reuse_info = f"Reused {stats['reused']}/{stats['segments']} sentences" if stats['reused'] else ""
+        return translation, reuse_info, detected_lang
+
+    def on_translation_done(self, request_id, text, src, dest, result, backend=None):
+        """Show a finished translation and save it to history"""
+        translation, reuse_info, detected_lang = result
+        self.update_translation_result(translation, reuse_info, detected_lang, request_id)
+        self.add_to_history(text, translation, src, dest, backend)
+        self.translation_complete()
+
+    def on_translation_error(self, error):
+        messagebox.showerror("Translation Error", str(error))
+        self.translation_complete()
+
+    def live_translate(self):
+        """Translate the current input in the background if it changed since the last live run"""
+        text = self.text_input.get("1.0", tk.END).strip()
+        if not self.live_var.get() or not text or text == self.live_text:
+            return
+        if self.live_token:
+            self.live_token.cancel()  # Skip the previous live job if it has not started yet
+        self.live_text = text
+        request_id = self.requests.next()
+        self.live_token = self.scheduler.submit(
+            self.incremental.translate, text, self.src_lang_var.get(), self.dest_lang_var.get(),
+            on_done=lambda result: self.update_translation_result(result[0], "", result[1], request_id),
+            on_error=self.on_live_translation_error)
+
+    def on_live_translation_error(self, error):
+        self.live_text = None
+        print(f"Live translation error: {error}")
+
+    def update_language_lists(self, languages):
+        """Refill the language combo boxes after a registry refresh"""
+        self.src_lang_combo['values'] = ["auto"] + languages
+        self.dest_lang_combo['values'] = languages
 
-        try:
-            src = self.src_lang_var.get()
-            dest = self.dest_lang_var.get()
-            text = self.text_input.get("1.0", tk.END).strip()
-
-            if not text:
-                messagebox.showerror("Error", "Please enter text to translate.")
-                return
-
-            # Basic Google Translate
-            translator = GoogleTranslator(source='auto' if src == 'auto' else src,
-                                      target=dest)
-            translation = translator.translate(text)
-            detected_lang = translator.source
-
-            # Update UI in main thread
-            self.root.after(0, self.update_translation_result, translation, "", detected_lang)
-
-            # Save to history
-            self.add_to_history(text, translation, src, dest)
-
-        except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Translation Error", str(e)))
-        finally:
-            self.root.after(0, self.translation_complete)
-
-    def update_translation_result(self, translation, sentiment_info, detected_lang):
+    def update_translation_result(self, translation, sentiment_info, detected_lang, request_id=None):
         """Update the translation result in the UI"""
-        self.output_text.config(state="normal")
-        self.output_text.delete("1.0", tk.END)
-        self.output_text.insert(tk.END, translation)
-        self.output_text.config(state="disabled")
+        if request_id is not None and not self.requests.is_current(request_id):
+            return  # A newer translation has been requested since
+        if self.output_text.get("1.0", "end-1c") != translation:  # Unless it was all streamed in already
+            self.output_text.config(state="normal")
+            self.output_text.delete("1.0", tk.END)
+            self.output_text.insert(tk.END, translation)
+            self.output_text.config(state="disabled")
+        self.streamed_request = None
 
         info_text = f"Language: {detected_lang}"
         if sentiment_info:
             info_text += f" | {sentiment_info}"
         self.info_label.config(text=info_text)
 
+    def append_translation(self, request_id, piece):
+        """Add the next finished part of a translation to the output, replacing the previous result"""
+        if not self.requests.is_current(request_id):
+            return
+        self.output_text.config(state="normal")
+        if self.streamed_request != request_id:
+            self.streamed_request = request_id
+            self.output_text.delete("1.0", tk.END)
+        self.output_text.insert(tk.END, piece)
+        self.output_text.config(state="disabled")
+
+    def update_progress(self, done, total):
+        """Show how many of the sentences or chunks sent for translation are done"""
+        self.progress_bar.stop()
+        self.progress_bar.config(mode="determinate", maximum=total, value=done)
+        self.progress_label.config(text=f"{done * 100 // total}% ({done}/{total})")
+
     def translation_complete(self):
         """Reset UI after translation is complete"""
         self.progress_bar.stop()
+        self.progress_bar.config(mode="indeterminate", value=0)
+        self.progress_label.config(text="")
         self.translate_btn.config(state="normal")
 
     def voice_input(self):
         """Capture voice input using speech recognition"""
+        self.info_label.config(text="Listening... Speak now!")
+        self.scheduler.submit(self._capture_voice, on_done=self.on_voice_captured, on_error=self.on_voice_error)
+
+    def _capture_voice(self):
+        """Record from the microphone and return the recognized text"""
+        import speech_recognition as sr
+        if self.speech_recognizer is None:
+            self.speech_recognizer = sr.Recognizer()
         try:
             with sr.Microphone() as source:
                 self.speech_recognizer.adjust_for_ambient_noise(source)
-                messagebox.showinfo("Voice Input", "Listening... Speak now!")
                 audio = self.speech_recognizer.listen(source, timeout=10)
-                
-            text = self.speech_recognizer.recognize_google(audio)
-            self.text_input.delete("1.0", tk.END)
-            self.text_input.insert("1.0", text)
-            self.update_char_count()
-            
+            return self.speech_recognizer.recognize_google(audio)
         except sr.UnknownValueError:
-            messagebox.showerror("Error", "Could not understand audio")
+            raise RuntimeError("Could not understand audio")
         except sr.RequestError as e:
-            messagebox.showerror("Error", f"Could not request results: {e}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Voice input failed: {e}")
+            raise RuntimeError(f"Could not request results: {e}")
+
+    def on_voice_captured(self, text):
+        self.info_label.config(text="")
+        self.text_input.delete("1.0", tk.END)
+        self.text_input.insert("1.0", text)
+        self.update_char_count()
+
+    def on_voice_error(self, error):
+        self.info_label.config(text="")
+        if isinstance(error, RuntimeError):
+            messagebox.showerror("Error", str(error))
+        else:
+            messagebox.showerror("Error", f"Voice input failed: {error}")
 
     def speak_translation(self):
         """Speak the translated text using TTS"""
         translation = self.output_text.get("1.0", tk.END).strip()
-        if translation:
-            threading.Thread(target=self._speak_text, args=(translation,), daemon=True).start()
-
-    def _speak_text(self, text):
-        """Internal method to speak text using macOS say command"""
+        if not translation:
+            return
+        if self.tts is None:
+            messagebox.showerror("Error", "No text-to-speech engine is available.")
+            return
+        voice = self.voice_var.get()
+        if voice == "System Default":
+            voice = ""
+        self.scheduler.submit(self._speak_text, self.tts, translation, voice, self.tts_rate_var.get())
+
+    def _speak_text(self, backend, text, voice, rate):
+        """Internal method to speak text with the selected TTS backend"""
         try:
-            import subprocess
-            voice = self.voice_var.get()
-            if not voice:  # If no voice is selected, use default
-                subprocess.run(['say', '-r', str(self.tts_rate_var.get()), text])
-            else:
-                result = subprocess.run(['say', '-v', voice, '-r', str(self.tts_rate_var.get()), text], 
-                                     capture_output=True, text=True)
-                if result.returncode != 0:
-                    print(f"TTS error: {result.stderr}")
-                    # Try without voice specification
-                    subprocess.run(['say', '-r', str(self.tts_rate_var.get()), text])
+            backend.speak(text, voice, rate)
         except Exception as e:
             print(f"TTS error: {e}")
-            # Try the simplest possible command as fallback
-            try:
-                subprocess.run(['say', text])
-            except Exception as e2:
-                print(f"Fallback TTS error: {e2}")
 
     def copy_translation(self):
         """Copy translation to clipboard"""
@@ -333,84 +598,81 @@ class EnhancedLanguageTranslatorApp:
         self.text_input.delete("1.0", tk.END)
         self.update_char_count()
 
+    def on_input_changed(self, event=None):
+        """Refresh the character count and schedule a live translation"""
+        self.update_char_count()
+        if self.live_var.get():
+            self.live_debouncer.trigger()
+
     def update_char_count(self, event=None):
         """Update character count"""
         text = self.text_input.get("1.0", tk.END).strip()
         self.char_count_label.config(text=f"Characters: {len(text)}")
 
-    def add_to_history(self, original, translation, src_lang, dest_lang):
+    def add_to_history(self, original, translation, src_lang, dest_lang, backend=None):
         """Add translation to history"""
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "original": original,
-            "translation": translation,
-            "src_lang": src_lang,
-            "dest_lang": dest_lang
-        }
-        self.translation_history.insert(0, entry)  # Most recent first
-        if len(self.translation_history) > 100:  # Limit history size
-            self.translation_history.pop()
-        
-        self.save_history()
-        self.update_history_display()
-
-    def save_history(self):
-        """Save translation history to file"""
-        try:
-            with open("translation_history.json", "w", encoding="utf-8") as f:
-                json.dump(self.translation_history, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Failed to save history: {e}")
+        entry = self.history.append(original, translation, src_lang, dest_lang, backend=backend)
+        if self.history_list is None:
+            return  # History tab not built yet
+        if (src_lang, dest_lang) not in self.history_pairs:
+            self.history_pairs.append((src_lang, dest_lang))
+            self.pair_filter_combo['values'] = [ALL_PAIRS] + [f"{src} → {dest}" for src, dest in self.history_pairs]
+        if self.search_var.get().strip():
+            self.update_history_display()  # Ranked results: re-run the search
+        elif self.history_pair_filter() in (None, (src_lang, dest_lang)):
+            self.history_list.prepend(entry)
 
     def load_history(self):
-        """Load translation history from file"""
-        try:
-            if os.path.exists("translation_history.json"):
-                with open("translation_history.json", "r", encoding="utf-8") as f:
-                    self.translation_history = json.load(f)
-        except Exception as e:
-            print(f"Failed to load history: {e}")
-            self.translation_history = []
+        """Open the history store, importing translation_history.json on first run"""
+        self.history = HistoryStore()
+
+    def format_history_entry(self, entry):
+        return f"{entry['timestamp'][:16]} | {entry['original'][:50]}... → {entry['translation'][:50]}..."
+
+    def history_pair_filter(self):
+        """Return the (src_lang, dest_lang) pair being filtered on, or None"""
+        pair_index = self.pair_filter_combo.current()
+        return self.history_pairs[pair_index - 1] if pair_index > 0 else None
 
     def update_history_display(self):
-        """Update history display in the listbox"""
-        self.history_listbox.delete(0, tk.END)
-        search_term = self.search_var.get().lower()
-        
-        for i, entry in enumerate(self.translation_history):
-            if not search_term or search_term in entry["original"].lower() or search_term in entry["translation"].lower():
-                display_text = f"{entry['timestamp'][:16]} | {entry['original'][:50]}... → {entry['translation'][:50]}..."
-                self.history_listbox.insert(tk.END, display_text)
+        """Show the first page of (matching) history"""
+        if self.history_list is None:
+            return  # History tab not built yet
+        self.history_list.set_entries(self.fetch_history(0))
+
+    def load_more_history(self):
+        """Append the next page of (matching) history; called when the view reaches the end"""
+        if self.history_has_more:
+            self.history_list.extend(self.fetch_history(len(self.history_list)))
+
+    def fetch_history(self, offset):
+        src_lang, dest_lang = self.history_pair_filter() or (None, None)
+        days = HISTORY_PERIODS[self.period_filter_var.get()]
+        since = datetime.now() - timedelta(days=days) if days else None
+        rows = self.history.search(self.search_var.get(), src_lang, dest_lang, since,
+                                   offset=offset, limit=HISTORY_PAGE_SIZE)
+        self.history_has_more = len(rows) == HISTORY_PAGE_SIZE
+        return rows
 
     def filter_history(self, event=None):
         """Filter history based on search term"""
         self.update_history_display()
 
-    def load_from_history(self, event):
-        """Load selected history item to input"""
-        selection = self.history_listbox.curselection()
-        if selection:
-            index = selection[0]
-            # Find the actual history entry (accounting for filtering)
-            search_term = self.search_var.get().lower()
-            filtered_entries = []
-            for entry in self.translation_history:
-                if not search_term or search_term in entry["original"].lower() or search_term in entry["translation"].lower():
-                    filtered_entries.append(entry)
-            
-            if index < len(filtered_entries):
-                entry = filtered_entries[index]
-                self.text_input.delete("1.0", tk.END)
-                self.text_input.insert("1.0", entry["original"])
-                self.src_lang_var.set(entry["src_lang"])
-                self.dest_lang_var.set(entry["dest_lang"])
-                self.update_char_count()
+    def load_from_history(self, entry):
+        """Load a history entry (double-clicked in the list) to input"""
+        self.text_input.delete("1.0", tk.END)
+        self.text_input.insert("1.0", entry["original"])
+        self.src_lang_var.set(self.languages.name(entry["src_lang"]))
+        self.dest_lang_var.set(self.languages.name(entry["dest_lang"]))
+        self.update_char_count()
 
     def clear_history(self):
         """Clear translation history"""
         if messagebox.askyesno("Confirm", "Are you sure you want to clear all history?"):
-            self.translation_history = []
-            self.save_history()
+            self.history.clear()
+            self.history_pairs = []
+            self.pair_filter_combo['values'] = [ALL_PAIRS]
+            self.pair_filter_var.set(ALL_PAIRS)
             self.update_history_display()
 
 
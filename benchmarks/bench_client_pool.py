@@ -0,0 +1,62 @@
+"""Per-request latency with a fresh client per call vs. the shared ClientPool.
+
+Run with ``python benchmarks/bench_client_pool.py`` after ``pip install -e .``.
+"""
+
+import argparse
+import statistics
+import time
+
+import requests
+
+from language_translator.clients import ClientPool, GoogleClient
+from stub_server import StubServer
+
+
+def summarize(label, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<28} mean {statistics.mean(samples) * 1000:7.3f} ms"
+          f"  p50 {statistics.median(samples) * 1000:7.3f} ms  p95 {p95 * 1000:7.3f} ms")
+
+
+def bench_fresh(url, requests_count):
+    """Old behaviour: a new client and a new connection for every request"""
+    samples = []
+    for i in range(requests_count):
+        start = time.perf_counter()
+        session = requests.Session()
+        GoogleClient("auto", "spanish", session, url).translate(f"hello {i}")
+        session.close()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_pooled(url, requests_count):
+    """New behaviour: long-lived client per pair over a keep-alive session"""
+    pool = ClientPool(base_url=url)
+    samples = []
+    for i in range(requests_count):
+        start = time.perf_counter()
+        pool.get("auto", "spanish").translate(f"hello {i}")
+        samples.append(time.perf_counter() - start)
+    pool.close()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    server = StubServer().start()
+    url = server.url + "/translate_a/single"
+    try:
+        summarize("fresh client per request", bench_fresh(url, args.requests))
+        summarize("pooled client (keep-alive)", bench_pooled(url, args.requests))
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Tail latency with one provider vs. failover with hedged requests, and behaviour during an outage.
+
+Run with ``python benchmarks/bench_failover.py`` after ``pip install -e .``.
+Two stub Google endpoints stand in for two providers: the primary is fast
+but some of its requests stall (2% by default), the secondary is a little slower and steady.
+Each configuration translates the same requests from a few client threads
+and reports p50/p95/p99. Finally the primary starts failing every request
+to show failover keeping requests successful.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from language_translator.clients import ClientPool
+from language_translator.failover import FailoverProvider
+from language_translator.providers import GoogleProvider
+from stub_server import StubServer
+
+
+def provider_for(server):
+    return GoogleProvider(ClientPool(base_url=server.url))
+
+
+def measure(label, provider, requests_count, clients):
+    def one(i):
+        start = time.perf_counter()
+        try:
+            provider.translate_detailed(f"request {i}", "en", "es")
+            return time.perf_counter() - start, True
+        except Exception:
+            return time.perf_counter() - start, False
+
+    with ThreadPoolExecutor(clients) as pool:
+        results = list(pool.map(one, range(requests_count)))
+    latencies = sorted(latency for latency, ok in results)
+    failed = sum(not ok for _, ok in results)
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    line = f"{label:<30} p50 {pick(0.5):7.1f} ms  p95 {pick(0.95):7.1f} ms  p99 {pick(0.99):7.1f} ms  failed {failed}"
+    if isinstance(provider, FailoverProvider):
+        stats = provider.stats()
+        line += f"  hedges {stats['hedges']} (won {stats['hedge_wins']})"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--stall-ms", type=float, default=400.0, help="latency of the primary's slow requests")
+    parser.add_argument("--stall-rate", type=float, default=0.02, help="fraction of the primary's requests that stall")
+    args = parser.parse_args()
+
+    primary = StubServer(latency=0.010, stall=args.stall_ms / 1000, stall_rate=args.stall_rate).start()
+    secondary = StubServer(latency=0.020).start()
+    measure("primary only", provider_for(primary), args.requests, args.clients)
+    measure("failover, no hedging", FailoverProvider([provider_for(primary), provider_for(secondary)]),
+            args.requests, args.clients)
+    measure("hedge after 50 ms", FailoverProvider([provider_for(primary), provider_for(secondary)], hedge_after=0.05),
+            args.requests, args.clients)
+    auto = FailoverProvider([provider_for(primary), provider_for(secondary)], hedge_after="auto")
+    measure("hedge after p95 (auto)", auto, args.requests, args.clients)
+
+    primary.down = True
+    failover = FailoverProvider([provider_for(primary), provider_for(secondary)], cooldown=60)
+    measure("primary down, failover", failover, args.requests, args.clients)
+    for entry in failover.stats()["providers"]:
+        print(f"  {entry['name']}: {entry['successes']} ok, {entry['errors']} errors, latency {entry['latency_ms']}")
+
+
+if __name__ == "__main__":
+    main()
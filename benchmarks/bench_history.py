@@ -0,0 +1,133 @@
+"""Cost of saving and searching translations as history grows: JSON rewrite vs. HistoryStore.
+
+Run with ``python benchmarks/bench_history.py`` after ``pip install -e .``.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from language_translator.history import HistoryStore
+
+
+def make_entry(i):
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "original": f"Sample sentence number {i} that somebody translated",
+        "translation": f"Frase de ejemplo número {i} que alguien tradujo",
+        "src_lang": "english",
+        "dest_lang": "spanish",
+    }
+
+
+def bench_json(path, size, samples):
+    """Old behaviour: insert at the front and rewrite the whole file"""
+    history = [make_entry(i) for i in range(size)]
+    timings = []
+    for i in range(samples):
+        start = time.perf_counter()
+        history.insert(0, make_entry(size + i))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(history, f, ensure_ascii=False, indent=2)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_store(path, size, samples):
+    """New behaviour: one appended row per translation"""
+    store = HistoryStore(path, legacy_path=None)
+    rows = [tuple(make_entry(i).values()) for i in range(size)]
+    store._conn.execute("BEGIN")
+    store._conn.executemany(
+        "INSERT INTO history (timestamp, original, translation, src_lang, dest_lang) VALUES (?, ?, ?, ?, ?)", rows)
+    store._conn.execute("COMMIT")
+    timings = []
+    for i in range(samples):
+        start = time.perf_counter()
+        store.append(**{k: v for k, v in make_entry(size + i).items()})
+        timings.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    store.page(limit=200)
+    first_page = time.perf_counter() - start
+    store.close()
+    return timings, first_page
+
+
+def make_words(count, rng):
+    return ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9)))
+            for _ in range(count)]
+
+
+def bench_search(path, size, samples):
+    """Search latency over a history of Zipf-distributed words"""
+    rng = random.Random(1)
+    words = make_words(20_000, rng)
+    weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(words))))
+    sentences = [" ".join(rng.choices(words, cum_weights=weights, k=8)) for _ in range(50_000)]
+    months = [f"2025-{month:02d}-01T12:00:00" for month in range(1, 13)]
+    store = HistoryStore(path, legacy_path=None)
+    store._conn.execute("BEGIN")
+    store._conn.executemany(
+        "INSERT INTO history (timestamp, original, translation, src_lang, dest_lang) VALUES (?, ?, ?, ?, ?)",
+        ((rng.choice(months), rng.choice(sentences), rng.choice(sentences),
+          rng.choice(["english", "auto"]), rng.choice(["spanish", "french", "twi"])) for _ in range(size)))
+    store._conn.execute("COMMIT")
+    common, rare = words[0], words[5000]
+    cases = {
+        "common word": dict(term=common),
+        "rare word": dict(term=rare),
+        "2-letter prefix": dict(term=common[:2]),
+        "two words": dict(term=f"{words[3]} {words[10][:3]}"),
+        "word + filters": dict(term=common, dest_lang="twi", since="2025-06-01"),
+        "filters only": dict(src_lang="english", dest_lang="french", since="2025-06-01"),
+    }
+    results = {}
+    for name, kwargs in cases.items():
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            store.search(limit=200, **kwargs)
+            timings.append(time.perf_counter() - start)
+        results[name] = statistics.median(timings)
+    start = time.perf_counter()
+    store.pairs()
+    results["pair list"] = time.perf_counter() - start
+    store.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--json-max", type=int, default=100_000, help="skip JSON rewrites above this size")
+    parser.add_argument("-n", "--samples", type=int, default=20)
+    parser.add_argument("--search-size", type=int, default=1_000_000, help="history size for search timings (0 to skip)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            line = f"{size:>9} entries:"
+            if size <= args.json_max:
+                timings = bench_json(os.path.join(workdir, f"h{size}.json"), size, args.samples)
+                line += f"  json save {statistics.median(timings) * 1000:9.3f} ms"
+            else:
+                line += f"  json save {'skipped':>12}"
+            timings, first_page = bench_store(os.path.join(workdir, f"h{size}.db"), size, args.samples)
+            line += (f"  store append {statistics.median(timings) * 1000:7.3f} ms"
+                     f"  first page {first_page * 1000:6.2f} ms")
+            print(line)
+        if args.search_size:
+            print(f"\nsearch over {args.search_size} entries (median of {args.samples}, 200 results):")
+            results = bench_search(os.path.join(workdir, "search.db"), args.search_size, args.samples)
+            for name, seconds in results.items():
+                print(f"  {name:<16} {seconds * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
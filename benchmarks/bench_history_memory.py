@@ -0,0 +1,95 @@
+"""Memory and load time of a large history: dicts vs. CompactHistory.
+
+Run with ``python benchmarks/bench_history_memory.py`` after ``pip install -e .``.
+"pages" is what the History tab holds after scrolling to the end: every
+page from HistoryStore, kept in a list of dicts or in a CompactHistory.
+"""
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from language_translator.compact_history import CompactHistory
+from language_translator.history import HistoryStore
+
+PAGE_SIZE = 200  # As in the History tab
+PAIRS = [("english", "spanish"), ("auto", "french"), ("english", "twi"), ("auto", "german")]
+
+
+def make_entries(count):
+    start = datetime(2023, 1, 1)
+    for i in range(count):
+        src_lang, dest_lang = PAIRS[i % len(PAIRS)]
+        yield {
+            "timestamp": (start + timedelta(seconds=37 * i, microseconds=i)).isoformat(),
+            "original": f"Sample sentence number {i} that somebody translated",
+            "translation": f"Frase de ejemplo número {i} que alguien tradujo",
+            "src_lang": src_lang,
+            "dest_lang": dest_lang,
+        }
+
+
+def measure(load):
+    """Return (seconds, bytes still allocated) for ``load()``; timed without tracing"""
+    gc.collect()
+    start = time.perf_counter()
+    result = load()
+    seconds = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return seconds, size, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--entries", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        json_path = os.path.join(workdir, "translation_history.json")
+        entries = list(make_entries(args.entries))
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(entries[::-1], f, ensure_ascii=False, indent=2)
+        store = HistoryStore(os.path.join(workdir, "history.db"), legacy_path=None)
+        store._conn.execute("BEGIN")
+        store._conn.executemany(
+            "INSERT INTO history (timestamp, original, translation, src_lang, dest_lang) VALUES (?, ?, ?, ?, ?)",
+            (tuple(entry.values()) for entry in entries))
+        store._conn.execute("COMMIT")
+        del entries
+
+        def load_json():
+            with open(json_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        def load_pages(store_type):
+            entries = store_type()
+            rows = store.page(limit=PAGE_SIZE)
+            while rows:
+                entries.extend(rows)
+                rows = store.page(rows[-1]["id"], PAGE_SIZE)
+            return entries
+
+        print(f"{args.entries} entries, {os.path.getsize(json_path) / 2**20:.0f} MiB of JSON")
+        for name, load in (("json.load (dicts)", load_json),
+                           ("CompactHistory.from_json", lambda: CompactHistory.from_json(json_path)),
+                           ("CompactHistory.from_store", lambda: CompactHistory.from_store(store)),
+                           ("pages, list of dicts", lambda: load_pages(list)),
+                           ("pages, CompactHistory", lambda: load_pages(CompactHistory))):
+            seconds, size, count = measure(load)
+            print(f"  {name:<26} load {seconds:6.2f} s  {size / count:7.1f} bytes/entry")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Time to obtain the language list for the combo boxes, old path vs. registry.
+
+Each variant runs in a fresh interpreter so import costs are included.
+Run with ``python benchmarks/bench_languages.py`` after ``pip install -e .``.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+OLD = ("from deep_translator import GoogleTranslator\n"
+       "languages = GoogleTranslator().get_supported_languages()\n")
+NEW = ("from language_translator.languages import LanguageRegistry\n"
+       "languages = LanguageRegistry(cache_path='').names()\n")
+TIMER = ("import time\n_start = time.perf_counter()\n{code}"
+         "print((time.perf_counter() - _start) * 1000, len(languages))\n")
+
+
+def measure(code, runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", TIMER.format(code=code)],
+                                capture_output=True, text=True, check=True).stdout.split()
+        samples.append(float(output[0]))
+    return samples, int(output[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, code in (("GoogleTranslator()", OLD), ("LanguageRegistry", NEW)):
+        samples, count = measure(code, args.runs)
+        print(f"{label:<20} {count} languages  median {statistics.median(samples):7.2f} ms"
+              f"  max {max(samples):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
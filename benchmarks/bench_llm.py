@@ -0,0 +1,69 @@
+"""LLM backend: segments per request, prompt-prefix caching and streaming against a stub server.
+
+Run with ``python benchmarks/bench_llm.py`` after ``pip install -e .``.
+The stub (stub_llm_server.py) charges a fixed overhead per request, time
+per uncached prompt token and time per generated token, and caches prompt
+prefixes. Each configuration translates the same short strings and reports
+requests, tokens per segment, the share of prompt tokens served from the
+cache, time per segment and, when streaming, how soon the first segment
+arrived. The stub's cache starts empty for each configuration.
+"""
+
+import argparse
+import time
+import uuid
+
+from bench_packing import short_strings
+from language_translator.engine import TranslationEngine
+from language_translator.llm import LLMProvider
+from stub_llm_server import StubLLMServer
+from stub_server import fake_translate
+
+
+class UnstablePrefixProvider(LLMProvider):
+    """Puts something request-specific before the instructions, as a naive prompt template might"""
+
+    def messages(self, texts, src, dest):
+        messages = super().messages(texts, src, dest)
+        messages[0] = {"role": "system", "content": f"Request {uuid.uuid4()}.\n" + messages[0]["content"]}
+        return messages
+
+
+def run(label, server, provider, texts):
+    server.clear()
+    engine = TranslationEngine(provider, cache=None)
+    start = time.perf_counter()
+    translations = engine.translate_batch(texts, "en", "es")
+    seconds = time.perf_counter() - start
+    correct = sum(translation == fake_translate(text, "spanish") for text, translation in zip(texts, translations))
+    stats = provider.stats()
+    first = stats["first_segment_ms"]["p50"]
+    print(f"{label:<28} {stats['requests']:>4} requests  {seconds:6.2f} s"
+          f"  prompt {stats['prompt_tokens_per_segment']:6.1f} tok/seg (cached {stats['cached_share'] or 0:4.0%})"
+          f"  output {stats['completion_tokens_per_segment']:4.1f} tok/seg  {stats['ms_per_segment']:6.1f} ms/seg"
+          f"  first segment {first if first is not None else '-':>6} ms  correct {correct}/{len(texts)}")
+    engine.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=400)
+    parser.add_argument("--mangle-rate", type=float, default=0.3, help="share of batch answers missing a segment")
+    args = parser.parse_args()
+
+    texts = short_strings(args.texts)
+    server = StubLLMServer().start()
+    options = {"base_url": server.url, "api_key": "stub", "max_workers": 4}
+    run("1 segment per request", server, LLMProvider(segments_per_request=1, stream=False, **options), texts)
+    run("40 per request", server, LLMProvider(stream=False, **options), texts)
+    run("40 per request, streamed", server, LLMProvider(**options), texts)
+    run("40 per request, no prefix", server, UnstablePrefixProvider(**options), texts)
+    server.mangle_rate = args.mangle_rate
+    provider = LLMProvider(**options)
+    run(f"40 per request, {args.mangle_rate:.0%} dropped", server, provider, texts)
+    print(f"  segments asked for again: {provider.stats()['retried_segments']}")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Throughput of the offline local backend (MarianMT/NLLB) on CPU, in tokens per second.
+
+Run with ``python benchmarks/bench_local.py`` after ``pip install -e .[local]``.
+The model is downloaded on the first run unless ``--offline`` is given;
+``--model`` can point at a local model directory instead.
+"""
+
+import argparse
+import os
+import time
+
+from language_translator.local import LocalProvider
+
+SAMPLES_PATH = os.path.join(os.path.dirname(__file__), "data", "sample_en_es.tsv")
+
+
+def load_samples(path=SAMPLES_PATH):
+    """Return [(source, reference), ...] from a tab-separated file"""
+    with open(path, encoding="utf-8") as f:
+        return [tuple(line.rstrip("\n").split("\t")) for line in f if line.strip()]
+
+
+def count_tokens(tokenizer, texts):
+    return sum(len(ids) for ids in tokenizer(texts)["input_ids"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--family", choices=["marian", "nllb"], default="marian")
+    parser.add_argument("--model", help="model name or local directory (default: chosen per pair)")
+    parser.add_argument("--src", default="en")
+    parser.add_argument("--dest", default="es")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 16, 32])
+    parser.add_argument("--threads", type=int, help="torch intra-op threads (default: torch's choice)")
+    parser.add_argument("--beams", type=int, default=2)
+    parser.add_argument("--offline", action="store_true", help="never download models")
+    args = parser.parse_args()
+
+    import torch
+
+    sources = [source for source, _ in load_samples()]
+    provider = LocalProvider(args.family, model=args.model, num_beams=args.beams, num_threads=args.threads,
+                             allow_download=not args.offline)
+    model_name = provider.model_for(args.src, args.dest)[0]
+    start = time.perf_counter()
+    tokenizer, _ = provider.load(model_name)
+    print(f"model {model_name}: loaded in {time.perf_counter() - start:.1f} s, "
+          f"{torch.get_num_threads()} threads on {os.cpu_count()} CPUs")
+    provider.generate(sources[:4], args.src, args.dest)  # Warm-up
+
+    input_tokens = count_tokens(tokenizer, sources)
+    print(f"{len(sources)} sentences, {input_tokens} input tokens")
+    for batch_size in args.batch_sizes:
+        provider.batch_size = batch_size
+        start = time.perf_counter()
+        outputs = provider.generate(sources, args.src, args.dest)
+        seconds = time.perf_counter() - start
+        output_tokens = count_tokens(tokenizer, outputs)
+        print(f"  batch {batch_size:>3}: {seconds:6.2f} s  {len(sources) / seconds:6.1f} sentences/s"
+              f"  {input_tokens / seconds:7.1f} input tok/s  {output_tokens / seconds:7.1f} output tok/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Round trips and time for many short strings, one request each vs. packed into few requests.
+
+Run with ``python benchmarks/bench_packing.py`` after ``pip install -e .``.
+A stub Google endpoint with a fixed network latency translates UI-label
+and chat-line sized strings. Each configuration reports the requests the
+server saw, the time taken and whether every result matched its input;
+the last run mangles markers in some answers to exercise the fallback.
+"""
+
+import argparse
+import random
+import time
+
+from language_translator.clients import ClientPool
+from language_translator.engine import TranslationEngine
+from language_translator.packing import PackingProvider
+from language_translator.providers import GoogleProvider
+from stub_server import StubServer, fake_translate
+
+WORDS = ("save open close file edit view settings message hello thanks see you later send cancel "
+         "the new old report window help account profile search results please try again").split()
+
+
+def short_strings(count, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 8))).capitalize() + f" {i}"
+            for i in range(count)]
+
+
+def run(label, server, provider, texts):
+    server.statuses.clear()
+    engine = TranslationEngine(provider, cache=None, max_workers=4)
+    start = time.perf_counter()
+    translations = engine.translate_batch(texts, "en", "es")
+    seconds = time.perf_counter() - start
+    correct = sum(translation == fake_translate(text, "es") for text, translation in zip(texts, translations))
+    requests = sum(server.statuses.values())
+    print(f"{label:<24} {requests:>6} requests  {len(texts) / requests:5.1f} texts/request"
+          f"  {seconds:6.2f} s  correct {correct}/{len(texts)}")
+    engine.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="stub round-trip latency")
+    parser.add_argument("--mangle-rate", type=float, default=0.2, help="fraction of packed answers with a lost marker")
+    args = parser.parse_args()
+
+    texts = short_strings(args.texts)
+    print(f"{len(texts)} strings, {sum(map(len, texts)) / len(texts):.0f} characters on average")
+    server = StubServer(latency=args.latency_ms / 1000).start()
+    client = lambda: GoogleProvider(ClientPool(base_url=server.url))
+    run("one request per text", server, client(), texts)
+    run("packed", server, PackingProvider(client()), texts)
+    run("packed, 1000 chars max", server, PackingProvider(client(), max_chars=1000), texts)
+    server.mangle_rate = args.mangle_rate
+    run(f"packed, {args.mangle_rate:.0%} mangled", server, PackingProvider(client()), texts)
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
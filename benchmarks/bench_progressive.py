@@ -0,0 +1,62 @@
+"""Time to the first visible output vs. the whole translation when results are streamed in order.
+
+Run with ``python benchmarks/bench_progressive.py`` after ``pip install -e .``.
+Translates a long document of sentences the way the app's Translate button
+does (IncrementalTranslator with ``on_text``) against the stub Google and
+LLM endpoints, and reports when the first piece of output was available,
+when the whole translation was, how many pieces arrived and whether they
+join up to exactly the final text.
+"""
+
+import argparse
+import time
+
+from bench_packing import short_strings
+from language_translator.clients import ClientPool
+from language_translator.engine import TranslationEngine
+from language_translator.incremental import IncrementalTranslator
+from language_translator.llm import LLMProvider
+from language_translator.packing import PackingProvider
+from language_translator.providers import GoogleProvider
+from stub_llm_server import StubLLMServer
+from stub_server import StubServer
+
+
+def run(label, provider, text):
+    translator = IncrementalTranslator(TranslationEngine(provider, cache=None))
+    pieces = []
+    first = []
+    start = time.perf_counter()
+
+    def on_text(piece):
+        if not first:
+            first.append(time.perf_counter() - start)
+        pieces.append(piece)
+
+    translation, _ = translator.translate(text, "en", "es", on_text=on_text)
+    seconds = time.perf_counter() - start
+    print(f"{label:<28} first output {first[0] * 1000:7.0f} ms  complete {seconds * 1000:7.0f} ms"
+          f"  {len(pieces):>4} pieces  in order: {''.join(pieces) == translation}")
+    translator.engine.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=600)
+    args = parser.parse_args()
+
+    text = " ".join(sentence + "." for sentence in short_strings(args.sentences))
+    print(f"document: {args.sentences} sentences, {len(text)} characters")
+    google = StubServer(latency=0.05).start()
+    client = lambda: GoogleProvider(ClientPool(base_url=google.url))
+    run("google, per sentence", client(), text)
+    run("google, packed", PackingProvider(client()), text)
+    llm = StubLLMServer().start()
+    run("llm, streamed", LLMProvider(base_url=llm.url, api_key="stub"), text)
+    run("llm, not streamed", LLMProvider(base_url=llm.url, api_key="stub", stream=False), text)
+    google.stop()
+    llm.stop()
+
+
+if __name__ == "__main__":
+    main()
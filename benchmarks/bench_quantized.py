@@ -0,0 +1,120 @@
+"""Local backend: int8 "fast" mode vs. fp32 on latency, throughput, RSS and chrF.
+
+Run with ``python benchmarks/bench_quantized.py`` after ``pip install -e .[local]``.
+Each mode runs in its own process so resident memory is measured cleanly;
+the int8 mode runs twice, first quantizing and caching the weights, then
+loading the cached file. Quality is chrF against the references in
+``data/sample_en_es.tsv``.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from bench_local import count_tokens, load_samples
+from language_translator.local import LocalProvider
+
+
+def char_ngrams(text, n):
+    text = "".join(text.split())
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def chrf(hypotheses, references, max_n=6, beta=2):
+    """Corpus-level chrF (character n-gram F-score, whitespace ignored), 0-100"""
+    precisions, recalls = [], []
+    for n in range(1, max_n + 1):
+        matches = hypothesis_total = reference_total = 0
+        for hypothesis, reference in zip(hypotheses, references):
+            hyp, ref = char_ngrams(hypothesis, n), char_ngrams(reference, n)
+            matches += sum((hyp & ref).values())
+            hypothesis_total += sum(hyp.values())
+            reference_total += sum(ref.values())
+        if reference_total:
+            precisions.append(matches / hypothesis_total if hypothesis_total else 0.0)
+            recalls.append(matches / reference_total)
+    precision, recall = statistics.mean(precisions), statistics.mean(recalls)
+    if not precision + recall:
+        return 0.0
+    return 100 * (1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall)
+
+
+def rss_mb():
+    """Current resident set size of this process in MiB (Linux)"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def run_mode(args):
+    """Measure one quality mode in this process and print the results as JSON"""
+    samples = load_samples()
+    sources = [source for source, _ in samples]
+    references = [reference for _, reference in samples]
+    provider = LocalProvider(args.family, model=args.model, num_threads=args.threads, batch_size=args.batch_size,
+                             allow_download=not args.offline, quality=args.mode, quantized_dir=args.quantized_dir)
+    model_name = provider.model_for(args.src, args.dest)[0]
+
+    start = time.perf_counter()
+    tokenizer, _ = provider.load(model_name)
+    load_seconds = time.perf_counter() - start
+    provider.generate(sources[:2], args.src, args.dest)  # Warm-up
+
+    latencies = []
+    for sentence in sources[:args.latency_samples]:
+        start = time.perf_counter()
+        provider.generate([sentence], args.src, args.dest)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    outputs = provider.generate(sources, args.src, args.dest)
+    seconds = time.perf_counter() - start
+    print(json.dumps({
+        "load_s": load_seconds,
+        "latency_ms": statistics.median(latencies) * 1000,
+        "sentences_per_s": len(sources) / seconds,
+        "tokens_per_s": count_tokens(tokenizer, outputs) / seconds,
+        "rss_mb": rss_mb(),
+        "chrf": chrf(outputs, references),
+        "model_mb": provider.models.stats()["bytes"] / 2**20,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--family", choices=["marian", "nllb"], default="marian")
+    parser.add_argument("--model", help="model name or local directory (default: chosen per pair)")
+    parser.add_argument("--src", default="en")
+    parser.add_argument("--dest", default="es")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--threads", type=int, help="torch threads for both modes (default: per mode)")
+    parser.add_argument("--latency-samples", type=int, default=20, help="sentences timed one at a time")
+    parser.add_argument("--offline", action="store_true", help="never download models")
+    parser.add_argument("--quantized-dir", help="int8 cache directory (default: a fresh temporary one)")
+    parser.add_argument("--mode", choices=["accurate", "fast"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        return run_mode(args)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        args.quantized_dir = args.quantized_dir or workdir
+        child = [sys.executable, os.path.abspath(__file__)] + sys.argv[1:] + ["--quantized-dir", args.quantized_dir]
+        print(f"{'mode':<22}{'load s':>8}{'latency ms':>12}{'sent/s':>9}{'tok/s':>9}{'RSS MiB':>9}"
+              f"{'weights MiB':>13}{'chrF':>7}")
+        for label, mode in (("fp32", "accurate"), ("int8 (quantize+save)", "fast"), ("int8 (cached)", "fast")):
+            output = subprocess.run(child + ["--mode", mode], capture_output=True, text=True, check=True).stdout
+            r = json.loads(output.strip().splitlines()[-1])
+            print(f"{label:<22}{r['load_s']:8.2f}{r['latency_ms']:12.1f}{r['sentences_per_s']:9.1f}"
+                  f"{r['tokens_per_s']:9.1f}{r['rss_mb']:9.0f}{r['model_mb']:13.1f}{r['chrf']:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
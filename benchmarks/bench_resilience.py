@@ -0,0 +1,85 @@
+"""Rate limiting, retries and the circuit breaker against a fault-injecting stub provider.
+
+Run with ``python benchmarks/bench_resilience.py`` after ``pip install -e .``.
+Three scenarios, each translating the same requests from many threads:
+
+* quota: the stub allows ``--quota`` requests per second and answers 429
+  beyond that; compares no protection, retries only, a token bucket at the
+  quota, and a bucket set too high that adapts down on 429s.
+* transient: 10% of requests get 503 and 2% are dropped mid-connection.
+* outage: every request fails; compares retrying each request with failing
+  fast once the circuit breaker opens.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from language_translator.clients import ClientPool
+from language_translator.providers import GoogleProvider
+from language_translator.resilience import ResilientProvider
+from stub_server import StubServer
+
+
+def run(label, server, provider, requests_count, clients):
+    server.statuses.clear()
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            provider.translate_detailed(f"request {i}", "en", "es")
+            return time.perf_counter() - start, True
+        except Exception:
+            return time.perf_counter() - start, False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        results = list(pool.map(one, range(requests_count)))
+    seconds = time.perf_counter() - start
+    ok = sum(success for _, success in results)
+    failures = [latency for latency, success in results if not success]
+    statuses = ", ".join(f"{status}: {count}" for status, count in sorted(server.statuses.items()))
+    line = (f"  {label:<26} {ok:>4}/{requests_count} ok  {ok / seconds:6.1f} ok/s  server saw {sum(server.statuses.values()):>4}"
+            f" ({statuses})")
+    if failures:
+        line += f"  failures took {sum(failures) / len(failures) * 1000:.0f} ms on average"
+    print(line)
+
+
+def google(server):
+    return GoogleProvider(ClientPool(base_url=server.url, pool_maxsize=32))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--quota", type=float, default=50.0, help="stub's requests per second before 429")
+    args = parser.parse_args()
+    n, clients = args.requests, args.clients
+
+    print(f"quota: stub allows {args.quota:.0f} requests/s")
+    server = StubServer(latency=0.005, quota=args.quota).start()
+    run("no protection", server, ResilientProvider(google(server), retries=0), n, clients)
+    run("retries only", server, ResilientProvider(google(server), retries=6, failure_threshold=10**6), n, clients)
+    run("bucket at quota", server, ResilientProvider(google(server), rate=args.quota), n, clients)
+    run("bucket at 2x quota, adapts", server, ResilientProvider(google(server), rate=args.quota * 2), n, clients)
+    server.stop()
+
+    print("transient: 10% 503s, 2% dropped connections")
+    server = StubServer(latency=0.005, error_rate=0.10, drop_rate=0.02).start()
+    run("no retries", server, ResilientProvider(google(server), retries=0, failure_threshold=10**6), n, clients)
+    run("3 retries with backoff", server, ResilientProvider(google(server), backoff=0.05), n, clients)
+    server.stop()
+
+    print("outage: every request fails")
+    server = StubServer(latency=0.005).start()
+    server.down = True
+    run("retries, no breaker", server,
+        ResilientProvider(google(server), backoff=0.05, failure_threshold=10**6), n // 5, clients)
+    run("retries + circuit breaker", server, ResilientProvider(google(server), backoff=0.05), n // 5, clients)
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Load test of ``translingo serve``: throughput and latency with and without micro-batching.
+
+Run with ``python benchmarks/bench_serve.py`` after ``pip install -e .``.
+The server runs in-process on a stub provider that behaves like a batched
+model: each call costs a fixed overhead plus a little per text and calls are
+serialized (one batch in flight, as ``translingo serve`` runs a local model),
+so grouping requests is what raises throughput. Clients send
+single-text POST /translate requests over keep-alive connections for a few
+seconds at each concurrency level; 503s (queue full) are counted separately.
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+
+from language_translator.engine import TranslationEngine
+from language_translator.server import TranslationServer
+
+PAIRS = [("en", "es"), ("en", "de")]
+
+
+class StubModelProvider:
+    """Batched provider whose cost is ``overhead`` per call plus ``per_text`` per text, one call at a time"""
+
+    name = "stub-model"
+    batch_size = 64
+
+    def __init__(self, overhead=0.02, per_text=0.001):
+        self.overhead = overhead
+        self.per_text = per_text
+        self._lock = threading.Lock()
+
+    def translate_many(self, texts, src, dest):
+        with self._lock:
+            time.sleep(self.overhead + self.per_text * len(texts))
+        return [(f"[{dest}] {text}", src) for text in texts]
+
+    def translate_detailed(self, text, src, dest):
+        return self.translate_many([text], src, dest)[0]
+
+    def supported_languages(self):
+        return []
+
+    def close(self):
+        pass
+
+
+def client(port, seconds, latencies, status_counts, index):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    src, dest = PAIRS[index % len(PAIRS)]
+    deadline = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < deadline:
+        body = json.dumps({"text": f"sentence {index}-{n}", "src": src, "dest": dest})
+        start = time.perf_counter()
+        connection.request("POST", "/translate", body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        response.read()
+        if response.status == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            status_counts[response.status] = status_counts.get(response.status, 0) + 1
+            time.sleep(0.01)  # Back off as a Retry-After client would
+        n += 1
+    connection.close()
+
+
+def run(label, clients, seconds, overhead, per_text, **batcher_options):
+    engine = TranslationEngine(StubModelProvider(overhead, per_text), cache=None)
+    server = TranslationServer(engine, port=0, **batcher_options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    latencies, status_counts = [], {}
+    threads = [threading.Thread(target=client, args=(server.server_address[1], seconds, latencies, status_counts, i))
+               for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = server.batcher.stats()
+    server.shutdown()
+    server.server_close()
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+    rejected = sum(status_counts.values())
+    print(f"{label:<12} {clients:>4} clients  {len(latencies) / seconds:7.1f} req/s"
+          f"  p50 {statistics.median(latencies) * 1000 if latencies else 0:7.1f} ms  p95 {p95 * 1000:7.1f} ms"
+          f"  mean batch {stats['mean_batch']:5.1f}  rejected {rejected}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--seconds", type=float, default=3.0, help="duration of each run")
+    parser.add_argument("--overhead-ms", type=float, default=20.0, help="stub cost per model call")
+    parser.add_argument("--per-text-ms", type=float, default=1.0, help="stub cost per text in a call")
+    args = parser.parse_args()
+
+    costs = (args.seconds, args.overhead_ms / 1000, args.per_text_ms / 1000)
+    for clients in args.clients:
+        run("unbatched", clients, *costs, max_batch=1, workers=1)
+        run("micro-batch", clients, *costs, max_batch=32, max_wait=0.005, workers=1)
+    # Backpressure: more clients than the queue holds get 503 instead of unbounded waits
+    run("small queue", max(args.clients), *costs, max_batch=8, max_queue=16, workers=1)
+
+
+if __name__ == "__main__":
+    main()
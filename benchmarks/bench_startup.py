@@ -0,0 +1,95 @@
+"""Cold-start budget check for TransLingo.py.
+
+Measures, in fresh interpreters:
+
+* import cost of the app module, from ``python -X importtime``
+* time to first window (Tk root + app constructed and drawn), when a
+  display is available
+
+and exits non-zero if either exceeds its budget, so it can guard against
+regressions in CI. Run with ``python benchmarks/bench_startup.py`` after
+``pip install -e .``.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_WINDOW = (
+    "import time\n"
+    "_start = time.perf_counter()\n"
+    "import sys, tkinter as tk\n"
+    "sys.path.insert(0, {root!r})\n"
+    "import TransLingo\n"
+    "root = tk.Tk()\n"
+    "app = TransLingo.EnhancedLanguageTranslatorApp(root)\n"
+    "root.update()\n"
+    "print((time.perf_counter() - _start) * 1000)\n"
+    "root.destroy()\n"
+)
+
+
+def import_profile(module="TransLingo"):
+    """Return (total ms, [(cumulative ms, name), ...]) for importing module"""
+    code = f"import sys; sys.path.insert(0, {REPO_ROOT!r}); import {module}"
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True).stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((int(cumulative) / 1000, name.rstrip()))
+    # Top-level imports have no indentation in the name column
+    top_level = [(ms, name.strip()) for ms, name in entries if not name.startswith("  ")]
+    return sum(ms for ms, _ in top_level if _ != "site"), sorted(top_level, reverse=True)
+
+
+def first_window(runs):
+    """Median ms until the main window has been drawn, or None without a display"""
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return None
+    samples = []
+    with tempfile.TemporaryDirectory() as workdir:  # Keep caches and history out of the repo
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", FIRST_WINDOW.format(root=REPO_ROOT)],
+                                    capture_output=True, text=True, check=True, cwd=workdir).stdout
+            samples.append(float(output.split()[0]))
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=100.0,
+                        help="about 70 ms is typical; the eager imports this guards against took ~280 ms")
+    parser.add_argument("--window-budget-ms", type=float, default=600.0)
+    args = parser.parse_args()
+
+    failed = False
+    samples = [import_profile() for _ in range(args.runs)]
+    import_ms = statistics.median(total for total, _ in samples)
+    print(f"import TransLingo: {import_ms:7.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    for ms, name in samples[-1][1][:8]:
+        print(f"  {ms:7.1f} ms  {name}")
+    failed |= import_ms > args.import_budget_ms
+
+    window_ms = first_window(args.runs)
+    if window_ms is None:
+        print("time to first window: skipped (no display)")
+    else:
+        print(f"time to first window: {window_ms:7.1f} ms (budget {args.window_budget_ms:.0f} ms)")
+        failed |= window_ms > args.window_budget_ms
+
+    if failed:
+        print("Startup budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
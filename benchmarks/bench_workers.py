@@ -0,0 +1,72 @@
+"""Local backend in worker processes: throughput by worker count, shared memory, crash recovery.
+
+Run with ``python benchmarks/bench_workers.py`` after ``pip install -e .[local]``.
+For each worker count the model is loaded in the parent and the workers are
+forked from it; "private MiB" is the memory each worker does not share with
+the parent (from /proc/<pid>/smaps_rollup, Linux only). Finally one worker
+is killed and the time for the next request, which reforks it, is reported.
+"""
+
+import argparse
+import os
+import signal
+import time
+
+from bench_local import load_samples
+from language_translator.providers import make_provider
+
+
+def memory_mb(pid):
+    """(RSS, private) memory of a process in MiB"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3:
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields["Rss"] / 1024, (fields["Private_Clean"] + fields["Private_Dirty"]) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--family", choices=["marian", "nllb"], default="marian")
+    parser.add_argument("--model", help="model name or local directory (default: chosen per pair)")
+    parser.add_argument("--src", default="en")
+    parser.add_argument("--dest", default="es")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4], help="0 runs in this process")
+    parser.add_argument("--repeat", type=int, default=4, help="copies of the sample set per run")
+    parser.add_argument("--offline", action="store_true", help="never download models")
+    args = parser.parse_args()
+
+    sources = [source for source, _ in load_samples()] * args.repeat
+    print(f"{len(sources)} sentences, {os.cpu_count()} CPUs")
+    pool = None
+    for workers in args.workers:
+        provider = make_provider(args.family, workers=workers, model=args.model, allow_download=not args.offline)
+        provider.warm(args.src, args.dest)
+        provider.translate_many(sources[:8], args.src, args.dest)  # Warm-up
+        start = time.perf_counter()
+        provider.translate_many(sources, args.src, args.dest)
+        seconds = time.perf_counter() - start
+        line = f"  workers {workers}: {len(sources) / seconds:7.1f} sentences/s"
+        if workers:
+            memory = [memory_mb(pid) for pid in provider.pids()]
+            line += (f"  worker RSS {max(rss for rss, _ in memory):6.0f} MiB"
+                     f"  private {max(private for _, private in memory):6.0f} MiB")
+        print(line)
+        if pool is None and workers:
+            pool = provider
+        else:
+            provider.close()
+
+    if pool is not None:
+        os.kill(pool.pids()[0], signal.SIGKILL)
+        start = time.perf_counter()
+        pool.translate_many(sources[:pool.workers], args.src, args.dest)
+        print(f"after killing a worker: next request took {(time.perf_counter() - start) * 1000:.0f} ms, "
+              f"{pool.crashes} crash(es) recovered")
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
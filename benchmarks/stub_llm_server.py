@@ -0,0 +1,153 @@
+"""Local stub of an OpenAI-compatible chat completions endpoint used by the LLM benchmarks.
+
+It answers the JSON translation requests LLMProvider sends, with a crude
+cost model: a fixed overhead per request, ``prefill`` seconds per prompt
+token that is not in the prefix cache and ``decode`` seconds per generated
+token. Prompt prefixes are cached as hosted APIs do it: a prompt shorter
+than MIN_CACHED_TOKENS is never served from the cache, and longer ones hit
+in steps of BLOCK_TOKENS. Cache hits are reported as cached_tokens.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from stub_server import fake_translate
+
+CHARS_PER_TOKEN = 4
+MIN_CACHED_TOKENS = 1024  # OpenAI's minimum for prompt caching
+BLOCK_TOKENS = 128  # Cache hits grow in increments of this many tokens
+BLOCK_CHARS = BLOCK_TOKENS * CHARS_PER_TOKEN
+
+
+def tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            return self.send_json({"error": {"message": "not found"}}, 404)
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        server = self.server
+        prompt = "".join(message["content"] for message in body["messages"])
+        request = json.loads(body["messages"][-1]["content"])
+        translations = [{"id": segment["id"], "text": fake_translate(segment["text"], request["target"])}
+                        for segment in request["segments"]]
+        if server.mangle_rate and len(translations) > 1 and random.random() < server.mangle_rate:
+            translations.pop(random.randrange(len(translations)))  # The model skipped a segment
+        answer = json.dumps({"translations": translations, "source_language": "en"}, ensure_ascii=False)
+        cached = server.cached_chars(prompt)
+        usage = {"prompt_tokens": tokens(prompt), "completion_tokens": tokens(answer),
+                 "total_tokens": tokens(prompt) + tokens(answer),
+                 "prompt_tokens_details": {"cached_tokens": cached // CHARS_PER_TOKEN}}
+        server.record(usage)
+        time.sleep(server.overhead + (tokens(prompt) - cached // CHARS_PER_TOKEN) * server.prefill)
+        if not body.get("stream"):
+            time.sleep(tokens(answer) * server.decode)
+            return self.send_json({"id": "stub", "object": "chat.completion", "model": body["model"],
+                                   "choices": [{"index": 0, "message": {"role": "assistant", "content": answer},
+                                                "finish_reason": "stop"}],
+                                   "usage": usage})
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        step = 8 * CHARS_PER_TOKEN  # Flush every 8 tokens
+        for start in range(0, len(answer), step):
+            time.sleep(8 * server.decode)
+            self.send_event({"choices": [{"index": 0, "delta": {"content": answer[start:start + step]}}]})
+        self.send_event({"choices": [], "usage": usage})
+        self.send_chunk(b"data: [DONE]\n\n")
+        self.send_chunk(b"")
+
+    def send_event(self, payload):
+        self.send_chunk(f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8"))
+
+    def send_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def send_json(self, payload, status=200):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    """Stub chat completions server; ``mangle_rate`` of batch answers leave out one segment"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, port=0, overhead=0.05, prefill=0.0002, decode=0.002, mangle_rate=0.0):
+        super().__init__(("127.0.0.1", port), StubLLMHandler)
+        self.overhead = overhead
+        self.prefill = prefill
+        self.decode = decode
+        self.mangle_rate = mangle_rate
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self._blocks = set()
+        self._lock = threading.Lock()
+
+    def cached_chars(self, prompt):
+        """Length of the prompt prefix already cached, in whole blocks; caches the rest
+
+        Nothing counts as cached until the hit reaches MIN_CACHED_TOKENS.
+        """
+        digest = hashlib.sha256()
+        cached, hit = 0, True
+        with self._lock:
+            for start in range(0, len(prompt) - BLOCK_CHARS + 1, BLOCK_CHARS):
+                digest.update(prompt[start:start + BLOCK_CHARS].encode("utf-8"))
+                key = digest.copy().hexdigest()
+                if hit and key in self._blocks:
+                    cached += BLOCK_CHARS
+                else:
+                    hit = False
+                    self._blocks.add(key)
+        return cached if cached >= MIN_CACHED_TOKENS * CHARS_PER_TOKEN else 0
+
+    def clear(self):
+        """Forget cached prefixes and counts"""
+        with self._lock:
+            self._blocks.clear()
+            self.requests = self.prompt_tokens = self.cached_tokens = 0
+
+    def record(self, usage):
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += usage["prompt_tokens"]
+            self.cached_tokens += usage["prompt_tokens_details"]["cached_tokens"]
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    server = StubLLMServer(port=8766)
+    print(f"Stub chat completions server on {server.url}")
+    server.serve_forever()
@@ -0,0 +1,137 @@
+"""Local stub of the Google Translate endpoint used by the benchmarks, with optional fault injection."""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def fake_translate(text, target):
+    """Deterministic stand-in for a real translation, line by line; lines without letters are kept"""
+    return "\n".join(f"[{target}] {line}" if any(c.isalpha() for c in line) else line
+                     for line in text.split("\n"))
+
+
+def mangle(text):
+    """Damage the first [[n]] marker the way translators sometimes do, by dropping it"""
+    return re.sub(r"\n?\[\[\d+\]\]\n?", " ", text, count=1)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        server = self.server
+        fault = server.fault()
+        if fault == "drop":
+            self.close_connection = True  # Hang up without answering
+            return
+        if fault == "throttle":
+            return self.send_json({"error": "rate limit exceeded"}, status=429, headers={"Retry-After": "1"})
+        if fault == "error":
+            return self.send_json({"error": "unavailable"}, status=503)
+        if fault == "stall":
+            time.sleep(server.stall)
+        elif server.latency:
+            time.sleep(server.latency)
+        text = params.get("q", "")
+        source = params.get("sl", "auto")
+        translation = fake_translate(text, params.get("tl", "en"))
+        if server.mangle_rate and random.random() < server.mangle_rate:
+            translation = mangle(translation)
+        body = [[[translation, text, None, None, 10]], None,
+                "en" if source == "auto" else source]
+        self.send_json(body)
+
+    def send_json(self, payload, status=200, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.server.record(status)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Stub endpoint; the fault settings can be changed while it runs
+
+    ``error_rate`` of requests get 503, ``drop_rate`` have their connection
+    closed unanswered and ``stall_rate`` take ``stall`` seconds instead of
+    ``latency``. With ``quota`` set, requests beyond that many per second
+    get 429 with Retry-After, like a provider's rate limit; ``down`` makes
+    every request 503. ``mangle_rate`` of translations lose a [[n]] marker.
+    ``statuses`` counts the answers sent.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, handler=StubHandler, port=0, latency=0.0, error_rate=0.0, drop_rate=0.0, stall_rate=0.0,
+                 stall=1.0, quota=None, mangle_rate=0.0):
+        super().__init__(("127.0.0.1", port), handler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.quota = quota
+        self.mangle_rate = mangle_rate
+        self.down = False
+        self.statuses = Counter()
+        self._allowance = quota or 0.0
+        self._checked = time.monotonic()
+        self._lock = threading.Lock()
+
+    def fault(self):
+        """Pick what happens to the next request: None, "drop", "throttle", "error" or "stall"."""
+        with self._lock:
+            if self.quota:
+                now = time.monotonic()
+                self._allowance = min(self.quota, self._allowance + (now - self._checked) * self.quota)
+                self._checked = now
+                if self._allowance < 1:
+                    return "throttle"
+                self._allowance -= 1
+        if self.down:
+            return "error"
+        roll = random.random()
+        for fault, rate in (("drop", self.drop_rate), ("error", self.error_rate), ("stall", self.stall_rate)):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def record(self, status):
+        with self._lock:
+            self.statuses[status] += 1
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    server = StubServer(port=8765)
+    print(f"Stub translate server on {server.url}")
+    server.serve_forever()
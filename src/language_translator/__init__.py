@@ -1,5 +1,21 @@
 """Language Translator package."""
 
-from .translator import LanguageTranslatorApp
+import importlib
 
-__all__ = ['LanguageTranslatorApp']
+# Public names and the submodule defining each. Submodules are imported on
+# first access so that importing the package stays cheap and needs no display.
+_EXPORTS = {
+    'LanguageTranslatorApp': '.translator',
+    'TranslationCache': '.cache',
+    'TranslationEngine': '.engine',
+    'translate': '.engine',
+    'translate_batch': '.engine',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,257 @@
+"""Streaming batch translation of JSONL, CSV and plain-text corpora with resumable checkpoints."""
+
+import csv
+import io
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .failover import LatencyHistogram
+
+FORMATS = ("jsonl", "csv", "txt")
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+
+def detect_format(path):
+    """Guess the corpus format from a file name: .jsonl/.ndjson, .csv/.tsv, anything else is text"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension in (".csv", ".tsv"):
+        return "csv"
+    return "txt"
+
+
+def read_lines(f, offset):
+    """Yield (line, end offset) from a binary file, starting at byte ``offset``"""
+    f.seek(offset)
+    for raw in f:
+        offset += len(raw)
+        line = raw.decode("utf-8")
+        if offset == len(raw):
+            line = line.lstrip("\ufeff")
+        yield line, offset
+
+
+class CorpusReader:
+    """Iterate (record, text, end offset) over a corpus file from a byte offset.
+
+    Records are JSON objects (jsonl), rows (csv) or lines (txt); ``field`` is
+    the JSON key or CSV column holding the text to translate. Only the current
+    line is held in memory, and the end offset is where reading resumes after
+    that record.
+    """
+
+    def __init__(self, path, fmt, field="text", delimiter=","):
+        self.path = path
+        self.format = fmt
+        self.field = field
+        self.delimiter = delimiter
+        self.header = None
+        self.data_offset = 0  # Where records start (after the CSV header)
+        self.position = 0  # End offset of the last line handed to the CSV reader
+        if fmt == "csv":
+            with open(path, "rb") as f:
+                lines = read_lines(f, 0)
+                self.header = next(csv.reader(self._track(lines), delimiter=delimiter), None)
+                self.data_offset = self.position
+            if self.header is None:
+                raise ValueError(f"{path} is empty")
+            if field not in self.header:
+                raise ValueError(f"{path} has no column {field!r}; columns are {', '.join(self.header)}")
+
+    def records(self, offset=0):
+        offset = max(offset, self.data_offset)
+        with open(self.path, "rb") as f:
+            if self.format == "txt":
+                for line, end in read_lines(f, offset):
+                    text = line.rstrip("\r\n")
+                    yield text, text, end
+            elif self.format == "jsonl":
+                for line, end in read_lines(f, offset):
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    text = record.get(self.field) if isinstance(record, dict) else None
+                    yield record, text if isinstance(text, str) else "", end
+            else:
+                column = self.header.index(self.field)
+                for row in csv.reader(self._track(read_lines(f, offset)), delimiter=self.delimiter):
+                    # The reader pulls exactly the lines of this row, so the tracked offset is its end
+                    yield row, row[column] if column < len(row) else "", self.position
+
+    def _track(self, lines):
+        """Yield the lines alone, keeping the end offset of the last one in ``position``"""
+        for line, self.position in lines:
+            yield line
+
+
+class CorpusWriter:
+    """Append translated records to an output file in the input's format"""
+
+    def __init__(self, f, fmt, output_field="translation", delimiter=",", header=None):
+        self.f = f
+        self.format = fmt
+        self.output_field = output_field
+        self.delimiter = delimiter
+        self.header = header
+
+    def write_header(self):
+        if self.format == "csv":
+            self.write_rows([self.header + [self.output_field]])
+
+    def write_rows(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter=self.delimiter, lineterminator="\n").writerows(rows)
+        self.f.write(buffer.getvalue().encode("utf-8"))
+
+    def write(self, records, translations):
+        if self.format == "csv":
+            self.write_rows([row + [translation] for row, translation in zip(records, translations)])
+        elif self.format == "jsonl":
+            lines = []
+            for record, translation in zip(records, translations):
+                if isinstance(record, dict):
+                    record[self.output_field] = translation
+                lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+            self.f.write("".join(lines).encode("utf-8"))
+        else:
+            # One line in, one line out, even if a translation contains a line break
+            self.f.write("".join(" ".join(t.splitlines()) + "\n" for t in translations).encode("utf-8"))
+
+
+class Checkpoint:
+    """Progress of one batch run, saved atomically next to the output file"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, state):
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temporary, self.path)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def batched(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def translate_file(engine, input_path, output_path, src="auto", dest="en", fmt=None, field="text",
+                   output_field="translation", batch_size=64, concurrency=4, restart=False, progress=None):
+    """Translate a corpus file into ``output_path`` and return a summary dict
+
+    Records are read lazily and translated ``batch_size`` at a time with at
+    most ``concurrency`` batches in flight; finished batches are written in
+    input order as soon as they are ready, so memory stays flat however big
+    the input is. After every batch a checkpoint (the input and output byte
+    offsets) is saved beside the output; if it exists, the run resumes from
+    it unless ``restart`` is set. ``progress(summary)`` is called after each
+    batch.
+    """
+    fmt = fmt or detect_format(input_path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown corpus format: {fmt}")
+    delimiter = "\t" if input_path.lower().endswith(".tsv") else ","
+    reader = CorpusReader(input_path, fmt, field, delimiter)
+    writer_options = {"output_field": output_field, "delimiter": delimiter, "header": reader.header}
+    checkpoint = Checkpoint(output_path + CHECKPOINT_SUFFIX)
+    settings = {"input": os.path.abspath(input_path), "src": src, "dest": dest, "format": fmt, "field": field}
+    state = None if restart else checkpoint.load()
+    if state is not None:
+        if state["settings"] != settings:
+            raise ValueError(f"{checkpoint.path} belongs to a different run; use restart to start over")
+        if os.path.getsize(input_path) < state["input_offset"]:
+            raise ValueError(f"{input_path} is shorter than when {checkpoint.path} was written")
+    else:
+        state = {"settings": settings, "input_offset": 0, "output_offset": 0, "records": 0}
+
+    summary = {"records": state["records"], "resumed_from": state["records"], "translated": 0, "characters": 0,
+               "batches": 0, "seconds": 0.0, "latency": LatencyHistogram(), "max_latency": 0.0}
+    start = time.perf_counter()
+
+    def translate(texts):
+        began = time.perf_counter()
+        translations = engine.translate_batch(texts, src, dest)
+        return translations, time.perf_counter() - began
+
+    with open(output_path, "r+b" if state["output_offset"] else "wb") as f, \
+            ThreadPoolExecutor(concurrency, thread_name_prefix="batch") as executor:
+        f.truncate(state["output_offset"])  # Drop anything written after the last checkpoint
+        f.seek(state["output_offset"])
+        writer = CorpusWriter(f, fmt, **writer_options)
+        if not state["output_offset"]:
+            writer.write_header()
+        in_flight = deque()
+
+        def finish_oldest():
+            batch, future = in_flight.popleft()
+            translations, latency = future.result()
+            writer.write([record for record, _, _ in batch], translations)
+            f.flush()
+            state["input_offset"] = batch[-1][2]
+            state["output_offset"] = f.tell()
+            state["records"] += len(batch)
+            checkpoint.save(state)
+            summary["records"] = state["records"]
+            summary["translated"] += len(batch)
+            summary["characters"] += sum(len(text) for _, text, _ in batch)
+            summary["batches"] += 1
+            summary["latency"].record(latency)
+            summary["max_latency"] = max(summary["max_latency"], latency)
+            summary["seconds"] = time.perf_counter() - start
+            if progress:
+                progress(summary)
+
+        try:
+            for batch in batched(reader.records(state["input_offset"]), batch_size):
+                in_flight.append((batch, executor.submit(translate, [text for _, text, _ in batch])))
+                if len(in_flight) >= concurrency:
+                    finish_oldest()
+            while in_flight:
+                finish_oldest()
+        except BaseException:
+            for _, future in in_flight:
+                future.cancel()
+            raise
+    checkpoint.remove()
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def format_summary(summary):
+    """One-paragraph report of a batch run: throughput and batch latency percentiles"""
+    seconds = summary["seconds"] or 1e-9
+    latency = summary["latency"]
+    lines = [f"{summary['translated']} records translated in {summary['seconds']:.1f} s"
+             f" ({summary['translated'] / seconds:.1f} records/s, {summary['characters'] / seconds:.0f} chars/s)"]
+    if summary["resumed_from"]:
+        lines.append(f"resumed after {summary['resumed_from']} records; {summary['records']} done in total")
+    if latency.total:
+        # Percentiles are bucket upper bounds, so within 25% of the true value and capped at the maximum
+        p50, p95 = (min(latency.percentile(q), summary["max_latency"]) * 1000 for q in (0.5, 0.95))
+        lines.append(f"batch latency: p50 {p50:.0f} ms, p95 {p95:.0f} ms, max {summary['max_latency'] * 1000:.0f} ms"
+                     f" over {latency.total} batches")
+    return "\n".join(lines)
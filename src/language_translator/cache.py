@@ -0,0 +1,143 @@
+"""Persistent translation cache backed by SQLite."""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from .languages import get_registry
+
+DEFAULT_CACHE_PATH = "translation_cache.db"
+
+
+def normalize_text(text):
+    """Normalize text so trivially different inputs share a cache entry
+
+    Runs of spaces and tabs collapse and the ends are trimmed, but line
+    breaks are kept: text that differs in its lines or paragraphs
+    translates differently.
+    """
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(" ".join(re.split(r"[^\S\n]+", line)).strip() for line in text.split("\n")).strip()
+
+
+def cache_key(text, src, dest, namespace=""):
+    """Build the lookup key for a text and language pair, within a provider's ``namespace``"""
+    registry = get_registry()
+    digest = hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{namespace}|{registry.code(src)}:{registry.code(dest)}:{digest}"
+
+
+class TranslationCache:
+    """On-disk cache of translations keyed by normalized text and language pair.
+
+    Each provider gets its own ``namespace`` (see ``provider_namespace``), so
+    switching backends or model quality never returns another one's output.
+
+    Entries older than ``max_age`` seconds are treated as misses and purged, and
+    once the cache holds more than ``max_entries`` rows the least recently used
+    ones are evicted.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=50000, max_age=30 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " key TEXT PRIMARY KEY,"
+            " translation TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON translations(last_used)")
+
+    def get(self, text, src, dest, namespace=""):
+        """Return the cached translation or None"""
+        key = cache_key(text, src, dest, namespace)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation, created FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.max_age and now - row[1] > self.max_age):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE translations SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, text, src, dest, translation, namespace=""):
+        """Store a translation, evicting old entries when over budget"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                (cache_key(text, src, dest, namespace), translation, now, now),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._evict(now)
+
+    def seed(self, entries, namespace=""):
+        """Pre-populate the cache from translation history entries made in ``namespace``
+
+        Entries recorded by another backend, or by an unknown one, are skipped.
+        """
+        now = time.time()
+        rows = [
+            (cache_key(e["original"], e["src_lang"], e["dest_lang"], namespace), e["translation"], now, now)
+            for e in entries
+            if e.get("original") and e.get("translation") and e.get("backend") == namespace
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR IGNORE INTO translations VALUES (?, ?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+
+    def _evict(self, now):
+        """Drop expired entries and trim to max_entries by least recent use"""
+        if self.max_age:
+            self._conn.execute("DELETE FROM translations WHERE created < ?", (now - self.max_age,))
+        if self.max_entries:
+            self._conn.execute(
+                "DELETE FROM translations WHERE key IN ("
+                " SELECT key FROM translations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def evict(self):
+        """Run eviction immediately"""
+        with self._lock:
+            self._evict(time.time())
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": size,
+        }
+
+    def clear(self):
+        """Remove every cached translation"""
+        with self._lock:
+            self._conn.execute("DELETE FROM translations")
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,63 @@
+"""Split long text into provider-sized chunks at sentence and paragraph boundaries."""
+
+import re
+
+DEFAULT_CHUNK_SIZE = 4500  # Google rejects requests over 5000 characters
+
+# A boundary follows sentence-ending punctuation (plus closing quotes/brackets
+# and whitespace), CJK full stops, or a line break.
+BOUNDARY_RE = re.compile(r'[.!?…]+["\'”’)\]»]*\s+|[。！？]+\s*|\n\s*')
+
+
+def split_sentences(text):
+    """Split text into sentences; joining the result gives back the original text"""
+    sentences = []
+    start = 0
+    for match in BOUNDARY_RE.finditer(text):
+        sentences.append(text[start:match.end()])
+        start = match.end()
+    if start < len(text):
+        sentences.append(text[start:])
+    return sentences
+
+
+def _split_oversized(sentence, max_chars):
+    """Break a single sentence longer than max_chars at whitespace, or hard if needed"""
+    pieces = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(" ", 0, max_chars)
+        cut = cut + 1 if cut > 0 else max_chars
+        pieces.append(sentence[:cut])
+        sentence = sentence[cut:]
+    if sentence:
+        pieces.append(sentence)
+    return pieces
+
+
+def split_text(text, max_chars=DEFAULT_CHUNK_SIZE):
+    """Pack sentences into chunks of at most max_chars, preserving the original text"""
+    chunks = []
+    current = ""
+    for sentence in split_sentences(text):
+        if len(sentence) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_split_oversized(sentence, max_chars))
+        elif len(current) + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current += sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_padding(chunk):
+    """Return (leading whitespace, content, trailing whitespace) for a chunk"""
+    content = chunk.strip()
+    if not content:
+        return chunk, "", ""
+    start = chunk.index(content)
+    return chunk[:start], content, chunk[start + len(content):]
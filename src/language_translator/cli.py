@@ -0,0 +1,186 @@
+"""Command-line entry point: ``translingo batch`` and ``translingo serve`` run the engine without the GUI."""
+
+import argparse
+import sys
+
+from .batch import FORMATS, format_summary, translate_file
+from .cache import TranslationCache
+from .chunking import DEFAULT_CHUNK_SIZE
+from .clients import ClientPool
+from .engine import TranslationEngine
+from .failover import FailoverProvider
+from .llm import LLMProvider
+from .packing import PackingProvider
+from .providers import GoogleProvider, make_provider
+from .resilience import ResilientProvider
+
+BACKENDS = ("google", "googletrans", "llm", "marian", "nllb")
+
+
+def build_provider(backend, args):
+    if backend == "google":
+        options = {"clients": ClientPool(base_url=args.endpoint)} if args.endpoint else {}
+        provider = ResilientProvider(GoogleProvider(**options), rate=args.rate_limit, burst=args.burst,
+                                     retries=args.retries)
+        return PackingProvider(provider, max_chars=args.pack_chars) if args.pack_chars else provider
+    if backend == "llm":
+        return make_provider(backend, model=args.model, base_url=args.endpoint, max_workers=args.concurrency)
+    if backend in ("marian", "nllb"):
+        return make_provider(backend, workers=args.workers, model=args.model, quality=args.quality)
+    return make_provider(backend)
+
+
+def warm(engine, pairs):
+    """Load local models for ``pairs`` up front
+
+    Worker pools load them in the parent and refork their workers, so the
+    weights are shared copy-on-write rather than loaded once per worker.
+    """
+    providers = engine.provider.providers if isinstance(engine.provider, FailoverProvider) else [engine.provider]
+    for provider in providers:
+        if pairs and hasattr(provider, "prewarm"):
+            provider.prewarm(pairs)
+
+
+def language_pair(value):
+    """--warm: "SRC:DEST" """
+    src, separator, dest = value.partition(":")
+    if not separator or not src or not dest:
+        raise argparse.ArgumentTypeError(f"expected SRC:DEST, got {value!r}")
+    return src, dest
+
+
+def hedge_after(value):
+    """--hedge-after: "auto" or a delay in milliseconds"""
+    return value if value == "auto" else float(value) / 1000
+
+
+def make_engine(args):
+    """Build the engine for the backend options shared by the subcommands"""
+    provider = build_provider(args.backend, args)
+    if args.fallback:
+        providers = [provider] + [build_provider(backend, args) for backend in args.fallback]
+        provider = FailoverProvider(providers, hedge_after=args.hedge_after)
+    cache = None if args.no_cache else TranslationCache()
+    return TranslationEngine(provider, cache=cache, max_workers=args.concurrency)
+
+
+def add_backend_arguments(parser):
+    group = parser.add_argument_group("translation backend")
+    group.add_argument("--backend", choices=BACKENDS, default="google")
+    group.add_argument("--fallback", choices=BACKENDS, action="append",
+                       help="backend to fail over to when the previous ones fail (repeatable)")
+    group.add_argument("--hedge-after", type=hedge_after, metavar="MS|auto",
+                       help="also ask the next backend when one takes longer than this (auto: its p95)")
+    group.add_argument("--endpoint", help="Google-compatible translate URL (google), or OpenAI-compatible API "
+                                          "base URL such as http://localhost:8000/v1 (llm; key from OPENAI_API_KEY)")
+    group.add_argument("--rate-limit", type=float, metavar="REQ/S",
+                       help="requests per second to the google backend (lowered further on 429)")
+    group.add_argument("--burst", type=float, help="requests allowed at once before --rate-limit applies")
+    group.add_argument("--retries", type=int, default=3, help="retries of transient google backend errors")
+    group.add_argument("--pack-chars", type=int, default=DEFAULT_CHUNK_SIZE,
+                       help="join short texts into google requests of up to this many characters (0: one per text)")
+    group.add_argument("--model", help="model name or local directory (marian/nllb), or chat model name (llm)")
+    group.add_argument("--quality", choices=["accurate", "fast"], default="accurate", help="marian/nllb precision")
+    group.add_argument("--workers", type=int, default=0, help="worker processes for marian/nllb (0: in process)")
+    group.add_argument("--concurrency", type=int, default=4, help="requests or batches in flight")
+    group.add_argument("--no-cache", action="store_true", help="skip the on-disk translation cache")
+
+
+def run_batch(args):
+    engine = make_engine(args)
+    warm(engine, [(args.src, args.dest)])
+
+    def progress(summary):
+        if args.progress:
+            print(f"\r{summary['records']} records, {summary['translated'] / (summary['seconds'] or 1e-9):.1f}/s",
+                  end="", file=sys.stderr, flush=True)
+
+    try:
+        summary = translate_file(engine, args.input, args.output, args.src, args.dest, args.format, args.field,
+                                 args.output_field, args.batch_size, args.concurrency, args.restart, progress)
+    except KeyboardInterrupt:
+        print("\nInterrupted; run the same command again to resume", file=sys.stderr)
+        return 130
+    except (OSError, ValueError) as e:
+        print(f"translingo batch: {e}", file=sys.stderr)
+        return 1
+    finally:
+        engine.close()
+    if args.progress:
+        print(file=sys.stderr)
+    print(format_summary(summary), file=sys.stderr)
+    return 0
+
+
+def run_serve(args):
+    from .server import TranslationServer
+
+    engine = make_engine(args)
+    warm(engine, args.warm)
+    workers = args.concurrency
+    primary = engine.provider.providers[0] if isinstance(engine.provider, FailoverProvider) else engine.provider
+    if getattr(primary, "batch_size", None) and not isinstance(primary, (PackingProvider, LLMProvider)):
+        # A local model runs one batch per process at a time; more in flight would only shrink the batches
+        workers = getattr(primary, "workers", 1)
+    server = TranslationServer(engine, args.host, args.port, timeout=args.timeout, verbose=args.verbose,
+                               max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000,
+                               max_queue=args.max_queue, workers=workers)
+    print(f"Serving translations on {server.url} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        engine.close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="translingo", description="TransLingo translation tools")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    batch = commands.add_parser(
+        "batch", help="translate a JSONL, CSV or text corpus",
+        description="Stream a corpus through the translation engine, writing results as they finish. "
+                    "Progress is checkpointed next to the output, so rerunning an interrupted command resumes it.")
+    batch.add_argument("input", help="input file (.jsonl, .csv/.tsv, or one segment per line)")
+    batch.add_argument("-o", "--output", required=True, help="output file, same format as the input")
+    batch.add_argument("-s", "--src", default="auto", help="source language (default: auto)")
+    batch.add_argument("-d", "--dest", default="en", help="target language (default: en)")
+    batch.add_argument("--format", choices=FORMATS, help="input format (default: from the file extension)")
+    batch.add_argument("--field", default="text", help="JSON key or CSV column to translate (default: text)")
+    batch.add_argument("--output-field", default="translation", help="key or column for the result")
+    batch.add_argument("--batch-size", type=int, default=64, help="records per engine call")
+    batch.add_argument("--restart", action="store_true", help="ignore an existing checkpoint and start over")
+    batch.add_argument("--progress", action="store_true", help="show a running count on stderr")
+    add_backend_arguments(batch)
+    batch.set_defaults(func=run_batch)
+
+    serve = commands.add_parser(
+        "serve", help="run the local HTTP translation API",
+        description="JSON API: POST /translate, /batch and /detect; GET /languages and /health. "
+                    "Concurrent requests for the same language pair are translated together in micro-batches.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--max-batch", type=int, default=32, help="texts per engine batch")
+    serve.add_argument("--max-wait-ms", type=float, default=5.0, help="how long a text may wait for its batch to fill")
+    serve.add_argument("--max-queue", type=int, default=1024, help="queued texts before answering 503")
+    serve.add_argument("--timeout", type=float, default=30.0, help="seconds before a request answers 504")
+    serve.add_argument("--verbose", action="store_true", help="log every request")
+    serve.add_argument("--warm", type=language_pair, action="append", default=[], metavar="SRC:DEST",
+                       help="load the marian/nllb model for this pair before serving (repeatable)")
+    add_backend_arguments(serve)
+    serve.set_defaults(func=run_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Long-lived Google Translate clients sharing one pooled HTTP session."""
+
+import threading
+from collections import OrderedDict
+
+from .languages import get_registry
+
+GOOGLE_TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+
+
+def language_code(language):
+    """Map a language name such as 'spanish' to its code, leaving codes as-is"""
+    return get_registry().code(language)
+
+
+def make_session(pool_connections=4, pool_maxsize=8):
+    """Create a keep-alive session with a bounded connection pool"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class GoogleClient:
+    """Google Translate client bound to one language pair"""
+
+    def __init__(self, source, target, session, base_url=GOOGLE_TRANSLATE_URL, timeout=10):
+        self.source = language_code(source)
+        self.target = language_code(target)
+        self.session = session
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def translate_detailed(self, text):
+        """Translate text and return (translation, detected source code)"""
+        params = {"client": "gtx", "sl": self.source, "tl": self.target, "dt": "t", "q": text}
+        response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        translation = "".join(part[0] for part in data[0] or [] if part and part[0])
+        detected = data[2] if len(data) > 2 and data[2] else self.source
+        return translation, detected
+
+    def translate(self, text):
+        """Translate text"""
+        return self.translate_detailed(text)[0]
+
+
+class ClientPool:
+    """Keeps one client per (source, target) pair on top of a shared session.
+
+    At most ``max_clients`` pairs are kept; the least recently used client is
+    dropped when a new pair is requested beyond that. The HTTP session is
+    opened on first use.
+    """
+
+    def __init__(self, max_clients=32, pool_connections=4, pool_maxsize=8, base_url=GOOGLE_TRANSLATE_URL):
+        self.max_clients = max_clients
+        self.base_url = base_url
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._session = None
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = make_session(self.pool_connections, self.pool_maxsize)
+            return self._session
+
+    def get(self, source, target):
+        """Return the client for a language pair, creating it on first use"""
+        key = (language_code(source), language_code(target))
+        session = self.session
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = GoogleClient(key[0], key[1], session, self.base_url)
+                self._clients[key] = client
+                if len(self._clients) > self.max_clients:
+                    self._clients.popitem(last=False)
+            else:
+                self._clients.move_to_end(key)
+            return client
+
+    def supported_languages(self):
+        """Return the names of all supported languages"""
+        return get_registry().names()
+
+    def fetch_languages(self):
+        """Return {name: code} for every language the endpoint accepts"""
+        from deep_translator.constants import GOOGLE_LANGUAGES_TO_CODES
+        return dict(GOOGLE_LANGUAGES_TO_CODES)
+
+    def close(self):
+        """Drop all clients and close pooled connections"""
+        with self._lock:
+            self._clients.clear()
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -0,0 +1,146 @@
+"""Column-oriented, in-memory translation history."""
+
+import json
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+NO_TIMESTAMP = -2 ** 63  # Stored for empty or unparseable timestamps; read back as ""
+
+
+def to_micros(timestamp):
+    """Convert an ISO timestamp to integer microseconds since the epoch"""
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return NO_TIMESTAMP
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = moment - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def from_micros(micros):
+    return "" if micros == NO_TIMESTAMP else (EPOCH + micros * MICROSECOND).isoformat()
+
+
+class CompactHistory:
+    """History entries stored as parallel arrays.
+
+    Timestamps are int64 microseconds, (src_lang, dest_lang, backend)
+    triples are interned to a uint16 id, and the texts of all entries share
+    one UTF-8 byte arena addressed by offsets. An entry costs roughly its
+    UTF-8 text plus 34 bytes, instead of seven Python objects and a dict;
+    ``self[i]`` rebuilds the usual entry dict on demand.
+
+    Entries are kept in display order (most recent first in the app):
+    ``append``/``extend`` add older entries at the end and ``insert(0,
+    entry)`` adds a newer one at the front, so it can stand in for the list
+    behind a VirtualList.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.timestamps = array("q")
+        self.label_ids = array("H")
+        self.labels = []  # label id -> (src_lang, dest_lang, backend)
+        self._label_index = {}
+        self._arena = bytearray()
+        self._offsets = array("Q", [0])  # Entry i spans offsets[2i]..offsets[2i+2]
+        self._front = None  # Entries inserted at the front, oldest first
+
+    @classmethod
+    def from_store(cls, store):
+        """Load every entry of a HistoryStore, oldest first"""
+        history = cls()
+        append = history.append
+        for entry_id, timestamp, original, translation, src_lang, dest_lang, backend in store.iter_rows():
+            append(original, translation, src_lang, dest_lang, timestamp, entry_id, backend)
+        return history
+
+    @classmethod
+    def from_json(cls, path):
+        """Load a legacy translation_history.json, keeping its order (most recent first)"""
+        history = cls()
+        with open(path, "r", encoding="utf-8") as f:
+            # Each entry is stored as soon as it is parsed and then dropped,
+            # so the full list of dicts never exists.
+            json.load(f, object_hook=history._append_entry)
+        return history
+
+    def append(self, original, translation, src_lang, dest_lang, timestamp, entry_id=None, backend=None):
+        label = (src_lang, dest_lang, backend)
+        label_id = self._label_index.get(label)
+        if label_id is None:
+            label_id = self._label_index[label] = len(self.labels)
+            self.labels.append(label)
+        self.ids.append(len(self) + 1 if entry_id is None else entry_id)
+        self.timestamps.append(to_micros(timestamp) if isinstance(timestamp, str) else timestamp)
+        self.label_ids.append(label_id)
+        self._arena += original.encode("utf-8")
+        self._offsets.append(len(self._arena))
+        self._arena += translation.encode("utf-8")
+        self._offsets.append(len(self._arena))
+
+    def extend(self, entries):
+        """Append entry dicts (as returned by HistoryStore or found in the JSON file)"""
+        for entry in entries:
+            self._append_entry(entry)
+
+    def insert(self, index, entry):
+        """Add an entry dict in front of all others; only ``index`` 0 is supported"""
+        if index != 0:
+            raise ValueError("CompactHistory only inserts at the front")
+        if self._front is None:
+            self._front = CompactHistory()
+        self._front._append_entry(entry)
+
+    def _append_entry(self, entry):
+        self.append(entry["original"], entry["translation"], entry["src_lang"], entry["dest_lang"],
+                    entry["timestamp"], entry.get("id"), entry.get("backend"))
+
+    def __len__(self):
+        return len(self.ids) + (len(self._front) if self._front is not None else 0)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        if self._front is not None:
+            if index < len(self._front):
+                return self._front[len(self._front) - 1 - index]
+            index -= len(self._front)
+        start, middle, end = self._offsets[2 * index:2 * index + 3]
+        src_lang, dest_lang, backend = self.labels[self.label_ids[index]]
+        return {
+            "id": self.ids[index],
+            "timestamp": from_micros(self.timestamps[index]),
+            "original": self._arena[start:middle].decode("utf-8"),
+            "translation": self._arena[middle:end].decode("utf-8"),
+            "src_lang": src_lang,
+            "dest_lang": dest_lang,
+            "backend": backend,
+        }
+
+    def pair_counts(self):
+        """Return {(src_lang, dest_lang): number of entries}"""
+        counts = [0] * len(self.labels)
+        for label_id in self.label_ids:
+            counts[label_id] += 1
+        pairs = {}
+        for (src_lang, dest_lang, _), count in zip(self.labels, counts):
+            pairs[src_lang, dest_lang] = pairs.get((src_lang, dest_lang), 0) + count
+        if self._front is not None:
+            for pair, count in self._front.pair_counts().items():
+                pairs[pair] = pairs.get(pair, 0) + count
+        return pairs
+
+    def nbytes(self):
+        """Approximate memory held by the columns, arena and label table"""
+        columns = (self.ids, self.timestamps, self.label_ids, self._offsets)
+        size = sum(sys.getsizeof(column) for column in columns) + sys.getsizeof(self._arena)
+        size += sum(sum(sys.getsizeof(value) for value in label) for label in self.labels)
+        return size + (self._front.nbytes() if self._front is not None else 0)
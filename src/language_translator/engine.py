@@ -0,0 +1,213 @@
+"""Headless translation engine shared by the GUIs, scripts and services."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .cache import TranslationCache
+from .chunking import DEFAULT_CHUNK_SIZE, split_padding, split_text
+from .providers import GoogleProvider, provider_namespace
+
+
+class TranslationEngine:
+    """Translate text through a provider, with an optional cache in front.
+
+    Batches are translated with at most ``max_workers`` concurrent provider
+    calls and results are returned in input order. Documents longer than
+    ``chunk_size`` characters are split at sentence boundaries first. Cache
+    entries are kept per provider (``cache_namespace``), so swapping
+    ``provider`` never serves the previous one's translations.
+    """
+
+    def __init__(self, provider=None, cache=None, max_workers=4, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.provider = provider if provider is not None else GoogleProvider()
+        self.cache = cache
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        """Shared worker pool, created on first batch"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="translate")
+            return self._executor
+
+    @property
+    def cache_namespace(self):
+        return provider_namespace(self.provider)
+
+    def translate_detailed(self, text, src="auto", dest="en"):
+        """Translate text and return (translation, detected source)"""
+        if not text.strip():
+            return text, src
+        provider = self.provider
+        namespace = provider_namespace(provider)
+        if self.cache is not None:
+            cached = self.cache.get(text, src, dest, namespace)
+            if cached is not None:
+                return cached, src
+        translation, detected = provider.translate_detailed(text, src, dest)
+        if self.cache is not None:
+            self.cache.put(text, src, dest, translation, namespace)
+        return translation, detected
+
+    def translate(self, text, src="auto", dest="en"):
+        """Translate a single text"""
+        return self.translate_detailed(text, src, dest)[0]
+
+    def translate_batch(self, texts, src="auto", dest="en"):
+        """Translate many texts concurrently, keeping input order"""
+        texts = list(texts)
+        if getattr(self.provider, "batch_size", None):
+            return [translation for translation, _ in self._translate_batched(texts, src, dest)]
+        unique = list(dict.fromkeys(texts))
+        results = self.executor.map(lambda text: self.translate(text, src, dest), unique)
+        translated = dict(zip(unique, results))
+        return [translated[text] for text in texts]
+
+    def translate_segment(self, segment, src="auto", dest="en"):
+        """Translate a chunk, keeping its surrounding whitespace, and return (translation, detected)"""
+        lead, content, trail = split_padding(segment)
+        if not content:
+            return segment, src
+        translation, detected = self.translate_detailed(content, src, dest)
+        return lead + translation + trail, detected
+
+    def translate_segments(self, segments, src="auto", dest="en", progress=None, on_segment=None):
+        """Translate segments concurrently and return [(translation, detected), ...] in order
+
+        ``progress(done, total)`` is called from the calling thread as each
+        segment finishes, and ``on_segment(index, (translation, detected))``
+        with its result. Providers that translate in batches (local models)
+        get all uncached segments in one call per batch instead; those with
+        ``partial_results`` report segments from their own threads as they
+        arrive rather than once the batch is done.
+        """
+        if getattr(self.provider, "batch_size", None):
+            return self._translate_batched(segments, src, dest, progress, on_segment)
+        futures = {self.executor.submit(self.translate_segment, segment, src, dest): i
+                   for i, segment in enumerate(segments)}
+        results = [None] * len(futures)
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if on_segment:
+                    on_segment(futures[future], results[futures[future]])
+                if progress:
+                    progress(done, len(futures))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        return results
+
+    def _translate_batched(self, segments, src, dest, progress=None, on_segment=None):
+        """Translate segments through ``provider.translate_many``, ``batch_size`` at a time"""
+        provider = self.provider
+        namespace = provider_namespace(provider)
+        parts = [split_padding(segment) for segment in segments]
+        results = [None] * len(segments)
+        pending = {}  # Uncached content -> indices of the segments holding it
+        for i, (lead, content, trail) in enumerate(parts):
+            cached = self.cache.get(content, src, dest, namespace) if content and self.cache is not None else None
+            if not content:
+                results[i] = segments[i], src
+            elif cached is not None:
+                results[i] = lead + cached + trail, src
+            else:
+                pending.setdefault(content, []).append(i)
+            if results[i] is not None and on_segment:
+                on_segment(i, results[i])
+        done = len(segments) - sum(len(indices) for indices in pending.values())
+        contents = list(pending)
+        partial = on_segment is not None and getattr(provider, "partial_results", False)
+        lock = threading.Lock()
+
+        def report(content, translation, detected):
+            nonlocal done
+            with lock:
+                for i in pending[content]:
+                    lead, _, trail = parts[i]
+                    on_segment(i, (lead + translation + trail, detected))
+                done += len(pending[content])
+                if progress:
+                    progress(done, len(segments))
+
+        for start in range(0, len(contents), provider.batch_size):
+            batch = contents[start:start + provider.batch_size]
+            if partial:
+                on_result = lambda k, result, batch=batch: report(batch[k], *result)
+                translations = provider.translate_many(batch, src, dest, on_result=on_result)
+            else:
+                translations = provider.translate_many(batch, src, dest)
+            for content, (translation, detected) in zip(batch, translations):
+                if self.cache is not None:
+                    self.cache.put(content, src, dest, translation, namespace)
+                for i in pending[content]:
+                    lead, _, trail = parts[i]
+                    results[i] = lead + translation + trail, detected
+                    if on_segment and not partial:
+                        on_segment(i, results[i])
+                if not partial:
+                    done += len(pending[content])
+            if progress and not partial:
+                progress(done, len(segments))
+        return results
+
+    def translate_document(self, text, src="auto", dest="en", progress=None, on_segment=None):
+        """Translate text of any length and return (translation, detected source)
+
+        Text longer than ``chunk_size`` is split at sentence boundaries and the
+        chunks are translated concurrently; ``on_segment(index, result)``
+        receives each chunk's translation as it finishes.
+        """
+        chunks = split_text(text, self.chunk_size)
+        if len(chunks) <= 1:
+            result = self.translate_detailed(text, src, dest)
+            if on_segment:
+                on_segment(0, result)
+            return result
+        results = self.translate_segments(chunks, src, dest, progress, on_segment)
+        return "".join(r[0] for r in results), results[0][1]
+
+    def supported_languages(self):
+        return self.provider.supported_languages()
+
+    def fetch_languages(self):
+        """Ask the provider for its current {name: code} table"""
+        return self.provider.fetch_languages()
+
+    def close(self):
+        """Stop workers and release provider and cache resources"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self.provider.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+_default_engine = None
+_default_lock = threading.Lock()
+
+
+def get_engine():
+    """Return the process-wide default engine"""
+    global _default_engine
+    with _default_lock:
+        if _default_engine is None:
+            _default_engine = TranslationEngine(cache=TranslationCache())
+        return _default_engine
+
+
+def translate(text, src="auto", dest="en"):
+    """Translate text with the default engine"""
+    return get_engine().translate(text, src, dest)
+
+
+def translate_batch(texts, src="auto", dest="en"):
+    """Translate a list of texts with the default engine"""
+    return get_engine().translate_batch(texts, src, dest)
@@ -0,0 +1,267 @@
+"""Failover between translation providers, with hedged requests and latency histograms."""
+
+import bisect
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .providers import provider_namespace
+
+HEDGE_MIN_SAMPLES = 20  # Latencies needed before an adaptive hedge delay is trusted
+HEDGE_DEFAULT_DELAY = 1.0  # Seconds, until then
+LATENCY_BOUNDS = [0.0005 * 1.25 ** i for i in range(56)]  # 0.5 ms to ~2 minutes, each bucket 25% wider
+
+
+class LatencyHistogram:
+    """Latency counts in the logarithmic buckets of LATENCY_BOUNDS"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BOUNDS) + 1)  # The last bucket holds anything slower
+        self.total = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.counts[bisect.bisect_left(LATENCY_BOUNDS, seconds)] += 1
+            self.total += 1
+            self.sum += seconds
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the ``fraction`` quantile, or None with no samples"""
+        with self._lock:
+            if not self.total:
+                return None
+            rank = fraction * self.total
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank:
+                    return LATENCY_BOUNDS[index] if index < len(LATENCY_BOUNDS) else float("inf")
+
+    def snapshot(self):
+        """{"count", "mean", "p50", "p95", "p99"} with latencies in milliseconds"""
+        summary = {"count": self.total, "mean": round(self.sum / self.total * 1000, 2) if self.total else None}
+        for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            value = self.percentile(fraction)
+            summary[name] = round(value * 1000, 2) if value is not None else None
+        return summary
+
+
+def call_many(provider, texts, src, dest, on_result=None):
+    """Translate texts with any provider, calling ``on_result(index, result)`` for each
+
+    Batched providers get the whole list (passing ``on_result`` along when
+    they report partial results); others translate one text at a time.
+    """
+    if not getattr(provider, "batch_size", None):
+        results = []
+        for index, text in enumerate(texts):
+            results.append(provider.translate_detailed(text, src, dest))
+            if on_result:
+                on_result(index, results[-1])
+        return results
+    if getattr(provider, "partial_results", False):
+        return provider.translate_many(texts, src, dest, on_result=on_result)
+    results = provider.translate_many(texts, src, dest)
+    if on_result:
+        for index, result in enumerate(results):
+            on_result(index, result)
+    return results
+
+
+class ProviderHealth:
+    """Success/failure record of one provider
+
+    After ``max_failures`` failures in a row the provider is set aside for
+    ``cooldown`` seconds (doubling each time it fails again straight after,
+    up to ``max_cooldown``); the next call after that is a trial, and one
+    success makes it healthy again.
+    """
+
+    def __init__(self, max_failures=3, cooldown=10.0, max_cooldown=300.0):
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.successes = 0
+        self.errors = 0
+        self.last_error = None
+        self.ejected_until = 0.0
+        self._current_cooldown = cooldown
+        self._lock = threading.Lock()
+
+    def available(self):
+        return time.monotonic() >= self.ejected_until
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self.failures = 0
+            self._current_cooldown = self.cooldown
+
+    def record_failure(self, error):
+        with self._lock:
+            self.errors += 1
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if self.failures >= self.max_failures:
+                self.ejected_until = time.monotonic() + self._current_cooldown
+                self._current_cooldown = min(self._current_cooldown * 2, self.max_cooldown)
+                self.failures = self.max_failures - 1  # One more failure on the trial call ejects again
+
+
+class FailoverProvider:
+    """Try providers in order, skipping unhealthy ones, and optionally hedge slow requests.
+
+    ``providers`` are tried first to last; a provider that raises is
+    recorded as a failure and the next one is asked instead. With
+    ``hedge_after`` set, a request still unanswered after that many seconds
+    is also sent to the next provider and whichever answers first wins;
+    ``hedge_after="auto"`` uses the p95 latency of the provider being
+    waited on. Latencies of every call, including hedges that lost, go into
+    one LatencyHistogram per provider. ``close`` also closes the providers
+    unless ``owns_providers`` is false.
+
+    When the first provider translates in batches, so does the chain:
+    ``translate_many`` fails over and hedges whole batches, and each
+    segment is reported once through ``on_result``, from whichever
+    provider delivered it first.
+    """
+
+    name = "failover"
+    partial_results = True
+
+    def __init__(self, providers, hedge_after=None, max_failures=3, cooldown=10.0, max_workers=16,
+                 owns_providers=True):
+        if not providers:
+            raise ValueError("FailoverProvider needs at least one provider")
+        self.providers = list(providers)
+        self.hedge_after = hedge_after
+        self.owns_providers = owns_providers
+        self.health = {id(p): ProviderHealth(max_failures, cooldown) for p in self.providers}
+        self.latency = {id(p): LatencyHistogram() for p in self.providers}
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="failover")
+
+    @property
+    def cache_namespace(self):
+        """Any of the providers may answer, so their results share a namespace of their own"""
+        return "+".join(provider_namespace(p) for p in self.providers)
+
+    @property
+    def batch_size(self):
+        return getattr(self.providers[0], "batch_size", None)
+
+    def ordered(self):
+        """Providers to try: healthy ones in priority order, then those set aside (as a last resort)"""
+        available = [p for p in self.providers if self.health[id(p)].available()]
+        return available + [p for p in self.providers if p not in available]
+
+    def hedge_delay(self, provider):
+        if self.hedge_after != "auto":
+            return self.hedge_after
+        histogram = self.latency[id(provider)]
+        return histogram.percentile(0.95) if histogram.total >= HEDGE_MIN_SAMPLES else HEDGE_DEFAULT_DELAY
+
+    def _call(self, provider, method, *args):
+        """Run one provider call, recording its latency and outcome
+
+        ``method`` is a method name, or a function called as ``method(provider, *args)``.
+        """
+        start = time.perf_counter()
+        try:
+            result = method(provider, *args) if callable(method) else getattr(provider, method)(*args)
+        except Exception as e:
+            self.health[id(provider)].record_failure(e)
+            raise
+        finally:
+            self.latency[id(provider)].record(time.perf_counter() - start)
+        self.health[id(provider)].record_success()
+        return result
+
+    def call(self, method, *args):
+        """Call ``method`` on the providers in order until one succeeds, hedging if enabled"""
+        candidates = self.ordered()
+        if not self.hedge_after:
+            for provider in candidates:
+                try:
+                    return self._call(provider, method, *args)
+                except Exception as e:
+                    error = e
+            raise error
+        errors = []
+        running = {}  # future -> provider
+        hedged = set()
+        while candidates or running:
+            if not running:
+                provider = candidates.pop(0)
+                running[self._executor.submit(self._call, provider, method, *args)] = provider
+            delay = self.hedge_delay(next(iter(running.values()))) if candidates else None
+            done, _ = wait(running, timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                # Still waiting after the hedge delay: race the next provider
+                provider = candidates.pop(0)
+                future = self._executor.submit(self._call, provider, method, *args)
+                running[future] = provider
+                hedged.add(future)
+                with self._lock:
+                    self.hedges += 1
+                continue
+            for future in done:
+                del running[future]
+                if future.exception() is None:
+                    if future in hedged:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()  # Calls still running finish in the background
+                errors.append(future.exception())
+        raise errors[-1]
+
+    def translate_detailed(self, text, src, dest):
+        """Translate text and return (translation, detected source)"""
+        return self.call("translate_detailed", text, src, dest)
+
+    def translate_many(self, texts, src, dest, on_result=None):
+        """Translate texts as one batch per provider tried; returns [(translation, detected), ...]"""
+        texts = list(texts)
+        reported = set()
+        lock = threading.Lock()
+
+        def report(index, result):
+            with lock:
+                if index in reported:
+                    return  # Already delivered by a provider that failed later, or by a hedge
+                reported.add(index)
+            if on_result:
+                on_result(index, result)
+
+        results = self.call(lambda provider, *args: call_many(provider, *args, on_result=report), texts, src, dest)
+        for index, result in enumerate(results):
+            report(index, result)
+        return results
+
+    def supported_languages(self):
+        return self.providers[0].supported_languages()
+
+    def fetch_languages(self):
+        return self.call("fetch_languages")
+
+    def stats(self):
+        """Per-provider health and latency, plus hedge counts"""
+        providers = []
+        for provider in self.providers:
+            health = self.health[id(provider)]
+            providers.append({"name": getattr(provider, "name", type(provider).__name__),
+                              "available": health.available(), "successes": health.successes,
+                              "errors": health.errors, "last_error": health.last_error,
+                              "latency_ms": self.latency[id(provider)].snapshot()})
+        return {"providers": providers, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        if self.owns_providers:
+            for provider in self.providers:
+                provider.close()
@@ -0,0 +1,279 @@
+"""Append-only translation history stored in SQLite."""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+DEFAULT_HISTORY_PATH = "translation_history.db"
+LEGACY_HISTORY_PATH = "translation_history.json"
+FIELDS = ("timestamp", "original", "translation", "src_lang", "dest_lang")
+LEGACY_DEFAULTS = {"timestamp": "", "original": "", "translation": "", "src_lang": "auto", "dest_lang": ""}
+SCHEMA_VERSION = 3
+RANK_WINDOW = 300  # Newest matches that are ranked by relevance
+MIN_INDEXED_TERM = 3  # Shorter terms are matched as substrings; the index would miss most of their hits
+
+
+def tokenize(text):
+    return re.findall(r"\w+", text.casefold())
+
+
+def fts_query(term):
+    """Build an FTS5 query matching every token, the last one as a prefix"""
+    tokens = tokenize(term)
+    if not tokens:
+        return None
+    if len(tokens[-1]) < 2:
+        # Single-letter prefixes are not indexed and would scan every term
+        return " ".join(f'"{token}"' for token in tokens)
+    return " ".join(f'"{token}"' for token in tokens) + "*"
+
+
+def relevance(term):
+    """Return a sort key for ``term``: phrase and whole-word hits first, source text before translation"""
+    tokens = tokenize(term)
+    phrase = " ".join(tokens)
+    word = re.compile(rf"\b{re.escape(tokens[-1])}\b")
+
+    def key(entry):
+        score = 0.0
+        for weight, field in ((2.0, "original"), (1.0, "translation")):
+            text = entry[field].casefold()
+            if phrase in text:
+                score += weight
+            if word.search(text):
+                score += weight
+        return -score * 500 / (500 + len(entry["original"]))  # Prefer short, focused entries
+
+    return key
+
+
+class HistoryStore:
+    """Translation history with O(1) appends and paged reads.
+
+    The database runs in WAL mode, so each append is a single small
+    transaction and a crash never leaves a half-written file behind. On
+    first use an existing ``translation_history.json`` is imported; the
+    JSON file itself is left untouched.
+
+    Text is indexed with SQLite FTS5 when available (falling back to a
+    substring scan otherwise), so searches stay fast on large histories.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH, legacy_path=LEGACY_HISTORY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " timestamp TEXT NOT NULL,"
+            " original TEXT NOT NULL,"
+            " translation TEXT NOT NULL,"
+            " src_lang TEXT NOT NULL,"
+            " dest_lang TEXT NOT NULL,"
+            " backend TEXT)"  # Cache namespace of the provider that translated it; NULL if unknown
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(history)")]
+        if "backend" not in columns:
+            self._conn.execute("ALTER TABLE history ADD COLUMN backend TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_pair ON history(src_lang, dest_lang)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS history_pairs ("
+            " src_lang TEXT NOT NULL, dest_lang TEXT NOT NULL, PRIMARY KEY (src_lang, dest_lang))"
+        )
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS history_pair_ai AFTER INSERT ON history BEGIN"
+            " INSERT OR IGNORE INTO history_pairs VALUES (new.src_lang, new.dest_lang); END"
+        )
+        self.fts = self._create_index()
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            self._migrate(legacy_path)
+        elif version < 2:
+            self._conn.execute("INSERT OR IGNORE INTO history_pairs SELECT DISTINCT src_lang, dest_lang FROM history")
+            if self.fts:
+                self._conn.execute("INSERT INTO history_fts(history_fts) VALUES ('rebuild')")
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _create_index(self):
+        """Create the full-text index and the triggers keeping it in sync"""
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5("
+                " original, translation, content='history', content_rowid='id',"
+                " tokenize='unicode61 remove_diacritics 2', prefix='2 3 4 5 6')"
+            )
+        except sqlite3.OperationalError:
+            return False  # SQLite built without FTS5
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN"
+            " INSERT INTO history_fts(rowid, original, translation)"
+            " VALUES (new.id, new.original, new.translation); END"
+        )
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN"
+            " INSERT INTO history_fts(history_fts, rowid, original, translation)"
+            " VALUES ('delete', old.id, old.original, old.translation); END"
+        )
+        return True
+
+    def _migrate(self, legacy_path):
+        """Import the legacy JSON history (most recent first) once"""
+        entries = []
+        if legacy_path and os.path.exists(legacy_path):
+            try:
+                with open(legacy_path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Failed to migrate history: {e}")
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO history (timestamp, original, translation, src_lang, dest_lang)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [tuple(entry.get(field) or LEGACY_DEFAULTS[field] for field in FIELDS)
+                 for entry in reversed(entries) if isinstance(entry, dict)],  # Older files lack some fields
+            )
+            self._conn.execute("COMMIT")
+
+    def append(self, original, translation, src_lang, dest_lang, timestamp=None, backend=None):
+        """Record a translation and return its entry; ``backend`` names the provider that made it"""
+        entry = {
+            "timestamp": timestamp or datetime.now().isoformat(),
+            "original": original,
+            "translation": translation,
+            "src_lang": src_lang,
+            "dest_lang": dest_lang,
+            "backend": backend,
+        }
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO history (timestamp, original, translation, src_lang, dest_lang, backend)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                tuple(entry[field] for field in FIELDS + ("backend",)),
+            )
+        entry["id"] = cursor.lastrowid
+        return entry
+
+    def page(self, before_id=None, limit=100):
+        """Return up to ``limit`` entries older than ``before_id``, most recent first"""
+        with self._lock:
+            if before_id is None:
+                rows = self._conn.execute("SELECT * FROM history ORDER BY id DESC LIMIT ?", (limit,))
+            else:
+                rows = self._conn.execute(
+                    "SELECT * FROM history WHERE id < ? ORDER BY id DESC LIMIT ?", (before_id, limit)
+                )
+            return [dict(row) for row in rows]
+
+    def search(self, term="", src_lang=None, dest_lang=None, since=None, until=None, offset=0, limit=100):
+        """Return matching entries, best matches first.
+
+        Words in ``term`` must all appear, the last one as a prefix; terms
+        under MIN_INDEXED_TERM characters match anywhere in the text. The
+        newest RANK_WINDOW matches are ordered by relevance; without a term,
+        or past that window, the most recent come first. ``since``/``until``
+        are ISO timestamps (or datetimes) bounding the entry time.
+        """
+        clauses, args = [], []
+        for column, value in (("src_lang", src_lang), ("dest_lang", dest_lang)):
+            if value:
+                clauses.append(f"h.{column} = ?")
+                args.append(value)
+        for op, value in ((">=", since), ("<", until)):
+            if value:
+                clauses.append(f"h.timestamp {op} ?")
+                args.append(value.isoformat() if isinstance(value, datetime) else value)
+
+        query = fts_query(term) if self.fts and len(term.strip()) >= MIN_INDEXED_TERM else None
+        if query:
+            # bm25 needs statistics over every match, which costs tens of
+            # milliseconds for common words; scoring the newest matches in
+            # Python keeps each keystroke cheap.
+            where = " AND ".join(["history_fts MATCH ?"] + clauses)
+            sql = (f"SELECT h.* FROM history_fts f JOIN history h ON h.id = f.rowid"
+                   f" WHERE {where} ORDER BY f.rowid DESC LIMIT ? OFFSET ?")
+            rows = []
+            with self._lock:
+                if offset < RANK_WINDOW:
+                    rows = [dict(row) for row in self._conn.execute(sql, [query] + args + [RANK_WINDOW, 0])]
+                    rows.sort(key=relevance(term))  # Stable, so ties stay newest first
+                    full = len(rows) == RANK_WINDOW
+                    rows = rows[offset:offset + limit]
+                    if len(rows) == limit or not full:
+                        return rows
+                skip = max(RANK_WINDOW, offset)
+                extra = self._conn.execute(sql, [query] + args + [limit - len(rows), skip])
+                return rows + [dict(row) for row in extra]
+
+        if term.strip():
+            clauses.append("(instr(lower(h.original), ?) OR instr(lower(h.translation), ?))")
+            args += [term.lower(), term.lower()]
+        where = " AND ".join(clauses) or "1"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT h.* FROM history h WHERE {where} ORDER BY h.id DESC LIMIT ? OFFSET ?",
+                args + [limit, offset],
+            )
+            return [dict(row) for row in rows]
+
+    def iter_rows(self, batch=10000):
+        """Yield every entry as an (id, *FIELDS, backend) tuple, oldest first, ``batch`` rows at a time"""
+        sql = f"SELECT id, {', '.join(FIELDS)}, backend FROM history WHERE id > ? ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            with self._lock:
+                cursor = self._conn.cursor()
+                cursor.row_factory = None  # Plain tuples: much cheaper than Rows for bulk reads
+                rows = cursor.execute(sql, (last_id, batch)).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield from rows
+
+    def pairs(self):
+        """Return the distinct (src_lang, dest_lang) pairs in history"""
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(
+                "SELECT src_lang, dest_lang FROM history_pairs ORDER BY src_lang, dest_lang")]
+
+    def frequent_pairs(self, limit=5, window=1000):
+        """Return the (src_lang, dest_lang) pairs used most in the last ``window`` entries"""
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(
+                "SELECT src_lang, dest_lang FROM (SELECT src_lang, dest_lang FROM history ORDER BY id DESC LIMIT ?)"
+                " GROUP BY src_lang, dest_lang ORDER BY COUNT(*) DESC LIMIT ?", (window, limit))]
+
+    def get(self, entry_id):
+        """Return one entry by id, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM history WHERE id = ?", (entry_id,)).fetchone()
+        return dict(row) if row else None
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def clear(self):
+        """Delete every entry"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            if self.fts:
+                # Empty the index in one step rather than row by row via the trigger
+                self._conn.execute("DROP TRIGGER IF EXISTS history_ad")
+                self._conn.execute("INSERT INTO history_fts(history_fts) VALUES ('delete-all')")
+            self._conn.execute("DELETE FROM history")
+            self._conn.execute("DELETE FROM history_pairs")
+            self._conn.execute("COMMIT")
+            if self.fts:
+                self._create_index()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,114 @@
+"""Incremental re-translation that only resends sentences that changed."""
+
+import hashlib
+import threading
+
+from .chunking import split_padding, split_sentences
+
+
+def segment_hash(segment):
+    """Stable hash identifying a sentence's content"""
+    return hashlib.sha1(segment.encode("utf-8")).hexdigest()
+
+
+class InOrderText:
+    """Collects pieces finishing in any order and passes on the text that is complete from the start
+
+    ``add(index, piece)`` may be called from several threads; ``on_text``
+    receives each newly completed run of pieces, so its calls concatenate
+    to the full text in order.
+    """
+
+    def __init__(self, on_text):
+        self.on_text = on_text
+        self.next = 0
+        self._pieces = {}
+        self._lock = threading.Lock()
+
+    def add(self, index, piece):
+        with self._lock:
+            self._pieces[index] = piece
+            ready = []
+            while self.next in self._pieces:
+                ready.append(self._pieces.pop(self.next))
+                self.next += 1
+            if ready:
+                self.on_text("".join(ready))  # Under the lock, so runs arrive in order
+
+
+class IncrementalTranslator:
+    """Translate text sentence by sentence, reusing the previous run's results.
+
+    Sentences whose hash matches one translated in the previous run for the
+    same language pair are stitched back without contacting the provider.
+    Text longer than ``max_chars`` goes through the engine's chunked document
+    path instead, since per-sentence requests would dominate there. With
+    ``on_text`` the translation is also handed over in order while it is
+    produced: each call continues the text of the previous ones.
+    """
+
+    def __init__(self, engine, max_chars=50000):
+        self.engine = engine
+        self.max_chars = max_chars
+        self.last_stats = {"segments": 0, "reused": 0, "sent": 0}
+        self._pair = None
+        self._segments = {}
+        self._detected = None
+        self._lock = threading.Lock()
+
+    def translate(self, text, src="auto", dest="en", progress=None, on_text=None):
+        """Translate text and return (translation, detected source)"""
+        with self._lock:
+            if len(text) > self.max_chars:
+                self.reset()
+                on_segment = None
+                if on_text:
+                    stream = InOrderText(on_text)
+                    on_segment = lambda index, result: stream.add(index, result[0])
+                return self.engine.translate_document(text, src, dest, progress, on_segment)
+
+            previous = self._segments if self._pair == (src, dest) else {}
+            parts = [split_padding(sentence) for sentence in split_sentences(text)]
+            hashes = [segment_hash(content) for _, content, _ in parts]
+            changed = {h: content for (_, content, _), h in zip(parts, hashes)
+                       if content and h not in previous}
+
+            on_segment = None
+            if on_text:
+                stream = InOrderText(on_text)
+                positions = {}  # Changed sentence -> where it occurs in the text
+                for position, ((lead, content, trail), h) in enumerate(zip(parts, hashes)):
+                    if h in changed:
+                        positions.setdefault(h, []).append(position)
+                    else:
+                        stream.add(position, lead + previous.get(h, "") + trail)
+                keys = list(changed)
+
+                def on_segment(index, result):
+                    for position in positions[keys[index]]:
+                        lead, _, trail = parts[position]
+                        stream.add(position, lead + result[0] + trail)
+
+            results = self.engine.translate_segments(list(changed.values()), src, dest, progress, on_segment)
+            translated = {h: previous[h] for h in hashes if h in previous}
+            translated.update(zip(changed, (r[0] for r in results)))
+            if results:
+                self._detected = results[0][1]
+
+            output = "".join(lead + translated.get(h, "") + trail
+                             for (lead, _, trail), h in zip(parts, hashes))
+            self._pair = (src, dest)
+            self._segments = translated
+            self.last_stats = {
+                "segments": sum(1 for _, content, _ in parts if content),
+                "reused": sum(1 for (_, content, _), h in zip(parts, hashes) if content and h in previous),
+                "sent": len(changed),
+            }
+            return output, self._detected or src
+
+    def reset(self):
+        """Forget the previous run"""
+        self._pair = None
+        self._segments = {}
+        self._detected = None
+        self.last_stats = {"segments": 0, "reused": 0, "sent": 0}
@@ -0,0 +1,109 @@
+"""Supported-language registry with name/code canonicalization."""
+
+import json
+import os
+import threading
+import time
+
+from .scheduler import BULK
+
+BUNDLED_LANGUAGES_PATH = os.path.join(os.path.dirname(__file__), "data", "languages.json")
+DEFAULT_LANGUAGES_CACHE = "languages_cache.json"
+
+
+class LanguageRegistry:
+    """Maps language names to codes and back with O(1) lookups.
+
+    The bundled table is available immediately and offline. A refreshed copy
+    fetched from a provider is cached on disk and considered fresh for
+    ``ttl`` seconds.
+    """
+
+    def __init__(self, cache_path=DEFAULT_LANGUAGES_CACHE, ttl=7 * 24 * 3600):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.fetched_at = 0
+        with open(BUNDLED_LANGUAGES_PATH, encoding="utf-8") as f:
+            bundled = json.load(f)
+        self.version = bundled["version"]
+        self._set(bundled["languages"])
+        self._load_cache()
+
+    def _set(self, languages):
+        codes = {name.lower(): code for name, code in languages.items()}
+        self._codes = codes
+        self._names = {code.lower(): name for name, code in codes.items()}
+        self._canonical = {code.lower(): code for code in codes.values()}
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            self._set(cached["languages"])
+            self.version = cached.get("version", self.version)
+            self.fetched_at = cached.get("fetched_at", 0)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def names(self):
+        """Return all language names, sorted"""
+        return sorted(self._codes)
+
+    def code(self, language):
+        """Canonical code for a name or code ('english', 'EN' -> 'en'); unknown values pass through"""
+        key = language.strip().lower()
+        if key == "auto":
+            return "auto"
+        return self._codes.get(key) or self._canonical.get(key) or language.strip()
+
+    def name(self, language):
+        """Language name for a name or code ('en' -> 'english')"""
+        key = language.strip().lower()
+        if key in self._codes or key == "auto":
+            return key
+        return self._names.get(key, language.strip())
+
+    def is_stale(self):
+        return time.time() - self.fetched_at > self.ttl
+
+    def update(self, languages, version=None):
+        """Replace the table with {name: code} from a provider and persist it"""
+        self._set(languages)
+        self.fetched_at = time.time()
+        if version:
+            self.version = version
+        try:
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.version, "fetched_at": self.fetched_at,
+                           "languages": languages}, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"Failed to save language cache: {e}")
+
+    def refresh_async(self, fetch, scheduler, on_update=None):
+        """Refresh from ``fetch() -> {name: code}`` as a background job on ``scheduler`` if the table is stale
+
+        ``on_update(names)`` is delivered through the scheduler's dispatcher.
+        Returns the job's CancelToken, or None when the table is fresh.
+        """
+        if not self.is_stale():
+            return None
+
+        def refresh():
+            self.update(fetch())
+            return self.names()
+
+        return scheduler.submit(refresh, priority=BULK, on_done=on_update,
+                                on_error=lambda e: print(f"Language refresh failed: {e}"))
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the process-wide registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LanguageRegistry()
+        return _registry
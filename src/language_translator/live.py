@@ -0,0 +1,49 @@
+"""Helpers for translate-as-you-type: debouncing and stale-result detection."""
+
+import threading
+
+
+class Debouncer:
+    """Call ``callback`` once no trigger has arrived for ``delay_ms``.
+
+    ``widget`` is any Tk widget; its ``after`` timer is used so the callback
+    runs on the UI thread.
+    """
+
+    def __init__(self, widget, delay_ms, callback):
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self.callback = callback
+        self._after_id = None
+
+    def trigger(self):
+        """Restart the quiet-period timer"""
+        self.cancel()
+        self._after_id = self.widget.after(self.delay_ms, self._fire)
+
+    def cancel(self):
+        """Drop a pending call"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _fire(self):
+        self._after_id = None
+        self.callback()
+
+
+class LatestRequest:
+    """Issue increasing request ids; only the newest one is current"""
+
+    def __init__(self):
+        self._current = 0
+        self._lock = threading.Lock()
+
+    def next(self):
+        """Start a new request, making every earlier one stale"""
+        with self._lock:
+            self._current += 1
+            return self._current
+
+    def is_current(self, request_id):
+        return request_id == self._current
@@ -0,0 +1,304 @@
+"""Offline translation with local MarianMT or NLLB models (transformers + torch)."""
+
+import hashlib
+import json
+import os
+import threading
+import warnings
+
+from .chunking import split_padding, split_text
+from .languages import get_registry
+from .model_manager import DEFAULT_MODEL_BUDGET, ModelManager
+
+MARIAN_MODEL = "Helsinki-NLP/opus-mt-{src}-{dest}"
+MARIAN_AUTO_SOURCE = "mul"  # Multilingual-source models; OPUS-MT only publishes them into English
+MARIAN_PIVOT = "en"  # Unknown sources go opus-mt-mul-en, then opus-mt-en-{dest}
+# Google-style codes whose OPUS-MT names differ
+MARIAN_CODES = {"iw": "he", "jw": "jv", "zh-cn": "zh", "zh-tw": "zh", "ak": "tw"}
+NLLB_CODES_PATH = os.path.join(os.path.dirname(__file__), "data", "nllb_codes.json")
+MAX_SEGMENT_CHARS = 400  # Keeps each sentence group well under the models' 512-token limit
+QUALITY_MODES = ("accurate", "fast")  # fp32 weights, or int8 dynamically quantized Linear layers
+DEFAULT_QUANTIZED_DIR = os.path.join(os.path.expanduser("~"), ".cache", "translingo", "quantized")
+QUANTIZED_DTYPE = "qint8"
+QUANTIZED_LAYERS = ("Linear",)  # torch.nn module types replaced by dynamically quantized ones
+
+
+def load_nllb_codes():
+    with open(NLLB_CODES_PATH, encoding="utf-8") as f:
+        table = json.load(f)
+    return table["model"], {code.lower(): flores for code, flores in table["codes"].items()}
+
+
+def cpu_threads():
+    """CPUs this process may actually run on (respects affinity, unlike os.cpu_count)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def quantize(model):
+    """Replace a model's QUANTIZED_LAYERS with int8 dynamically quantized ones"""
+    import torch
+    from torch.ao.quantization import quantize_dynamic
+
+    layers = {getattr(torch.nn, name) for name in QUANTIZED_LAYERS}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # torch.ao deprecation notices
+        return quantize_dynamic(model, layers, dtype=getattr(torch, QUANTIZED_DTYPE))
+
+
+class LocalProvider:
+    """Translate on this machine with a seq2seq model; no network needed once models are cached.
+
+    ``family`` is "marian" (one OPUS-MT model per language pair) or "nllb"
+    (a single NLLB-200 model for every pair); ``model`` overrides the model
+    name or points at a local directory. Models are loaded on first use
+    from the Hugging Face cache only, and downloaded when missing if
+    ``allow_download`` is set. Loaded models share ``memory_budget`` bytes;
+    the least recently used pair is dropped when a new one does not fit.
+    With Marian, an "auto" source is translated by opus-mt-mul-en and, for
+    other targets, taken on from English by the English model.
+
+    ``quality="fast"`` runs int8 dynamically quantized weights: the first
+    load quantizes the fp32 model and saves the result under
+    ``quantized_dir``, later loads read that file directly. A cached file
+    that no longer loads is rebuilt, and if the model cannot be quantized
+    at all it runs in full precision instead. Fast mode uses
+    every CPU available to the process unless ``num_threads`` says otherwise.
+
+    Texts are split into sentence groups, sorted by length and run through
+    the model ``batch_size`` at a time, so padding stays small and the CPU
+    works on whole batches rather than one sentence per forward pass.
+    """
+
+    name = "local"
+
+    def __init__(self, family="marian", model=None, batch_size=16, num_beams=2, num_threads=None,
+                 allow_download=True, cache_dir=None, memory_budget=DEFAULT_MODEL_BUDGET, quality="accurate",
+                 quantized_dir=DEFAULT_QUANTIZED_DIR):
+        if family not in ("marian", "nllb"):
+            raise ValueError(f"Unknown local model family: {family}")
+        if quality not in QUALITY_MODES:
+            raise ValueError(f"Unknown quality mode: {quality}")
+        self.family = family
+        self.model = model
+        self._model_option = model  # self.model gets filled in with NLLB's default on first load
+        self.batch_size = batch_size
+        self.num_beams = num_beams
+        self.num_threads = num_threads
+        self.allow_download = allow_download
+        self.cache_dir = cache_dir
+        self.quality = quality
+        self.quantized_dir = quantized_dir
+        self.languages = get_registry()
+        self.models = ModelManager(self._load_model, memory_budget)
+        self._nllb_codes = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache_namespace(self):
+        return f"{self.family}:{self._model_option or 'default'}:{self.quality}"
+
+    def configure(self, quality=None, memory_budget=None):
+        """Change the quality mode and/or the model memory budget"""
+        if quality is not None:
+            if quality not in QUALITY_MODES:
+                raise ValueError(f"Unknown quality mode: {quality}")
+            self.quality = quality
+        if memory_budget is not None:
+            self.models.set_budget(memory_budget)
+
+    def model_for(self, src, dest):
+        """Return (model name, source code, target code) for a language pair"""
+        src_code = self.languages.code(src).lower()
+        dest_code = self.languages.code(dest).lower()
+        if self.family == "nllb":
+            self._load_nllb_codes()
+            if src_code == "auto":
+                raise ValueError("NLLB needs a source language; choose one instead of 'auto'")
+            for code in (src_code, dest_code):
+                if code not in self._nllb_codes:
+                    raise ValueError(f"NLLB does not support '{self.languages.name(code)}'")
+            return self.model, self._nllb_codes[src_code], self._nllb_codes[dest_code]
+        src_code = MARIAN_AUTO_SOURCE if src_code == "auto" else MARIAN_CODES.get(src_code, src_code)
+        dest_code = MARIAN_CODES.get(dest_code, dest_code)
+        return self.model or MARIAN_MODEL.format(src=src_code, dest=dest_code), src_code, dest_code
+
+    def route(self, src, dest):
+        """Return the [(model name, source code, target code), ...] steps translating ``src`` into ``dest``
+
+        One step, except for Marian with an "auto" source into anything but
+        English: the multilingual-source model only translates into English,
+        so the text is taken on from there by the English model.
+        """
+        steps = [self.model_for(src, dest)]
+        if self.family == "marian" and not self.model and steps[0][1] == MARIAN_AUTO_SOURCE \
+                and steps[0][2] != MARIAN_PIVOT:
+            steps = [self.model_for(src, MARIAN_PIVOT), self.model_for(MARIAN_PIVOT, dest)]
+        return steps
+
+    def _load_nllb_codes(self):
+        if self._nllb_codes is None:
+            default_model, self._nllb_codes = load_nllb_codes()
+            self.model = self.model or default_model
+
+    def load(self, model_name):
+        """Return (tokenizer, model) for ``model_name`` in the current quality mode, loading it on first use"""
+        return self.models.get((model_name, self.quality))
+
+    def warm(self, src, dest):
+        """Load the models for one pair now, evicting the least recently used if needed"""
+        for model_name, _, _ in self.route(src, dest):
+            self.load(model_name)
+
+    def prewarm(self, pairs):
+        """Load the models for (src, dest) ``pairs``, most used first, while they fit in memory"""
+        keys = []
+        for src, dest in pairs:
+            try:
+                steps = self.route(src, dest)
+            except ValueError:
+                continue  # Pair this family cannot translate
+            for model_name, _, _ in steps:
+                if (model_name, self.quality) not in keys:
+                    keys.append((model_name, self.quality))
+        return self.models.prewarm(keys)
+
+    def _load_model(self, key):
+        import torch
+
+        model_name, quality = key
+        threads = self.num_threads or (cpu_threads() if quality == "fast" else None)
+        if threads:
+            torch.set_num_threads(threads)
+        if quality == "fast":
+            loaded = self._load_quantized(model_name)
+        else:
+            loaded = self._pretrained(model_name)
+        loaded[1].eval()
+        return loaded
+
+    def _pretrained(self, model_name, part=None):
+        """Load (tokenizer, model), or just the "tokenizer"/"config"/"model" ``part``
+
+        The local Hugging Face cache is tried first; the files are
+        downloaded only when missing and ``allow_download`` is set.
+        """
+        from transformers import AutoConfig, AutoModelForSeq2SeqLM, AutoTokenizer
+
+        classes = {"tokenizer": AutoTokenizer, "config": AutoConfig, "model": AutoModelForSeq2SeqLM}
+        parts = [part] if part else ["tokenizer", "model"]
+        try:
+            loaded = [classes[name].from_pretrained(model_name, local_files_only=True, cache_dir=self.cache_dir)
+                      for name in parts]
+        except OSError:
+            if not self.allow_download:
+                raise RuntimeError(f"Model {model_name} is not available offline") from None
+            loaded = [classes[name].from_pretrained(model_name, cache_dir=self.cache_dir) for name in parts]
+        return loaded[0] if part else tuple(loaded)
+
+    def quantized_path(self, model_name):
+        """Where the int8 weights of ``model_name`` are cached
+
+        The name depends on everything that shapes the saved state dict: the
+        torch and transformers versions, the quantization dtype, layers and
+        engine, and for a model in a local directory, when it last changed.
+        """
+        import torch
+        import transformers
+
+        source = os.path.getmtime(model_name) if os.path.isdir(model_name) else ""
+        key = "|".join([model_name, str(source), torch.__version__, transformers.__version__, QUANTIZED_DTYPE,
+                        ",".join(QUANTIZED_LAYERS), torch.backends.quantized.engine])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in model_name.strip("/"))[-60:]
+        return os.path.join(self.quantized_dir, f"{safe_name}-{digest}-int8.pt")
+
+    def _load_quantized(self, model_name):
+        """Load the int8 model from the disk cache, quantizing and caching it the first time"""
+        import torch
+        from transformers import AutoModelForSeq2SeqLM
+
+        path = self.quantized_path(model_name)
+        tokenizer = self._pretrained(model_name, "tokenizer")
+        if os.path.exists(path):
+            try:
+                # Build the quantized structure from the config alone, then fill in the saved weights
+                model = quantize(AutoModelForSeq2SeqLM.from_config(self._pretrained(model_name, "config")))
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    model.load_state_dict(torch.load(path, weights_only=False))
+                return tokenizer, model
+            except Exception as e:
+                print(f"Rebuilding unusable quantized weights {path}: {e}")
+        model = self._pretrained(model_name, "model")
+        try:
+            quantized = quantize(model)
+        except Exception as e:
+            print(f"Could not quantize {model_name}, running it in full precision: {e}")
+            return tokenizer, model
+        try:
+            os.makedirs(self.quantized_dir, exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            torch.save(quantized.state_dict(), temporary)
+            os.replace(temporary, path)
+        except OSError as e:
+            print(f"Failed to save quantized weights: {e}")
+        return tokenizer, quantized
+
+    def translate_detailed(self, text, src, dest):
+        """Translate text and return (translation, detected source)"""
+        return self.translate_many([text], src, dest)[0]
+
+    def translate_many(self, texts, src, dest):
+        """Translate texts in model batches and return [(translation, detected), ...] in order"""
+        pieces = []  # (text index, lead, content, trail)
+        for index, text in enumerate(texts):
+            for chunk in split_text(text, MAX_SEGMENT_CHARS):
+                pieces.append((index, *split_padding(chunk)))
+        contents = [content for _, _, content, _ in pieces if content]
+        translated = dict(zip(contents, self.generate(contents, src, dest))) if contents else {}
+
+        outputs = [""] * len(texts)
+        for index, lead, content, trail in pieces:
+            outputs[index] += lead + translated.get(content, "") + trail
+        return [(output, src) for output in outputs]
+
+    def generate(self, sentences, src, dest):
+        """Run sentences through the model(s) for the pair in length-sorted batches and return their translations"""
+        for model_name, src_code, dest_code in self.route(src, dest):
+            sentences = self._generate(sentences, model_name, src_code, dest_code)
+        return sentences
+
+    def _generate(self, sentences, model_name, src_code, dest_code):
+        import torch
+
+        unique = sorted(set(sentences), key=len)
+        results = {}
+        with self._lock:  # One forward pass at a time; torch already uses every core
+            tokenizer, model = self.load(model_name)
+            options = {"num_beams": self.num_beams, "max_new_tokens": 512}
+            if self.family == "nllb":
+                tokenizer.src_lang = src_code
+                options["forced_bos_token_id"] = tokenizer.convert_tokens_to_ids(dest_code)
+            for start in range(0, len(unique), self.batch_size):
+                batch = unique[start:start + self.batch_size]
+                inputs = tokenizer(batch, return_tensors="pt", padding=True, truncation=True)
+                with torch.inference_mode():
+                    output_ids = model.generate(**inputs, **options)
+                results.update(zip(batch, tokenizer.batch_decode(output_ids, skip_special_tokens=True)))
+        return [results[sentence] for sentence in sentences]
+
+    def supported_languages(self):
+        if self.family == "nllb":
+            self._load_nllb_codes()
+            return [name for name in self.languages.names() if self.languages.code(name).lower() in self._nllb_codes]
+        return self.languages.names()
+
+    def fetch_languages(self):
+        """No remote table offline; keep the registry as it is"""
+        raise RuntimeError("The local backend cannot fetch a language table")
+
+    def close(self):
+        self.models.clear()
@@ -0,0 +1,127 @@
+"""Lazily loaded translation models kept under a memory budget."""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MODEL_BUDGET = 2 * 1024 ** 3  # Bytes; about six MarianMT pair models in fp32
+
+
+def model_bytes(loaded):
+    """Memory held by a (tokenizer, model) pair's weights and buffers, quantized or not"""
+    import torch
+
+    seen = set()
+    total = 0
+    for value in loaded[-1].state_dict().values():
+        # Quantized layers keep (weight, bias) tuples; tied weights are counted once
+        for tensor in value if isinstance(value, tuple) else (value,):
+            if isinstance(tensor, torch.Tensor) and tensor.data_ptr() not in seen:
+                seen.add(tensor.data_ptr())
+                total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelManager:
+    """Load models on first use and evict the least recently used beyond ``budget`` bytes.
+
+    ``load(name)`` creates a model and ``size_of(model)`` measures it. A
+    model is loaded once even when several threads ask for it together, and
+    the model just requested is never evicted, so a single model larger than
+    the budget still works.
+    """
+
+    def __init__(self, load, budget=DEFAULT_MODEL_BUDGET, size_of=model_bytes):
+        self.load = load
+        self.budget = budget
+        self.size_of = size_of
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._models = OrderedDict()  # name -> (model, size), least recently used first
+        self._loading = {}  # name -> Event set once the load finished or failed
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """Return the model called ``name``, loading it (and evicting others) if needed"""
+        while True:
+            with self._lock:
+                if name in self._models:
+                    self._models.move_to_end(name)
+                    self.hits += 1
+                    return self._models[name][0]
+                loading = self._loading.get(name)
+                if loading is None:
+                    loading = self._loading[name] = threading.Event()
+                    break
+            loading.wait()  # Another thread is loading it; retry once it is done
+
+        try:
+            model = self.load(name)
+            size = self.size_of(model)
+            with self._lock:
+                self.misses += 1
+                self._models[name] = (model, size)
+                self._evict(keep=name)
+            return model
+        finally:
+            with self._lock:
+                del self._loading[name]
+            loading.set()
+
+    def prewarm(self, names):
+        """Load ``names`` (most wanted first) while they fit without evicting anything
+
+        Returns the names that were loaded. The first name ends up the most
+        recently used, so it is the last to be evicted later. A name that
+        fails to load is reported and skipped.
+        """
+        loaded = []
+        for name in names:
+            with self._lock:
+                if name in self._models or name in self._loading:
+                    continue
+                expected = max((size for _, size in self._models.values()), default=0)
+                if self._models and self.used() + expected > self.budget:
+                    break
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"Could not preload {name}: {e}")
+                continue
+            loaded.append(name)
+        with self._lock:
+            for name in reversed(loaded):
+                if name in self._models:
+                    self._models.move_to_end(name)
+        return loaded
+
+    def set_budget(self, budget):
+        with self._lock:
+            self.budget = budget
+            self._evict()
+
+    def _evict(self, keep=None):
+        for name in list(self._models):
+            if self.used() <= self.budget:
+                return
+            if name != keep:
+                del self._models[name]
+                self.evictions += 1
+
+    def used(self):
+        """Bytes held by loaded models"""
+        return sum(size for _, size in self._models.values())
+
+    def loaded(self):
+        """Names of the loaded models, least recently used first"""
+        with self._lock:
+            return list(self._models)
+
+    def stats(self):
+        with self._lock:
+            return {"models": len(self._models), "bytes": self.used(), "budget": self.budget,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
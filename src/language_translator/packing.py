@@ -0,0 +1,142 @@
+"""Pack many short texts into one provider request and split the translation back."""
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .chunking import DEFAULT_CHUNK_SIZE
+from .providers import provider_namespace
+
+MARKER = "\n[[{}]]\n"  # Numbered so a lost, duplicated or reordered marker is caught
+MARKER_PATTERN = re.compile(r"\s*\[\[\s*(\d+)\s*\]\]\s*")
+MAX_PACK_SEGMENTS = 100  # Bounds how much is re-sent when a pack comes back mangled
+
+
+def pack(texts, max_chars=DEFAULT_CHUNK_SIZE, max_segments=MAX_PACK_SEGMENTS):
+    """Group text indices into packs whose joined request fits ``max_chars``
+
+    Returns a list of index lists, in order. Texts that are too long or
+    already contain something that looks like a marker get a pack of their
+    own and are sent as they are.
+    """
+    packs, current, size = [], [], 0
+    for i, text in enumerate(texts):
+        cost = len(text) + len(MARKER.format(len(current)))
+        if cost > max_chars or MARKER_PATTERN.search(text):
+            packs.append([i])
+            continue
+        if current and (size + cost > max_chars or len(current) >= max_segments):
+            packs.append(current)
+            current, size = [], 0
+            cost = len(text) + len(MARKER.format(0))
+        current.append(i)
+        size += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+def join(texts):
+    """One request holding every text, each behind its numbered marker"""
+    return "".join(MARKER.format(i) + text for i, text in enumerate(texts)).strip("\n")
+
+
+def split(translation, count):
+    """Split a packed translation back into ``count`` texts, or None if the markers did not survive"""
+    parts = MARKER_PATTERN.split(translation)
+    if parts[0].strip() or len(parts) != 2 * count + 1:
+        return None
+    if [int(index) for index in parts[1::2]] != list(range(count)):
+        return None
+    return [text.strip() for text in parts[2::2]]
+
+
+class PackingProvider:
+    """Send short texts to a one-text-per-request provider many at a time.
+
+    ``translate_many`` joins texts behind numbered markers into requests of
+    up to ``max_chars`` characters, sends the packs ``max_workers`` at a
+    time and splits each translation back. A pack whose markers come back
+    missing, merged or out of order is halved and both halves are sent
+    again, down to single texts, so the results always line up. Every text
+    of a pack gets the language detected for the whole pack. Setting
+    ``batch_size`` makes the engine route batches through
+    ``translate_many``; single translations go straight through.
+    """
+
+    batch_size = 1000
+    partial_results = True  # translate_many reports each pack through on_result as it comes back
+
+    def __init__(self, provider, max_chars=DEFAULT_CHUNK_SIZE, max_segments=MAX_PACK_SEGMENTS, max_workers=4):
+        self.provider = provider
+        self.name = getattr(provider, "name", type(provider).__name__)
+        self.max_chars = max_chars
+        self.max_segments = max_segments
+        self.texts = 0
+        self.requests = 0
+        self.repacked = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="pack")
+
+    @property
+    def cache_namespace(self):
+        return provider_namespace(self.provider)
+
+    def translate_detailed(self, text, src, dest):
+        """Translate text and return (translation, detected source)"""
+        return self.provider.translate_detailed(text, src, dest)
+
+    def translate_many(self, texts, src, dest, on_result=None):
+        """Translate texts with as few provider requests as possible; returns [(translation, detected), ...]
+
+        ``on_result(index, (translation, detected))`` is called from worker
+        threads for each text of a pack once the pack is translated.
+        """
+        texts = list(texts)
+        results = [None] * len(texts)
+        packs = pack(texts, self.max_chars, self.max_segments)
+        with self._lock:
+            self.texts += len(texts)
+
+        def send(indices):
+            for i, result in zip(indices, self._send([texts[i] for i in indices], src, dest)):
+                results[i] = result
+                if on_result:
+                    on_result(i, result)
+
+        if len(packs) == 1:
+            send(packs[0])
+        else:
+            for future in [self._executor.submit(send, indices) for indices in packs]:
+                future.result()
+        return results
+
+    def _send(self, texts, src, dest):
+        with self._lock:
+            self.requests += 1
+        if len(texts) == 1:
+            return [self.provider.translate_detailed(texts[0], src, dest)]
+        translation, detected = self.provider.translate_detailed(join(texts), src, dest)
+        parts = split(translation, len(texts))
+        if parts is not None:
+            return [(part, detected) for part in parts]
+        with self._lock:
+            self.repacked += 1
+        half = len(texts) // 2
+        return self._send(texts[:half], src, dest) + self._send(texts[half:], src, dest)
+
+    def supported_languages(self):
+        return self.provider.supported_languages()
+
+    def fetch_languages(self):
+        return self.provider.fetch_languages()
+
+    def stats(self):
+        stats = {"name": self.name, "texts": self.texts, "requests": self.requests, "repacked": self.repacked}
+        if hasattr(self.provider, "stats"):
+            stats["provider"] = self.provider.stats()
+        return stats
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.provider.close()
@@ -0,0 +1,89 @@
+"""Translation providers used by the engine."""
+
+from .clients import ClientPool
+
+
+def provider_namespace(provider):
+    """Cache namespace for a provider's translations: its ``cache_namespace``, else its name
+
+    Backends whose output depends on a model or quality setting include it,
+    and wrappers report the provider(s) they wrap.
+    """
+    return getattr(provider, "cache_namespace", None) or getattr(provider, "name", type(provider).__name__)
+
+
+class GoogleProvider:
+    """Google Translate through pooled per-pair clients"""
+
+    name = "google"
+
+    def __init__(self, clients=None):
+        self.clients = clients if clients is not None else ClientPool()
+
+    def translate_detailed(self, text, src, dest):
+        """Translate text and return (translation, detected source)"""
+        return self.clients.get(src, dest).translate_detailed(text)
+
+    def supported_languages(self):
+        return self.clients.supported_languages()
+
+    def fetch_languages(self):
+        return self.clients.fetch_languages()
+
+    def close(self):
+        self.clients.close()
+
+
+class GoogletransProvider:
+    """Google Translate through the googletrans package"""
+
+    name = "googletrans"
+
+    def __init__(self):
+        self._translator = None
+
+    @property
+    def translator(self):
+        """googletrans client, imported and created on first use"""
+        if self._translator is None:
+            from googletrans import Translator
+            self._translator = Translator()
+        return self._translator
+
+    def translate_detailed(self, text, src, dest):
+        """Translate text and return (translation, detected source)"""
+        translated = self.translator.translate(text, src=src, dest=dest)
+        return translated.text, translated.src
+
+    def supported_languages(self):
+        from googletrans import LANGUAGES
+        return list(LANGUAGES.values())
+
+    def fetch_languages(self):
+        from googletrans import LANGUAGES
+        return {name: code for code, name in LANGUAGES.items()}
+
+    def close(self):
+        pass
+
+
+def make_provider(name, workers=0, **options):
+    """Create a provider by name: "google", "googletrans", "llm", or a local "marian"/"nllb" model
+
+    With ``workers`` the provider runs in that many worker processes instead
+    of in this one.
+    """
+    if workers:
+        from .workers import WorkerPool
+        return WorkerPool(name, workers, **options)
+    if name == "google":
+        return GoogleProvider(**options)
+    if name == "googletrans":
+        return GoogletransProvider(**options)
+    if name == "llm":
+        from .llm import LLMProvider
+        return LLMProvider(**options)
+    if name in ("marian", "nllb"):
+        from .local import LocalProvider
+        return LocalProvider(name, **options)
+    raise ValueError(f"Unknown translation provider: {name}")
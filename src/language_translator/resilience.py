@@ -0,0 +1,229 @@
+"""Client-side rate limiting, retries with backoff and a circuit breaker for providers."""
+
+import random
+import threading
+import time
+
+from .providers import provider_namespace
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """The provider failed repeatedly and calls are refused until it cools down"""
+
+
+class TokenBucket:
+    """Allow ``rate`` calls per second on average, in bursts of up to ``burst``
+
+    ``acquire`` blocks until a token is free. The rate can be lowered and
+    raised while running, which ``ResilientProvider`` does when the provider
+    answers 429.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take a token, sleeping until one is available; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+
+class CircuitBreaker:
+    """Fail fast while a provider is down
+
+    Closed: calls go through. After ``failure_threshold`` failures in a row
+    it opens and every call raises CircuitOpenError for ``reset_timeout``
+    seconds. Then it is half-open: one trial call goes through, and its
+    outcome closes the breaker again or reopens it.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through now"""
+        with self._lock:
+            if self.state == "open":
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Provider unavailable after {self.failures} failures; "
+                                           f"retrying in {remaining:.0f} s")
+                self.state = "half-open"
+            if self.state == "half-open":
+                if self._trial_running:
+                    self.rejected += 1
+                    raise CircuitOpenError("Provider unavailable; checking whether it recovered")
+                self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+def error_status(error):
+    """HTTP status carried by a requests-style exception, if any"""
+    return getattr(getattr(error, "response", None), "status_code", None)
+
+
+def retry_after(error):
+    """Seconds from the Retry-After header of a requests-style exception, if given in seconds"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_transient(error):
+    """Whether an error is worth retrying: throttling, server errors, timeouts, dropped connections"""
+    status = error_status(error)
+    if status is not None:
+        return status in RETRY_STATUSES
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    try:
+        import requests
+    except ImportError:
+        return False
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def backoff_delay(attempt, base=0.25, cap=8.0):
+    """"Full jitter" exponential backoff: uniform in [0, min(cap, base * 2**attempt)]"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class ResilientProvider:
+    """Wrap a provider with a token-bucket rate limit, retries and a circuit breaker.
+
+    Every attempt, retries included, takes a token from the bucket when
+    ``rate`` is set, so bulk work stays under the provider's quota. A 429
+    answer also cuts the bucket's rate by a quarter (never below a tenth of ``rate``),
+    and each success wins back 1% of ``rate``, so a quota lower than
+    configured is found and held. Transient errors are retried up to
+    ``retries`` times with jittered exponential backoff, honouring
+    Retry-After. Failures that survive the retries count towards the
+    circuit breaker (429s do not: a throttling provider is up), which then
+    fails fast instead of waiting on a provider that is down.
+    """
+
+    def __init__(self, provider, rate=None, burst=None, retries=3, backoff=0.25, max_backoff=8.0,
+                 failure_threshold=5, reset_timeout=30.0):
+        self.provider = provider
+        self.name = getattr(provider, "name", type(provider).__name__)
+        self.batch_size = getattr(provider, "batch_size", None)
+        self.rate = rate
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.attempts = 0
+        self.retried = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def call(self, method, *args):
+        """Run ``provider.method(*args)`` under the rate limit, retry policy and breaker"""
+        self.breaker.before_call()
+        for attempt in range(self.retries + 1):
+            if self.bucket:
+                self.bucket.acquire()
+            with self._lock:
+                self.attempts += 1
+            try:
+                result = getattr(self.provider, method)(*args)
+            except Exception as e:
+                throttled = error_status(e) == 429
+                if throttled:
+                    self._throttled()
+                if not is_transient(e) or (throttled and attempt == self.retries):
+                    self.breaker.record_success()  # The provider is up; it refused this request
+                    raise
+                if attempt == self.retries:
+                    self.breaker.record_failure()
+                    raise
+                with self._lock:
+                    self.retried += 1
+                delay = backoff_delay(attempt, self.backoff, self.max_backoff)
+                time.sleep(max(delay, retry_after(e) or 0.0))
+            else:
+                self._succeeded()
+                self.breaker.record_success()
+                return result
+
+    def _throttled(self):
+        with self._lock:
+            self.throttled += 1
+            if self.bucket:
+                self.bucket.set_rate(max(self.rate / 10, self.bucket.rate * 0.75))
+
+    def _succeeded(self):
+        if self.bucket and self.bucket.rate < self.rate:
+            self.bucket.set_rate(min(self.rate, self.bucket.rate + self.rate / 100))
+
+    @property
+    def cache_namespace(self):
+        return provider_namespace(self.provider)
+
+    def translate_detailed(self, text, src, dest):
+        """Translate text and return (translation, detected source)"""
+        return self.call("translate_detailed", text, src, dest)
+
+    def translate_many(self, texts, src, dest):
+        return self.call("translate_many", texts, src, dest)
+
+    def supported_languages(self):
+        return self.provider.supported_languages()
+
+    def fetch_languages(self):
+        return self.call("fetch_languages")
+
+    def stats(self):
+        return {"name": self.name, "circuit": self.breaker.state, "attempts": self.attempts,
+                "retried": self.retried, "throttled": self.throttled, "rejected": self.breaker.rejected,
+                "rate": self.bucket.rate if self.bucket else None}
+
+    def close(self):
+        self.provider.close()
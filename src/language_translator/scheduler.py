@@ -0,0 +1,104 @@
+"""Fixed-size prioritized job scheduler and Tk main-thread dispatcher."""
+
+import itertools
+import queue
+import threading
+
+INTERACTIVE = 0  # User is waiting on the result
+BULK = 1         # Long documents and other background work
+
+
+class CancelToken:
+    """Flag shared between a job and whoever may cancel it"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class JobScheduler:
+    """Runs jobs on a fixed pool of worker threads, interactive jobs first.
+
+    ``dispatch(callback, *args)`` is used to deliver ``on_done``/``on_error``
+    callbacks, so with a TkDispatcher they run on the UI thread. Jobs whose
+    token is cancelled before they start are skipped.
+    """
+
+    def __init__(self, workers=4, dispatch=None):
+        self.dispatch = dispatch or (lambda callback, *args: callback(*args))
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"scheduler-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, func, *args, priority=INTERACTIVE, token=None, on_done=None, on_error=None):
+        """Queue func(*args) and return its CancelToken"""
+        token = token or CancelToken()
+        self._queue.put((priority, next(self._counter), (func, args, token, on_done, on_error)))
+        return token
+
+    def _worker(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+            func, args, token, on_done, on_error = job
+            if token.cancelled:
+                continue
+            try:
+                result = func(*args)
+            except Exception as e:
+                if on_error and not token.cancelled:
+                    self.dispatch(on_error, e)
+                elif not on_error:
+                    print(f"Background job failed: {e}")
+            else:
+                if on_done and not token.cancelled:
+                    self.dispatch(on_done, result)
+
+    def pending(self):
+        """Number of jobs waiting for a worker"""
+        return self._queue.qsize()
+
+    def shutdown(self):
+        """Stop workers after the jobs already queued"""
+        for _ in self._threads:
+            self._queue.put((BULK + 1, next(self._counter), None))
+
+
+class TkDispatcher:
+    """Hands callables from worker threads to the Tk main loop.
+
+    Worker threads only touch a thread-safe queue; the main loop drains it
+    from a ``root.after`` timer.
+    """
+
+    def __init__(self, root, interval_ms=20):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._queue = queue.SimpleQueue()
+        self.root.after(self.interval_ms, self._poll)
+
+    def __call__(self, callback, *args):
+        self._queue.put((callback, args))
+
+    def _poll(self):
+        try:
+            while True:
+                callback, args = self._queue.get_nowait()
+                try:
+                    callback(*args)
+                except Exception as e:
+                    print(f"UI callback failed: {e}")
+        except queue.Empty:
+            pass
+        self.root.after(self.interval_ms, self._poll)
@@ -0,0 +1,280 @@
+"""Local HTTP translation service with dynamic micro-batching per language pair."""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from .languages import get_registry
+
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class QueueFull(RuntimeError):
+    """The batcher already holds ``max_queue`` texts; retry later"""
+
+
+class MicroBatcher:
+    """Group texts submitted concurrently for the same language pair into engine batches.
+
+    A pair's batch is sent when it reaches ``max_batch`` texts or its oldest
+    text has waited ``max_wait`` seconds. At most ``workers`` batches run at
+    once; while they are all busy new texts keep queueing, so batches grow
+    with load instead of requests piling up one by one. Once ``max_queue``
+    texts are waiting, ``submit`` raises QueueFull rather than queueing more.
+    """
+
+    def __init__(self, engine, max_batch=32, max_wait=0.005, max_queue=1024, workers=4):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.batches = 0
+        self.texts = 0
+        self.rejected = 0
+        self._pending = OrderedDict()  # (src, dest) -> [(text, future, deadline), ...], oldest first
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._slots = threading.Semaphore(workers)
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="microbatch")
+        self._thread = threading.Thread(target=self._run, name="microbatch-dispatch", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts, src, dest):
+        """Queue texts for translation and return one Future per text"""
+        pair = (src, dest)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Batcher is closed")
+            if self._size + len(texts) > self.max_queue:
+                self.rejected += len(texts)
+                raise QueueFull(f"{self._size} texts already queued")
+            deadline = time.monotonic() + self.max_wait
+            futures = [Future() for _ in texts]
+            self._pending.setdefault(pair, []).extend((text, future, deadline) for text, future in zip(texts, futures))
+            self._size += len(texts)
+            self._condition.notify()
+        return futures
+
+    def _ready(self):
+        """The pair to send next: full or past its deadline, the one waiting longest first"""
+        now = time.monotonic()
+        ready = [pair for pair, items in self._pending.items()
+                 if self._closed or len(items) >= self.max_batch or items[0][2] <= now]
+        return min(ready, key=lambda pair: self._pending[pair][0][2], default=None)
+
+    def _run(self):
+        while True:
+            self._slots.acquire()  # Only pick a batch once a worker can take it
+            with self._condition:
+                while True:
+                    if self._closed and not self._pending:
+                        return
+                    pair = self._ready()
+                    if pair is not None:
+                        break
+                    timeout = None
+                    if self._pending:
+                        timeout = min(items[0][2] for items in self._pending.values()) - time.monotonic()
+                    self._condition.wait(timeout)
+                items = self._pending[pair]
+                batch, rest = items[:self.max_batch], items[self.max_batch:]
+                if rest:
+                    self._pending[pair] = rest
+                else:
+                    del self._pending[pair]
+                self._size -= len(batch)
+            self._executor.submit(self._translate, pair, batch)
+
+    def _translate(self, pair, batch):
+        try:
+            translations = self.engine.translate_batch([text for text, _, _ in batch], *pair)
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+        else:
+            for (_, future, _), translation in zip(batch, translations):
+                future.set_result(translation)
+        finally:
+            with self._condition:
+                self.batches += 1
+                self.texts += len(batch)
+            self._slots.release()
+
+    def queued(self):
+        with self._condition:
+            return self._size
+
+    def stats(self):
+        with self._condition:
+            return {"queued": self._size, "max_queue": self.max_queue, "batches": self.batches,
+                    "texts": self.texts, "rejected": self.rejected,
+                    "mean_batch": round(self.texts / self.batches, 2) if self.batches else 0.0}
+
+    def close(self):
+        """Send what is queued, then stop"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self._executor.shutdown()
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class TranslationHandler(BaseHTTPRequestHandler):
+    """JSON API: POST /translate, /batch, /detect; GET /languages, /health"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        routes = {"/health": self.server.health, "/languages": self.server.languages}
+        self.respond(routes.get(urlparse(self.path).path))
+
+    def do_POST(self):
+        routes = {"/translate": self.server.translate, "/batch": self.server.translate_batch,
+                  "/detect": self.server.detect}
+        self.respond(routes.get(urlparse(self.path).path), self.read_json)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, f"Request body over {MAX_BODY_BYTES} bytes")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON") from None
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return body
+
+    def respond(self, route, read_body=None):
+        headers = {}
+        try:
+            if route is None:
+                raise HTTPError(404, f"No endpoint {self.path}")
+            status, payload = 200, route(read_body()) if read_body else route()
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+            if status in (404, 413):
+                self.close_connection = True  # The request body may not have been read
+        except QueueFull as e:
+            status, payload = 503, {"error": f"Server busy: {e}"}
+            headers["Retry-After"] = "1"
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            status, payload = 502, {"error": f"Translation failed: {e}"}
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def text_field(body, name):
+    value = body.get(name)
+    if not isinstance(value, str):
+        raise HTTPError(400, f"'{name}' must be a string")
+    return value
+
+
+def language_fields(body):
+    """Validated (src, dest) of a request; they default to "auto" and "en" when missing"""
+    languages = []
+    for name, default in (("src", "auto"), ("dest", "en")):
+        value = body.get(name, default)
+        if not isinstance(value, str) or not value.strip():
+            raise HTTPError(400, f"'{name}' must be a language name or code")
+        languages.append(value.strip())
+    if languages[1].lower() == "auto":
+        raise HTTPError(400, "'dest' cannot be auto")
+    return tuple(languages)
+
+
+class TranslationServer(ThreadingHTTPServer):
+    """HTTP front end for a TranslationEngine; translations go through a MicroBatcher"""
+
+    daemon_threads = True
+    request_queue_size = 128  # Listen backlog; the default of 5 resets bursts of new connections
+
+    def __init__(self, engine, host="127.0.0.1", port=8080, timeout=30.0, verbose=False, **batcher_options):
+        super().__init__((host, port), TranslationHandler)
+        self.engine = engine
+        self.batcher = MicroBatcher(engine, **batcher_options)
+        self.request_timeout = timeout
+        self.verbose = verbose
+        self.started = time.monotonic()
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def wait(self, futures):
+        deadline = time.monotonic() + self.request_timeout
+        try:
+            return [future.result(max(0.0, deadline - time.monotonic())) for future in futures]
+        except FutureTimeout:
+            raise HTTPError(504, "Translation timed out") from None
+
+    def translate(self, body):
+        text = text_field(body, "text")
+        src, dest = language_fields(body)
+        return {"translation": self.wait(self.batcher.submit([text], src, dest))[0], "src": src, "dest": dest}
+
+    def translate_batch(self, body):
+        texts = body.get("texts")
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise HTTPError(400, "'texts' must be a list of strings")
+        if len(texts) > self.batcher.max_queue:
+            raise HTTPError(413, f"At most {self.batcher.max_queue} texts per request")
+        src, dest = language_fields(body)
+        return {"translations": self.wait(self.batcher.submit(texts, src, dest)), "src": src, "dest": dest}
+
+    def detect(self, body):
+        """Detect through a translation from "auto"; backends that cannot detect answer 501
+
+        This goes to the provider directly: a cached translation does not
+        record the language it was detected as.
+        """
+        text = text_field(body, "text")
+        if not text.strip():
+            raise HTTPError(400, "'text' must not be empty")
+        _, detected = self.engine.provider.translate_detailed(text, "auto", "en")
+        if detected == "auto":
+            raise HTTPError(501, "This backend cannot detect languages")
+        registry = get_registry()
+        return {"language": detected, "name": registry.name(detected)}
+
+    def languages(self):
+        registry = get_registry()
+        return {"languages": {name: registry.code(name) for name in self.engine.supported_languages()}}
+
+    def health(self):
+        provider = self.engine.provider
+        health = {"status": "ok", "backend": getattr(provider, "name", "unknown"),
+                  "uptime": round(time.monotonic() - self.started, 1), "batcher": self.batcher.stats()}
+        if hasattr(provider, "stats"):
+            health["providers"] = provider.stats()
+        return health
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
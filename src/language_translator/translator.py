@@ -1,20 +1,23 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from googletrans import Translator
-import speech_recognition as sr
-import pyttsx3
-import threading
+
+from .cache import TranslationCache
+from .engine import TranslationEngine
+from .providers import GoogletransProvider
+from .scheduler import JobScheduler, TkDispatcher
+from .tts import Pyttsx3Backend
 
 class LanguageTranslatorApp:
-    def __init__(self, root):
+    def __init__(self, root, translation_engine=None):
         self.root = root
         self.root.title("Easy Language Translator")
         self.root.geometry("500x350")
         self.root.resizable(False, False)
 
-        self.translator = Translator()
-        self.recognizer = sr.Recognizer()
-        self.engine = pyttsx3.init()
+        self.recognizer = None  # Created on first voice input
+        self.tts = Pyttsx3Backend()
+        self.translation_engine = translation_engine or TranslationEngine(GoogletransProvider(), TranslationCache())
+        self.scheduler = JobScheduler(workers=2, dispatch=TkDispatcher(root))
 
         # Source language input
         ttk.Label(root, text="Source Language Code (e.g., en):").pack(pady=5)
@@ -58,47 +61,52 @@ class LanguageTranslatorApp:
             messagebox.showerror("Error", "Please fill in all fields.")
             return
 
-        try:
-            translated = self.translator.translate(text, src=src, dest=dest)
-            self.output_text.config(state="normal")
-            self.output_text.delete("1.0", tk.END)
-            self.output_text.insert(tk.END, translated.text)
-            self.output_text.config(state="disabled")
-        except Exception as e:
-            messagebox.showerror("Translation Error", str(e))
+        self.scheduler.submit(self.translation_engine.translate, text, src, dest,
+                              on_done=self.show_translation, on_error=self.show_translation_error)
+
+    def show_translation(self, translation):
+        self.output_text.config(state="normal")
+        self.output_text.delete("1.0", tk.END)
+        self.output_text.insert(tk.END, translation)
+        self.output_text.config(state="disabled")
+
+    def show_translation_error(self, error):
+        messagebox.showerror("Translation Error", str(error))
 
     def voice_input(self):
         """Capture voice input and convert to text"""
+        messagebox.showinfo("Voice Input", "Speak now...")
+        self.scheduler.submit(self._capture_voice, on_done=self.show_voice_text, on_error=self.show_voice_error)
+
+    def _capture_voice(self):
+        import speech_recognition as sr
+        if self.recognizer is None:
+            self.recognizer = sr.Recognizer()
         try:
-            messagebox.showinfo("Voice Input", "Speak now...")
             with sr.Microphone() as source:
                 self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
                 audio = self.recognizer.listen(source, timeout=5)
-                text = self.recognizer.recognize_google(audio)
-                self.text_input.delete("1.0", tk.END)
-                self.text_input.insert("1.0", text)
+                return self.recognizer.recognize_google(audio)
         except sr.WaitTimeoutError:
-            messagebox.showerror("Error", "No speech detected within timeout")
+            raise RuntimeError("No speech detected within timeout")
         except sr.RequestError:
-            messagebox.showerror("Error", "Could not request results from speech recognition service")
+            raise RuntimeError("Could not request results from speech recognition service")
         except sr.UnknownValueError:
-            messagebox.showerror("Error", "Could not understand the audio")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+            raise RuntimeError("Could not understand the audio")
+
+    def show_voice_text(self, text):
+        self.text_input.delete("1.0", tk.END)
+        self.text_input.insert("1.0", text)
+
+    def show_voice_error(self, error):
+        messagebox.showerror("Error", str(error))
 
     def speak_translation(self):
         """Read the translated text aloud"""
         text = self.output_text.get("1.0", tk.END).strip()
         if text:
-            try:
-                def speak():
-                    self.engine.say(text)
-                    self.engine.runAndWait()
-                
-                # Run in a separate thread to prevent GUI freezing
-                threading.Thread(target=speak, daemon=True).start()
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not speak the text: {str(e)}")
+            # Run on the scheduler to prevent GUI freezing
+            self.scheduler.submit(self.tts.speak, text, on_error=lambda e: messagebox.showerror("Error", f"Could not speak the text: {str(e)}"))
         else:
             messagebox.showwarning("Warning", "No text to speak")
 
@@ -0,0 +1,151 @@
+"""Text-to-speech backends and cached voice discovery."""
+
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+DEFAULT_VOICE_CACHE = "tts_voices.json"
+
+
+class SayBackend:
+    """macOS ``say`` command"""
+
+    name = "say"
+
+    def __init__(self):
+        self.command = shutil.which("say")
+
+    def available(self):
+        return self.command is not None
+
+    def fingerprint(self):
+        return f"{self.command}:{os.stat(self.command).st_mtime}"
+
+    def list_voices(self):
+        result = subprocess.run([self.command, "-v", "?"], capture_output=True, text=True, timeout=30)
+        # Each line format: "name  language  # sample sentence"
+        return [line.split()[0] for line in result.stdout.splitlines() if line.strip()]
+
+    def speak(self, text, voice=None, rate=200):
+        if voice:
+            result = subprocess.run([self.command, "-v", voice, "-r", str(rate), text],
+                                    capture_output=True, text=True)
+            if result.returncode == 0:
+                return
+            print(f"TTS error: {result.stderr}")  # Try without voice specification
+        subprocess.run([self.command, "-r", str(rate), text])
+
+
+class EspeakBackend:
+    """espeak-ng / espeak, the usual choice on Linux"""
+
+    name = "espeak"
+
+    def __init__(self):
+        self.command = shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self):
+        return self.command is not None
+
+    def fingerprint(self):
+        return f"{self.command}:{os.stat(self.command).st_mtime}"
+
+    def list_voices(self):
+        result = subprocess.run([self.command, "--voices"], capture_output=True, text=True, timeout=30)
+        # Columns: Pty Language Age/Gender VoiceName File Other Languages
+        return [line.split()[3] for line in result.stdout.splitlines()[1:] if len(line.split()) > 3]
+
+    def speak(self, text, voice=None, rate=200):
+        command = [self.command, "-s", str(rate)]
+        if voice:
+            command += ["-v", voice]
+        subprocess.run(command + [text])
+
+
+class Pyttsx3Backend:
+    """pyttsx3, which wraps the platform speech API"""
+
+    name = "pyttsx3"
+
+    def __init__(self):
+        self._engine = None
+        self._lock = threading.Lock()  # pyttsx3 engines are not thread-safe
+
+    def available(self):
+        return importlib.util.find_spec("pyttsx3") is not None
+
+    def fingerprint(self):
+        try:
+            from importlib.metadata import version
+            installed = version("pyttsx3")
+        except ImportError:  # Python 3.7 has no importlib.metadata
+            import pyttsx3
+            installed = getattr(pyttsx3, "__version__", "unknown")
+        return f"pyttsx3:{installed}:{sys.platform}"
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            import pyttsx3
+            self._engine = pyttsx3.init()
+        return self._engine
+
+    def list_voices(self):
+        with self._lock:
+            return [voice.name for voice in self.engine.getProperty("voices")]
+
+    def speak(self, text, voice=None, rate=200):
+        with self._lock:
+            engine = self.engine
+            if voice:
+                for candidate in engine.getProperty("voices"):
+                    if candidate.name == voice:
+                        engine.setProperty("voice", candidate.id)
+                        break
+            engine.setProperty("rate", rate)
+            engine.say(text)
+            engine.runAndWait()
+
+
+BACKENDS = {backend.name: backend for backend in (SayBackend, EspeakBackend, Pyttsx3Backend)}
+
+
+def available_backends():
+    """Return instances of every backend usable on this machine, preferred first"""
+    return [backend for backend in (cls() for cls in BACKENDS.values()) if backend.available()]
+
+
+def load_voices(backend, cache_path=DEFAULT_VOICE_CACHE, max_age=30 * 24 * 3600):
+    """Return the backend's voices, from the on-disk cache when still valid.
+
+    A cached list is reused while the backend's fingerprint (executable and
+    its mtime, or package version) is unchanged and it is younger than
+    ``max_age`` seconds.
+    """
+    fingerprint = backend.fingerprint()
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f).get(backend.name)
+        if cached and cached["fingerprint"] == fingerprint and time.time() - cached["time"] < max_age:
+            return cached["voices"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    voices = backend.list_voices()
+    try:
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data[backend.name] = {"fingerprint": fingerprint, "time": time.time(), "voices": voices}
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"Failed to save voice cache: {e}")
+    return voices
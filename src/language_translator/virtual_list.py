@@ -0,0 +1,152 @@
+"""A Tk list that only materializes the rows in view."""
+
+import tkinter as tk
+from tkinter import font, ttk
+
+
+class VirtualList(ttk.Frame):
+    """Scrollable list of entries where only the visible rows exist in the widget.
+
+    Entries are dicts; ``render`` turns one into its display text. The
+    listbox holds a single screenful of lines that is redrawn as the view
+    moves, so showing, appending or filtering costs the same for ten
+    entries or a million. ``on_end`` is called when the view reaches the
+    last loaded entry, so the owner can fetch another page. ``store`` makes
+    the container for loaded entries: anything with ``extend``, ``insert(0,
+    entry)``, ``len`` and indexing, such as CompactHistory.
+    """
+
+    def __init__(self, parent, render, on_end=None, height=15, store=list, **listbox_options):
+        super().__init__(parent)
+        self.render = render
+        self.on_end = on_end
+        self.store = store
+        self.entries = store()  # Loaded entries in display order
+        self.top = 0  # Index of the first visible entry
+        self.visible = height
+        self.selected_index = None
+        self._loading = False
+
+        self.listbox = tk.Listbox(self, height=height, activestyle="none", exportselection=False,
+                                  **listbox_options)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.listbox.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.listbox.bind("<Configure>", self._on_resize)
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units"))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll(-1, "units"))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll(1, "units"))
+        self.listbox.bind("<Up>", lambda e: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda e: self.scroll(-1, "pages"))
+        self.listbox.bind("<Next>", lambda e: self.scroll(1, "pages"))
+
+    def bind_row(self, sequence, callback):
+        """Bind ``sequence`` on the rows; ``callback`` receives the entry under the pointer"""
+        def handler(event):
+            entry = self.entry_at(event.y)
+            if entry is not None:
+                callback(entry)
+        self.listbox.bind(sequence, handler, add="+")
+
+    def set_entries(self, entries):
+        """Replace all entries and scroll back to the top"""
+        self.entries = self.store()
+        self.entries.extend(entries)
+        self.top = 0
+        self.selected_index = None
+        self.redraw()
+
+    def extend(self, entries):
+        """Append entries (an older page) below the loaded ones"""
+        self.entries.extend(entries)
+        self.redraw()
+
+    def prepend(self, entry):
+        """Insert a new entry at the top, keeping a scrolled view where it is"""
+        self.entries.insert(0, entry)
+        if self.top > 0:
+            self.top += 1
+        if self.selected_index is not None:
+            self.selected_index += 1
+        self.redraw()
+
+    def entry_at(self, y):
+        """Return the entry drawn at pixel row ``y``, or None"""
+        index = self.top + self.listbox.nearest(y)
+        return self.entries[index] if index < len(self.entries) else None
+
+    def selected(self):
+        if self.selected_index is None:
+            return None
+        return self.entries[self.selected_index]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def yview(self, *args):
+        """Scrollbar command: ``moveto fraction`` or ``scroll n units|pages``"""
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self.entries)))
+        elif args[0] == "scroll":
+            self.scroll(int(args[1]), args[2])
+
+    def scroll(self, count, what="units"):
+        step = max(1, self.visible - 1) if what == "pages" else 1
+        self.scroll_to(self.top + count * step)
+        return "break"
+
+    def scroll_to(self, top):
+        top = max(0, min(top, len(self.entries) - self.visible))
+        if top != self.top:
+            self.top = top
+            self.redraw()
+
+    def redraw(self):
+        """Render the visible window of entries into the listbox"""
+        window = [self.entries[i] for i in range(self.top, min(self.top + self.visible, len(self.entries)))]
+        self.listbox.delete(0, tk.END)
+        if window:
+            self.listbox.insert(tk.END, *(self.render(entry) for entry in window))
+        if self.selected_index is not None and 0 <= self.selected_index - self.top < len(window):
+            self.listbox.selection_set(self.selected_index - self.top)
+        total = len(self.entries)
+        if total > self.visible:
+            self.scrollbar.set(self.top / total, (self.top + len(window)) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        if self.on_end and self.top + self.visible >= total and not self._loading:
+            self._loading = True
+            try:
+                self.on_end()
+            finally:
+                self._loading = False
+
+    def _on_resize(self, event):
+        line_height = font.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+        border = 2 * (int(self.listbox.cget("borderwidth")) + int(self.listbox.cget("highlightthickness")))
+        visible = max(1, (event.height - border) // line_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.top = max(0, min(self.top, len(self.entries) - visible))
+            self.redraw()
+
+    def _on_select(self, event=None):
+        selection = self.listbox.curselection()
+        if selection and self.top + selection[0] < len(self.entries):
+            self.selected_index = self.top + selection[0]
+
+    def _move_selection(self, delta):
+        """Move the selection with the arrow keys, scrolling at the edges"""
+        index = self.top if self.selected_index is None else self.selected_index + delta
+        if not 0 <= index < len(self.entries):
+            return "break"
+        self.selected_index = index
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self.visible:
+            self.top = index - self.visible + 1
+        self.redraw()
+        return "break"
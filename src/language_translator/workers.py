@@ -0,0 +1,236 @@
+"""Translation in a pool of worker processes, so inference never blocks the GUI."""
+
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .providers import make_provider, provider_namespace
+
+# Provider methods a worker will run; anything else is answered from the parent
+WORKER_METHODS = {"translate_detailed", "translate_many", "generate"}
+
+
+class WorkerCrashed(RuntimeError):
+    """A worker process died while handling a request"""
+
+
+def _serve(conn, provider, spec, threads):
+    """Worker main loop: answer (method, args, settings) messages until told to stop"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is for the parent
+    if provider is None:  # Spawned rather than forked
+        name, options = spec
+        provider = make_provider(name, **options)
+    if threads:
+        if hasattr(provider, "num_threads"):
+            provider.num_threads = threads
+        if "torch" in sys.modules:
+            sys.modules["torch"].set_num_threads(threads)
+    applied = {}
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return  # Parent went away
+        if message is None:
+            return
+        method, args, settings = message
+        try:
+            if settings != applied:
+                provider.configure(**settings)
+                applied = settings
+            reply = ("ok", getattr(provider, method)(*args))
+        except Exception as e:
+            reply = ("error", e)
+        try:
+            conn.send(reply)
+        except Exception as e:  # Unpicklable exception or result
+            conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    def __init__(self, process, conn, generation):
+        self.process = process
+        self.conn = conn
+        self.generation = generation
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """Run a provider in ``workers`` child processes and translate through them.
+
+    The pool is itself a provider, so the engine, GUI and scripts use it
+    unchanged. Each worker talks to the parent over its own pipe and handles
+    one request at a time; concurrent requests and large ``translate_many``
+    calls spread across all workers. On platforms with ``fork`` the workers
+    are forked from the parent, so models already loaded there (see
+    ``warm``) are shared copy-on-write instead of being loaded once per
+    worker. A worker that dies is replaced and its request retried once on
+    the replacement before ``WorkerCrashed`` is raised; the calling process
+    is unaffected.
+    """
+
+    def __init__(self, name, workers=None, threads=None, **options):
+        self.name = name
+        self.workers = workers or max(1, min(4, os.cpu_count() or 1))
+        # Split the CPUs between workers instead of oversubscribing them
+        self.threads = threads or max(1, (os.cpu_count() or 1) // self.workers)
+        self.provider = make_provider(name, **options)  # Parent copy: languages, preloaded models
+        self.batch_size = getattr(self.provider, "batch_size", None)
+        if self.batch_size:
+            self.batch_size *= self.workers  # Enough per engine call to keep every worker busy
+        self.settings = {}
+        self.crashes = 0
+        self._spec = (name, options)
+        self._forking = "fork" in multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("fork" if self._forking else "spawn")
+        self._generation = 0
+        self._fork_lock = threading.Lock()  # No fork while the parent copy is being changed
+        self._idle = queue.Queue()
+        self._all = set()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="worker-pool")
+        self._closed = False
+        for _ in range(self.workers):
+            self._idle.put(self._start())
+
+    def _start(self):
+        parent_conn, child_conn = self._context.Pipe()
+        with self._fork_lock:
+            provider = self.provider if self._forking else None
+            process = self._context.Process(target=_serve, args=(child_conn, provider, self._spec, self.threads),
+                                            name=f"translate-{self.name}", daemon=True)
+            process.start()
+        child_conn.close()  # Only the child holds it now, so a crash reads as EOF here
+        worker = _Worker(process, parent_conn, self._generation)
+        self._all.add(worker)
+        return worker
+
+    def _replace(self, worker):
+        self._all.discard(worker)
+        worker.stop()
+        return self._start()
+
+    def call(self, method, *args):
+        """Run ``provider.method(*args)`` in the next free worker and return its result"""
+        if method not in WORKER_METHODS:
+            raise ValueError(f"Not a worker method: {method}")
+        if self._closed:
+            raise RuntimeError("Worker pool is closed")
+        worker = self._idle.get()
+        try:
+            if worker.generation != self._generation:
+                worker = self._replace(worker)  # Forked before the last warm; pick up its models
+            for attempt in range(2):
+                try:
+                    worker.conn.send((method, args, self.settings))
+                    status, value = worker.conn.recv()
+                    break
+                except (EOFError, OSError):
+                    self.crashes += 1
+                    # Retry on the fresh replacement: other idle workers may have died too
+                    worker = self._replace(worker)
+            else:
+                raise WorkerCrashed(f"Translation worker died twice running {method}")
+        finally:
+            self._idle.put(worker)
+        if status == "error":
+            raise value
+        return value
+
+    def translate_detailed(self, text, src, dest):
+        """Translate text and return (translation, detected source)"""
+        return self.call("translate_detailed", text, src, dest)
+
+    def translate_many(self, texts, src, dest):
+        """Translate texts split across the workers and return [(translation, detected), ...] in order
+
+        Providers without ``translate_many`` get one ``translate_detailed``
+        call per distinct text, spread across the workers.
+        """
+        unique = list(dict.fromkeys(texts))  # Repeats would otherwise be translated by several workers
+        if not hasattr(self.provider, "translate_many"):
+            futures = [self._executor.submit(self.call, "translate_detailed", text, src, dest) for text in unique]
+            results = dict(zip(unique, (future.result() for future in futures)))
+            return [results[text] for text in texts]
+        size = max(1, math.ceil(len(unique) / self.workers))
+        parts = [unique[start:start + size] for start in range(0, len(unique), size)]
+        if len(parts) <= 1:
+            return self.call("translate_many", texts, src, dest)
+        futures = [self._executor.submit(self.call, "translate_many", part, src, dest) for part in parts]
+        results = dict(zip(unique, (result for future in futures for result in future.result())))
+        return [results[text] for text in texts]
+
+    @property
+    def cache_namespace(self):
+        return provider_namespace(self.provider)
+
+    def configure(self, **settings):
+        """Change provider settings (e.g. quality, memory budget) in the parent and every worker"""
+        with self._fork_lock:
+            self.provider.configure(**settings)
+        self.settings = {**self.settings, **settings}  # Workers apply it with their next request
+
+    def warm(self, src, dest):
+        """Load the pair's model in the parent and refork the workers so they share it"""
+        self.prewarm([(src, dest)])
+
+    def prewarm(self, pairs):
+        """Load models for ``pairs`` in the parent, then refork idle workers (busy ones on their next request)"""
+        if not hasattr(self.provider, "prewarm"):
+            return []
+        with self._fork_lock:
+            before = self.loaded()
+            loaded = self.provider.prewarm(pairs)
+            changed = self.loaded() != before
+        if changed and self._forking:
+            self._generation += 1
+            self.recycle_idle()
+        return loaded
+
+    def loaded(self):
+        """Models loaded in the parent and so shared with workers forked since"""
+        models = getattr(self.provider, "models", None)
+        return set(models.loaded()) if models is not None else set()
+
+    def recycle_idle(self):
+        """Refork the idle workers that predate the current generation"""
+        idle = []
+        while True:
+            try:
+                idle.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for worker in idle:
+            self._idle.put(self._replace(worker) if worker.generation != self._generation else worker)
+
+    def pids(self):
+        return [worker.process.pid for worker in list(self._all)]
+
+    def supported_languages(self):
+        return self.provider.supported_languages()
+
+    def fetch_languages(self):
+        return self.provider.fetch_languages()
+
+    def close(self):
+        """Stop the workers; requests in flight finish first"""
+        self._closed = True
+        self._executor.shutdown(wait=False)
+        for _ in range(self.workers):
+            self._idle.get().stop()
+        self._all.clear()
+        self.provider.close()
@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+from language_translator.batch import CHECKPOINT_SUFFIX, format_summary, translate_file
+
+
+class FakeEngine:
+    """Upper-cases texts; raises on call number ``fail_on``"""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = 0
+        self.texts = []
+
+    def translate_batch(self, texts, src, dest):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise ConnectionError("backend went away")
+        self.texts.extend(texts)
+        return [text.upper() for text in texts]
+
+
+def write_jsonl(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({"id": i, "text": f"line {i}"}) + "\n")
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_translate_file(tmp_path):
+    source, target = str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl")
+    write_jsonl(source, 50)
+    summary = translate_file(FakeEngine(), source, target, dest="es", batch_size=8)
+    records = read_jsonl(target)
+    assert [record["translation"] for record in records] == [f"LINE {i}" for i in range(50)]
+    assert summary["translated"] == 50 and summary["batches"] == 7
+    assert not os.path.exists(target + CHECKPOINT_SUFFIX)
+    assert "over 7 batches" in format_summary(summary)
+
+
+def test_translate_file_resumes_from_checkpoint(tmp_path):
+    source, target = str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl")
+    write_jsonl(source, 50)
+    with pytest.raises(ConnectionError):
+        translate_file(FakeEngine(fail_on=4), source, target, dest="es", batch_size=8, concurrency=1)
+    assert os.path.exists(target + CHECKPOINT_SUFFIX)
+    assert len(read_jsonl(target)) == 24
+
+    engine = FakeEngine()
+    summary = translate_file(engine, source, target, dest="es", batch_size=8, concurrency=1)
+    assert engine.texts == [f"line {i}" for i in range(24, 50)]  # Nothing translated twice
+    assert summary["resumed_from"] == 24 and summary["records"] == 50
+    assert [record["id"] for record in read_jsonl(target)] == list(range(50))
+    assert not os.path.exists(target + CHECKPOINT_SUFFIX)
+
+
+def test_translate_file_rejects_checkpoint_of_another_run(tmp_path):
+    source, target = str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl")
+    write_jsonl(source, 20)
+    with pytest.raises(ConnectionError):
+        translate_file(FakeEngine(fail_on=2), source, target, dest="es", batch_size=8, concurrency=1)
+    with pytest.raises(ValueError):
+        translate_file(FakeEngine(), source, target, dest="fr", batch_size=8, concurrency=1)
+    summary = translate_file(FakeEngine(), source, target, dest="fr", batch_size=8, restart=True)
+    assert summary["resumed_from"] == 0 and len(read_jsonl(target)) == 20
+
+
+def test_latency_summary_is_bounded(tmp_path):
+    source, target = str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl")
+    write_jsonl(source, 500)
+    summary = translate_file(FakeEngine(), source, target, dest="es", batch_size=1)
+    assert summary["latency"].total == summary["batches"] == 500
+    assert len(summary["latency"].counts) < 100  # Fixed buckets, not one value per batch
+    assert not any(isinstance(value, list) for value in summary.values())
+    line = format_summary(summary).splitlines()[-1]
+    p95, maximum = (float(line.split(name)[1].split()[0]) for name in ("p95 ", "max "))
+    assert p95 <= maximum
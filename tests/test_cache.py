@@ -0,0 +1,54 @@
+from language_translator.cache import TranslationCache, normalize_text
+from language_translator.engine import TranslationEngine
+from language_translator.local import LocalProvider
+from language_translator.providers import provider_namespace
+
+
+def test_normalize_text_keeps_line_breaks():
+    assert normalize_text("  Hello \t  World  ") == "Hello World"
+    assert normalize_text("Hello\r\n\r\n  World ") == "Hello\n\nWorld"
+    assert normalize_text("Hello\n\nWorld") != normalize_text("Hello World")
+
+
+def test_cache_tells_paragraphs_from_spaces(tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    cache.put("Hello\n\nWorld", "en", "es", "Hola\n\nMundo")
+    assert cache.get("Hello \n\nWorld ", "en", "es") == "Hola\n\nMundo"
+    assert cache.get("Hello World", "en", "es") is None
+    cache.close()
+
+
+class PrefixProvider:
+    def __init__(self, name):
+        self.name = name
+
+    def translate_detailed(self, text, src, dest):
+        return f"{self.name}: {text}", src
+
+    def close(self):
+        pass
+
+
+def test_backends_do_not_share_entries(tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    assert TranslationEngine(PrefixProvider("google"), cache).translate("Hi", "en", "es") == "google: Hi"
+    assert TranslationEngine(PrefixProvider("other"), cache).translate("Hi", "en", "es") == "other: Hi"
+    assert TranslationEngine(PrefixProvider("google"), cache).translate("Hi", "en", "es") == "google: Hi"
+    assert cache.stats()["hits"] == 1
+    cache.close()
+
+
+def test_local_models_are_kept_apart_by_model_and_quality():
+    namespaces = {provider_namespace(LocalProvider(family, model=model, quality=quality))
+                  for family, model, quality in [("marian", None, "accurate"), ("marian", None, "fast"),
+                                                 ("marian", "/models/x", "accurate"), ("nllb", None, "accurate")]}
+    assert len(namespaces) == 4
+
+
+def test_seed_only_takes_entries_of_the_same_backend(tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    entry = {"original": "Hi", "translation": "Hola", "src_lang": "en", "dest_lang": "es"}
+    cache.seed([{**entry, "backend": "google"}, {**entry, "translation": "?", "backend": None}], "google")
+    assert cache.get("Hi", "en", "es", "google") == "Hola"
+    assert cache.get("Hi", "en", "es", "llm:gpt-4o-mini") is None
+    cache.close()
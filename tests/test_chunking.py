@@ -0,0 +1,24 @@
+import pytest
+
+from language_translator.chunking import split_text
+
+TEXTS = [
+    "",
+    "One sentence.",
+    "First sentence. Second one! A third? And a fourth.\n\nNew paragraph here.",
+    "Leading space.   Trailing space.   ",
+    "x" * 120 + ". Short. " + "word " * 40,
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("max_chars", [10, 25, 4500])
+def test_split_text_round_trips(text, max_chars):
+    chunks = split_text(text, max_chars)
+    assert "".join(chunks) == text
+    assert all(0 < len(chunk) <= max_chars for chunk in chunks)
+
+
+def test_split_text_keeps_short_text_whole():
+    text = "First sentence. Second one."
+    assert split_text(text, 4500) == [text]
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from language_translator.compact_history import CompactHistory
+from language_translator.history import HistoryStore
+
+
+def entry(i, backend=None, timestamp=None):
+    return {"id": i, "timestamp": timestamp or f"2024-05-02T10:00:{i:02d}.000123", "original": f"héllo {i}",
+            "translation": f"hola {i} ¿qué?", "src_lang": "en", "dest_lang": "es", "backend": backend}
+
+
+def test_entries_round_trip():
+    history = CompactHistory()
+    entries = [entry(3, "google"), entry(2), entry(1, "llm:gpt-4o-mini")]
+    history.extend(entries)
+    assert len(history) == 3
+    assert [history[i] for i in range(3)] == entries
+    assert history[-1] == entries[-1]
+    with pytest.raises(IndexError):
+        history[3]
+
+
+def test_insert_puts_newer_entries_first():
+    history = CompactHistory()
+    history.extend([entry(2), entry(1)])
+    history.insert(0, entry(3))
+    history.insert(0, entry(4))
+    history.extend([entry(0)])
+    assert [history[i]["id"] for i in range(len(history))] == [4, 3, 2, 1, 0]
+    assert history.pair_counts() == {("en", "es"): 5}
+    with pytest.raises(ValueError):
+        history.insert(1, entry(5))
+
+
+def test_missing_timestamp():
+    history = CompactHistory()
+    history.extend([entry(1, timestamp=" "), {**entry(2), "timestamp": ""}])
+    assert [history[i]["timestamp"] for i in range(2)] == ["", ""]
+
+
+def test_from_store_and_json(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"), legacy_path=None)
+    for i in range(5):
+        store.append(f"text {i}", f"texto {i}", "en", "es", backend="google" if i % 2 else None)
+    history = CompactHistory.from_store(store)
+    assert [history[i] for i in range(5)] == store.page()[::-1]
+    store.close()
+
+    path = tmp_path / "translation_history.json"
+    path.write_text(json.dumps([entry(2), entry(1)]), encoding="utf-8")
+    history = CompactHistory.from_json(str(path))
+    assert [history[i]["id"] for i in range(2)] == [2, 1]
@@ -0,0 +1,39 @@
+from language_translator.failover import FailoverProvider
+
+
+class BrokenBatchProvider:
+    """Batched provider that delivers the first text, then fails"""
+
+    name = "broken"
+    batch_size = 8
+    partial_results = True
+
+    def translate_many(self, texts, src, dest, on_result=None):
+        on_result(0, ("first:" + texts[0], src))
+        raise ConnectionError("connection reset")
+
+    def close(self):
+        pass
+
+
+class BackupProvider:
+    name = "backup"
+
+    def translate_detailed(self, text, src, dest):
+        return "backup:" + text, src
+
+    def close(self):
+        pass
+
+
+def test_translate_many_fails_over_and_reports_each_text_once():
+    chain = FailoverProvider([BrokenBatchProvider(), BackupProvider()])
+    reported = []
+    results = chain.translate_many(["a", "b", "c"], "fr", "en",
+                                   on_result=lambda index, result: reported.append((index, result[0])))
+    assert results == [("backup:a", "fr"), ("backup:b", "fr"), ("backup:c", "fr")]
+    assert reported == [(0, "first:a"), (1, "backup:b"), (2, "backup:c")]
+    assert chain.batch_size == 8 and chain.partial_results
+    stats = {p["name"]: p for p in chain.stats()["providers"]}
+    assert stats["broken"]["errors"] == 1 and stats["backup"]["successes"] == 1
+    chain.close()
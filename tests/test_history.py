@@ -0,0 +1,49 @@
+import json
+import sqlite3
+
+from language_translator.history import HistoryStore
+
+
+def test_legacy_json_with_missing_fields(tmp_path):
+    legacy = tmp_path / "translation_history.json"
+    legacy.write_text(json.dumps([
+        {"timestamp": "2024-05-02T10:00:00", "original": "Hello", "translation": "Hola",
+         "src_lang": "en", "dest_lang": "es"},
+        {"original": "Bonjour", "translation": "Hello"},  # Written before languages were recorded
+        "not an entry",
+    ]), encoding="utf-8")
+    store = HistoryStore(str(tmp_path / "history.db"), str(legacy))
+    entries = store.page()
+    assert [(e["original"], e["src_lang"], e["dest_lang"]) for e in entries] == [
+        ("Hello", "en", "es"), ("Bonjour", "auto", "")]
+    store.close()
+
+
+def test_database_without_backend_column(tmp_path):
+    path = str(tmp_path / "history.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE history (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,"
+                 " original TEXT NOT NULL, translation TEXT NOT NULL, src_lang TEXT NOT NULL,"
+                 " dest_lang TEXT NOT NULL)")
+    conn.execute("INSERT INTO history (timestamp, original, translation, src_lang, dest_lang)"
+                 " VALUES ('2024-05-02T10:00:00', 'Hello', 'Hola', 'en', 'es')")
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+    store = HistoryStore(path, legacy_path=None)
+    assert store.page()[0]["backend"] is None
+    store.append("Cat", "Gato", "en", "es", backend="google")
+    assert store.page()[0]["backend"] == "google"
+    assert [e["original"] for e in store.search("hello")] == ["Hello"]
+    store.close()
+
+
+def test_short_terms_match_substrings(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"), legacy_path=None)
+    for original in ("Good morning", "Hello world", "I am here"):
+        store.append(original, original.upper(), "en", "es")
+    assert [e["original"] for e in store.search("o")] == ["Hello world", "Good morning"]
+    assert [e["original"] for e in store.search("rl")] == ["Hello world"]
+    assert [e["original"] for e in store.search("I", src_lang="en")] == ["I am here", "Good morning"]
+    assert [e["original"] for e in store.search("mor")] == ["Good morning"]
+    store.close()
@@ -0,0 +1,30 @@
+import random
+import threading
+
+from language_translator.incremental import InOrderText
+
+
+def test_in_order_text_waits_for_gaps():
+    received = []
+    text = InOrderText(received.append)
+    text.add(2, "c")
+    text.add(1, "b")
+    assert received == []
+    text.add(0, "a")
+    assert received == ["abc"]
+    text.add(4, "e")
+    text.add(3, "d")
+    assert received == ["abc", "de"]
+
+
+def test_in_order_text_from_threads():
+    received = []
+    text = InOrderText(received.append)
+    order = list(range(200))
+    random.Random(1).shuffle(order)
+    threads = [threading.Thread(target=text.add, args=(i, f"{i},")) for i in order]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert "".join(received) == "".join(f"{i}," for i in range(200))
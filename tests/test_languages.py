@@ -0,0 +1,37 @@
+import json
+import threading
+
+from language_translator.languages import LanguageRegistry
+from language_translator.scheduler import JobScheduler
+
+
+def test_refresh_runs_on_the_scheduler(tmp_path):
+    registry = LanguageRegistry(cache_path=str(tmp_path / "languages.json"))
+    scheduler = JobScheduler(workers=1)
+    updated = threading.Event()
+    names = []
+    threads = []
+
+    def fetch():
+        threads.append(threading.current_thread().name)
+        return {"english": "en", "klingon": "tlh"}
+
+    def on_update(result):
+        names.extend(result)
+        updated.set()
+
+    assert registry.refresh_async(fetch, scheduler, on_update) is not None
+    assert updated.wait(5)
+    scheduler.shutdown()
+    assert threads == ["scheduler-0"]
+    assert names == ["english", "klingon"]
+    with open(tmp_path / "languages.json", encoding="utf-8") as f:
+        assert json.load(f)["languages"]["klingon"] == "tlh"
+
+
+def test_fresh_registry_is_not_refreshed(tmp_path):
+    registry = LanguageRegistry(cache_path=str(tmp_path / "languages.json"))
+    registry.update({"english": "en"})
+    scheduler = JobScheduler(workers=1)
+    assert registry.refresh_async(lambda: {}, scheduler) is None
+    scheduler.shutdown()
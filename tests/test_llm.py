@@ -0,0 +1,60 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from language_translator.llm import PROMPT_CACHE_MIN_TOKENS, SYSTEM_PROMPT, LLMProvider, StreamedTranslations
+
+TRANSLATIONS = {"How are you?": "¿Cómo estás?", "Thank you": "ありがとう"}
+
+
+class StreamingHandler(BaseHTTPRequestHandler):
+    """Streams the answer a few characters per event, with no charset in the Content-Type"""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        segments = json.loads(body["messages"][-1]["content"])["segments"]
+        answer = json.dumps({"translations": [{"id": s["id"], "text": TRANSLATIONS[s["text"]]} for s in segments],
+                             "source_language": "en"}, ensure_ascii=False)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for start in range(0, len(answer), 5):
+            event = {"choices": [{"index": 0, "delta": {"content": answer[start:start + 5]}}]}
+            self.wfile.write(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_streamed_answers_are_decoded_as_utf8(server):
+    provider = LLMProvider(base_url=server, api_key="test", retries=0)
+    arrived = {}
+    results = provider.translate_many(["How are you?", "Thank you"], "en", "es",
+                                      on_result=lambda index, result: arrived.setdefault(index, result[0]))
+    assert results == [("¿Cómo estás?", "en"), ("ありがとう", "en")]
+    assert arrived == {0: "¿Cómo estás?", 1: "ありがとう"}
+    provider.close()
+
+
+def test_stream_parser_handles_split_items():
+    parser = StreamedTranslations()
+    answer = '{"translations": [{"id": 0, "text": "a, [b]"}, {"id": 1, "text": "c"}], "source_language": "en"}'
+    items = [item for start in range(0, len(answer), 7) for item in parser.feed(answer[start:start + 7])]
+    assert items == [{"id": 0, "text": "a, [b]"}, {"id": 1, "text": "c"}]
+
+
+def test_system_prompt_is_long_enough_to_be_cached():
+    # Tokenizers average under 4.5 characters per token on this mix of prose, JSON and examples
+    assert len(SYSTEM_PROMPT) / 4.5 >= PROMPT_CACHE_MIN_TOKENS
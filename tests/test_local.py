@@ -0,0 +1,28 @@
+from language_translator.local import LocalProvider
+from language_translator.model_manager import ModelManager
+
+
+def fake_provider(**options):
+    """A LocalProvider whose models are just their names, so nothing is downloaded"""
+    provider = LocalProvider(**options)
+    provider.models = ModelManager(lambda key: key, size_of=lambda model: 1)
+    provider._generate = lambda sentences, model_name, src, dest: [f"{text}>{dest}" for text in sentences]
+    return provider
+
+
+def test_marian_auto_source_goes_through_english():
+    provider = fake_provider()
+    assert provider.route("auto", "spanish") == [
+        ("Helsinki-NLP/opus-mt-mul-en", "mul", "en"), ("Helsinki-NLP/opus-mt-en-es", "en", "es")]
+    assert provider.route("auto", "en") == [("Helsinki-NLP/opus-mt-mul-en", "mul", "en")]
+    assert provider.route("de", "es") == [("Helsinki-NLP/opus-mt-de-es", "de", "es")]
+    assert LocalProvider(model="/models/custom").route("auto", "es") == [("/models/custom", "mul", "es")]
+
+
+def test_marian_auto_to_spanish_translates_and_warms_both_models():
+    provider = fake_provider()
+    assert provider.translate_detailed("Bonjour.", "auto", "es") == ("Bonjour.>en>es", "auto")
+    provider.models.clear()
+    provider.warm("auto", "es")
+    assert provider.models.loaded() == [("Helsinki-NLP/opus-mt-mul-en", "accurate"),
+                                        ("Helsinki-NLP/opus-mt-en-es", "accurate")]
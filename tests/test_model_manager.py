@@ -0,0 +1,23 @@
+from language_translator.model_manager import ModelManager
+
+
+def loader(missing=()):
+    def load(name):
+        if name in missing:
+            raise RuntimeError(f"{name} is not available offline")
+        return name
+    return load
+
+
+def test_least_recently_used_is_evicted():
+    manager = ModelManager(loader(), budget=2, size_of=lambda model: 1)
+    for name in ("a", "b", "a", "c"):
+        manager.get(name)
+    assert manager.loaded() == ["a", "c"]
+    assert manager.stats()["evictions"] == 1
+
+
+def test_prewarm_skips_models_that_fail_to_load():
+    manager = ModelManager(loader(missing={"opus-mt-mul-es"}), budget=10, size_of=lambda model: 1)
+    assert manager.prewarm(["opus-mt-en-es", "opus-mt-mul-es", "opus-mt-en-fr"]) == ["opus-mt-en-es", "opus-mt-en-fr"]
+    assert manager.loaded() == ["opus-mt-en-fr", "opus-mt-en-es"]
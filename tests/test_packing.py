@@ -0,0 +1,61 @@
+from language_translator.packing import PackingProvider, join, pack, split
+
+
+class MarkerProvider:
+    """Upper-cases text and mangles the markers of the first ``mangle`` packed requests"""
+
+    name = "fake"
+
+    def __init__(self, mangle=0):
+        self.mangle = mangle
+        self.requests = []
+
+    def translate_detailed(self, text, src, dest):
+        self.requests.append(text)
+        translation = text.upper()
+        if "[[1]]" in translation and self.mangle:
+            self.mangle -= 1
+            translation = translation.replace("[[1]]", "")  # Marker lost; segments 0 and 1 merge
+        return translation, "en"
+
+    def close(self):
+        pass
+
+
+def test_pack_respects_limits():
+    texts = ["word"] * 10
+    assert pack(texts, max_chars=1000, max_segments=4) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    packs = pack(texts, max_chars=30)
+    assert [i for indices in packs for i in indices] == list(range(10))
+    assert all(len(join([texts[i] for i in indices])) <= 30 for indices in packs)
+
+
+def test_pack_isolates_long_and_marker_like_texts():
+    texts = ["a", "x" * 50, "b", "see [[3]]", "c"]
+    assert pack(texts, max_chars=40) == [[1], [3], [0, 2, 4]]
+
+
+def test_split_round_trip():
+    texts = ["Hello", "Good morning.", "Two\nlines"]
+    assert split(join(texts), 3) == texts
+
+
+def test_split_tolerates_marker_spacing():
+    assert split("[[ 0 ]] hola [[1]]\nadiós", 2) == ["hola", "adiós"]
+
+
+def test_split_rejects_mangled_markers():
+    assert split("[[0]]\na\nb", 2) is None  # Lost
+    assert split("[[1]]\nb\n[[0]]\na", 2) is None  # Reordered
+    assert split("[[0]]\na\n[[0]]\nb", 2) is None  # Duplicated
+    assert split("x [[0]]\na\n[[1]]\nb", 2) is None  # Text before the first marker
+
+
+def test_provider_repacks_mangled_answers():
+    provider = MarkerProvider(mangle=1)
+    packing = PackingProvider(provider)
+    texts = ["one", "two", "three", "four"]
+    assert packing.translate_many(texts, "en", "es") == [(text.upper(), "en") for text in texts]
+    assert packing.repacked == 1
+    assert len(provider.requests) == 3  # The whole pack, then each half
+    packing.close()
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from language_translator import local  # noqa: E402
+from language_translator.local import LocalProvider  # noqa: E402
+
+CONFIG = transformers.MarianConfig(vocab_size=64, d_model=16, encoder_layers=1, decoder_layers=1,
+                                   encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=32,
+                                   decoder_ffn_dim=32, max_position_embeddings=32, pad_token_id=0,
+                                   decoder_start_token_id=0)
+
+
+def tiny_provider(tmp_path):
+    """A fast-mode provider whose "pretrained" model is a tiny random Marian model"""
+    provider = LocalProvider(model="tiny", quality="fast", quantized_dir=str(tmp_path))
+    loads = []
+
+    def pretrained(model_name, part=None):
+        loads.append(part)
+        if part == "tokenizer":
+            return "tokenizer"
+        if part == "config":
+            return CONFIG
+        return transformers.AutoModelForSeq2SeqLM.from_config(CONFIG)
+
+    provider._pretrained = pretrained
+    return provider, loads
+
+
+def is_quantized(model):
+    return not any(type(module) is torch.nn.Linear for module in model.modules())
+
+
+def test_quantized_weights_are_cached(tmp_path):
+    provider, loads = tiny_provider(tmp_path)
+    _, model = provider._load_quantized("tiny")
+    assert is_quantized(model) and os.path.exists(provider.quantized_path("tiny"))
+    loads.clear()
+    _, model = provider._load_quantized("tiny")
+    assert is_quantized(model) and "model" not in loads  # Read back from the cache
+
+
+def test_unusable_cache_file_is_rebuilt(tmp_path):
+    provider, _ = tiny_provider(tmp_path)
+    path = provider.quantized_path("tiny")
+    with open(path, "wb") as f:
+        f.write(b"not a state dict")
+    _, model = provider._load_quantized("tiny")
+    assert is_quantized(model)
+    assert os.path.getsize(path) > 100
+
+
+def test_full_precision_when_quantization_fails(tmp_path, monkeypatch):
+    provider, _ = tiny_provider(tmp_path)
+
+    def fail(model):
+        raise RuntimeError("no quantized engine")
+
+    monkeypatch.setattr(local, "quantize", fail)
+    _, model = provider._load_quantized("tiny")
+    assert not is_quantized(model)
+    assert not os.path.exists(provider.quantized_path("tiny"))
+
+
+def test_cache_key_covers_quantization_settings(tmp_path, monkeypatch):
+    provider, _ = tiny_provider(tmp_path)
+    path = provider.quantized_path("tiny")
+    monkeypatch.setattr(local, "QUANTIZED_DTYPE", "quint8")
+    assert provider.quantized_path("tiny") != path
+    monkeypatch.setattr(local, "QUANTIZED_DTYPE", "qint8")
+    monkeypatch.setattr(torch, "__version__", "0.0.1")
+    assert provider.quantized_path("tiny") != path
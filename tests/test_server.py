@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+import requests
+
+from language_translator.cache import TranslationCache
+from language_translator.engine import TranslationEngine
+from language_translator.server import TranslationServer
+
+
+class FrenchProvider:
+    """Upper-cases text and detects everything as French"""
+
+    name = "french"
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate_detailed(self, text, src, dest):
+        self.calls += 1
+        return text.upper(), "fr" if src == "auto" else src
+
+    def supported_languages(self):
+        return ["english", "french"]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    provider = FrenchProvider()
+    engine = TranslationEngine(provider, cache=TranslationCache(str(tmp_path / "cache.db")))
+    server = TranslationServer(engine, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, provider
+    server.shutdown()
+    server.server_close()
+    engine.close()
+
+
+def test_translate_and_batch(server):
+    server, _ = server
+    answer = requests.post(f"{server.url}/translate", json={"text": "Bonjour", "dest": "en"}).json()
+    assert answer == {"translation": "BONJOUR", "src": "auto", "dest": "en"}
+    answer = requests.post(f"{server.url}/batch", json={"texts": ["a", "b"], "src": "fr", "dest": "en"}).json()
+    assert answer["translations"] == ["A", "B"]
+
+
+def test_detect_bypasses_the_cache(server):
+    server, provider = server
+    requests.post(f"{server.url}/translate", json={"text": "Bonjour", "dest": "en"})
+    for _ in range(2):
+        response = requests.post(f"{server.url}/detect", json={"text": "Bonjour"})
+        assert response.status_code == 200
+        assert response.json() == {"language": "fr", "name": "french"}
+    assert provider.calls == 3
+    assert requests.post(f"{server.url}/detect", json={"text": "  "}).status_code == 400
+
+
+@pytest.mark.parametrize("body", [{"text": "Hi", "dest": "auto"}, {"text": "Hi", "dest": ""},
+                                  {"text": "Hi", "src": 3}, {"text": "Hi", "dest": None}])
+def test_invalid_languages_are_rejected(server, body):
+    server, provider = server
+    response = requests.post(f"{server.url}/translate", json=body)
+    assert response.status_code == 400
+    assert provider.calls == 0
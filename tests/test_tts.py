@@ -0,0 +1,10 @@
+import sys
+import types
+
+from language_translator.tts import Pyttsx3Backend
+
+
+def test_pyttsx3_fingerprint_without_importlib_metadata(monkeypatch):
+    monkeypatch.setitem(sys.modules, "importlib.metadata", None)  # As on Python 3.7: the import fails
+    monkeypatch.setitem(sys.modules, "pyttsx3", types.SimpleNamespace(__version__="2.90"))
+    assert Pyttsx3Backend().fingerprint() == f"pyttsx3:2.90:{sys.platform}"
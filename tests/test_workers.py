@@ -0,0 +1,84 @@
+import multiprocessing
+import os
+import signal
+import time
+
+import pytest
+
+from language_translator import cli, workers
+from language_translator.cli import build_parser
+from language_translator.engine import TranslationEngine
+from language_translator.workers import WorkerCrashed, WorkerPool
+
+pytestmark = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(),
+                                reason="workers get the test provider by forking")
+
+
+class EchoProvider:
+    """One text per call, like the Google backend; "crash" kills the worker process"""
+
+    name = "echo"
+
+    def translate_detailed(self, text, src, dest):
+        if text == "crash":
+            os._exit(1)
+        return f"{text}:{dest}:{os.getpid()}", src
+
+    def configure(self, **settings):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(workers, "make_provider", lambda name, **options: EchoProvider())
+    pool = WorkerPool("echo", workers=2)
+    yield pool
+    pool.close()
+
+
+def kill(pids):
+    for pid in pids:
+        os.kill(pid, signal.SIGKILL)
+    time.sleep(0.2)
+
+
+def test_translate_many_without_batched_provider(pool):
+    results = pool.translate_many(["a", "b", "a", "c"], "en", "es")
+    assert [translation.split(":")[:2] for translation, _ in results] == [["a", "es"], ["b", "es"], ["a", "es"],
+                                                                          ["c", "es"]]
+    assert results[0] == results[2]
+
+
+def test_recovers_when_every_worker_died(pool):
+    kill(pool.pids())
+    assert pool.translate_detailed("hello", "en", "es")[0].startswith("hello:es:")
+    assert pool.translate_detailed("again", "en", "es")[0].startswith("again:es:")
+    assert pool.crashes == 2
+
+
+def test_request_that_kills_its_worker(pool):
+    with pytest.raises(WorkerCrashed):
+        pool.translate_detailed("crash", "en", "es")
+    assert pool.translate_detailed("hello", "en", "es")[0].startswith("hello:es:")
+
+
+class WarmProvider:
+    def __init__(self):
+        self.pairs = []
+
+    def prewarm(self, pairs):
+        self.pairs.extend(pairs)
+
+
+def test_cli_warms_local_models_before_translating(monkeypatch):
+    provider = WarmProvider()
+    monkeypatch.setattr(cli, "build_provider", lambda backend, args: provider)
+    args = build_parser().parse_args(["serve", "--backend", "marian", "--workers", "2", "--warm", "auto:es",
+                                      "--warm", "de:en", "--no-cache"])
+    cli.warm(cli.make_engine(args), args.warm)
+    assert provider.pairs == [("auto", "es"), ("de", "en")]
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["serve", "--warm", "es"])